@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from collections.abc import Sequence
+
+import execnet
+import pytest
+
+from xdist.scheduler.eachload import spec_environment
+from xdist.workermanage import WorkerController
+
+
+# outcome codes, by increasing severity: the outcome of a test in an
+# environment is the most severe outcome of its phases
+NOT_RUN = 0
+OUTCOMES = {"passed": 1, "skipped": 2, "failed": 3}
+LETTERS = "-.sF"
+
+
+class EnvironmentAggregator:
+    """Aggregate the reports of ``--dist=each`` across the environments.
+
+    Every test runs once in each environment (``--tx`` specification, or
+    group of equal specifications with ``--dist=eachload``).
+    Instead of reporting each of these runs, the reports of a test are held
+    until it ran in all environments, and only the reports of its run with
+    the most severe outcome are passed to the ``pytest_runtest_*`` hooks.
+
+    Only one run of each pending test is kept, with a byte per environment
+    for its outcomes; once reported, a test is only counted, unless its
+    outcome differs between the environments.
+    """
+
+    def __init__(self, config: pytest.Config, specs: Sequence[execnet.XSpec]) -> None:
+        self.config = config
+        # environment index by worker id, and label of each environment:
+        # with --dist=each every spec is an environment (several can be the
+        # same), with --dist=eachload the equal specs are grouped
+        self.envs: dict[str, int] = {}
+        self.labels: list[str] = []
+        grouped = config.getvalue("dist") == "eachload"
+        environments: dict[str, int] = {}
+        for spec in specs:
+            label = spec_environment(spec) if grouped else str(spec.id)
+            if label not in environments or not grouped:
+                environments[label] = len(self.labels)
+                self.labels.append(label)
+            self.envs[str(spec.id)] = environments[label]
+        self._versions: set[int] = set()
+        # reports of the test being run by each node
+        self._running: dict[WorkerController, list[pytest.TestReport]] = {}
+        # tests which did not run in all environments yet: outcomes, and
+        # the reports of the run with the most severe outcome
+        self._outcomes: dict[str, bytearray] = {}
+        self._pending: dict[str, list[pytest.TestReport]] = {}
+        # outcome counts by environment, and the outcomes of the tests
+        # whose outcome differs between environments
+        self.counts = [dict.fromkeys(OUTCOMES.values(), 0) for _ in self.labels]
+        self.differing: dict[str, bytes] = {}
+
+    def add_replacement(
+        self, node: WorkerController, replaced: WorkerController
+    ) -> None:
+        """Put a node replacing a crashed one in the environment of the
+        latter."""
+        self.envs[node.gateway.id] = self.envs[replaced.gateway.id]
+
+    def env_of(self, node: WorkerController) -> int:
+        """Return the index of the environment of a node."""
+        env = self.envs[node.gateway.id]
+        if env not in self._versions and getattr(node, "workerinfo", None):
+            self._versions.add(env)
+            version = node.workerinfo["version_info"]
+            self.labels[env] += " (Python {}.{}.{})".format(*version[:3])
+        return env
+
+    def add(self, node: WorkerController, rep: pytest.TestReport) -> None:
+        """Add the report of a phase of a test run by a node.
+
+        The teardown report ends the run of the test in the environment of
+        the node, as does the report of the test crashing the node.
+        """
+        reports = self._running.setdefault(node, [])
+        reports.append(rep)
+        if rep.when in ("teardown", "???"):
+            del self._running[node]
+            self._complete(self.env_of(node), rep.nodeid, reports)
+
+    def _complete(
+        self, env: int, nodeid: str, reports: list[pytest.TestReport]
+    ) -> None:
+        outcome = max(OUTCOMES.get(rep.outcome, NOT_RUN) for rep in reports)
+        outcomes = self._outcomes.get(nodeid)
+        if outcomes is None:
+            outcomes = self._outcomes[nodeid] = bytearray(len(self.labels))
+            self._pending[nodeid] = reports
+        elif outcome > max(outcomes):
+            self._pending[nodeid] = reports
+        outcomes[env] = outcome
+        if NOT_RUN not in outcomes:
+            self._report(nodeid)
+
+    def flush(self) -> None:
+        """Report the tests which did not run in all environments."""
+        for nodeid in list(self._pending):
+            self._report(nodeid)
+
+    def _report(self, nodeid: str) -> None:
+        outcomes = self._outcomes.pop(nodeid)
+        reports = self._pending.pop(nodeid)
+        for env, outcome in enumerate(outcomes):
+            if outcome != NOT_RUN:
+                self.counts[env][outcome] += 1
+        if len(set(outcomes)) > 1:
+            self.differing[nodeid] = bytes(outcomes)
+            worst = max(reports, key=lambda rep: OUTCOMES.get(rep.outcome, NOT_RUN))
+            worst.sections.append(
+                (
+                    "xdist environments",
+                    "\n".join(self._describe(self.differing[nodeid])),
+                )
+            )
+        hook = self.config.hook
+        hook.pytest_runtest_logstart(nodeid=nodeid, location=reports[0].location)
+        for rep in reports:
+            hook.pytest_runtest_logreport(report=rep)
+        hook.pytest_runtest_logfinish(nodeid=nodeid, location=reports[0].location)
+
+    def _describe(self, outcomes: bytes) -> Iterator[str]:
+        names = {code: name for name, code in OUTCOMES.items()}
+        names[NOT_RUN] = "not run"
+        for code in sorted(set(outcomes), reverse=True):
+            labels = [self.labels[env] for env, o in enumerate(outcomes) if o == code]
+            yield f"{names[code]}: {', '.join(labels)}"
+
+    def summary(self) -> Iterator[str]:
+        """Return the lines of the outcome matrix of the environments."""
+        for label, counts in zip(self.labels, self.counts):
+            parts = [
+                f"{counts[code]} {name}"
+                for name, code in OUTCOMES.items()
+                if counts[code]
+            ]
+            yield f"{label}: {', '.join(parts) or 'no tests'}"
+        if self.differing:
+            yield ""
+            yield (
+                "tests with different outcomes "
+                "(. passed, s skipped, F failed, - not run):"
+            )
+            width = max(len(label.split()[0]) for label in self.labels)
+            yield " ".join(
+                label.split()[0].ljust(width) for label in self.labels
+            ).rstrip()
+            for nodeid, outcomes in self.differing.items():
+                matrix = " ".join(LETTERS[o].ljust(width) for o in outcomes)
+                yield f"{matrix} {nodeid}"
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+
+class CrashBisection:
+    """Find the tests which must run before a test for it to crash its worker.
+
+    Often a crash is caused by an earlier test which left the worker in a bad
+    state, not by the test running at the time.  The test is run again on
+    new workers after prefixes of the tests which ran before it on the
+    crashed worker, bisecting the length of the prefix, to find the shortest
+    prefix after which it crashes.  The last test of that prefix is the
+    likely culprit.
+
+    The prefix of all tests is assumed to reproduce the crash, which is
+    only verified if no shorter prefix does.
+    """
+
+    def __init__(self, crashitem: str, tests: Sequence[str]) -> None:
+        self.crashitem = crashitem
+        self.tests = list(tests)
+        # the shortest crashing prefix has a length in [lo, hi]
+        self.lo = 0
+        self.hi = len(self.tests)
+        self.reproduced = False
+        self.done = False
+        # length of the prefix being run, and the last test started by it
+        self.current: int | None = None
+        self.running: str | None = None
+
+    @property
+    def runs(self) -> int:
+        """The number of runs of the bisection, at most."""
+        return len(self.tests).bit_length() + 1
+
+    @property
+    def current_tests(self) -> list[str]:
+        """The tests of the current run."""
+        assert self.current is not None
+        return [*self.tests[: self.current], self.crashitem]
+
+    def next_tests(self) -> list[str] | None:
+        """Return the tests of the next run, None if the bisection is done."""
+        if self.done:
+            return None
+        if self.lo < self.hi:
+            self.current = (self.lo + self.hi) // 2
+        else:
+            # confirm the crash after the remaining prefix
+            self.current = self.hi
+        self.running = None
+        return self.current_tests
+
+    def record(self, crashed: bool) -> None:
+        """Record whether the last run crashed while running the test."""
+        assert self.current is not None
+        if crashed:
+            self.hi = self.current
+            self.reproduced = True
+            if self.lo == self.hi:
+                self.done = True
+        elif self.current == self.hi:
+            self.done = True
+        else:
+            self.lo = self.current + 1
+            if self.lo == self.hi and self.reproduced:
+                self.done = True
+        self.current = None
+
+    def result(self) -> str:
+        """Describe the result of the bisection."""
+        if not self.reproduced:
+            return (
+                f"{self.crashitem}: the crash was not reproduced by running it "
+                f"again after the {len(self.tests)} tests which ran before it"
+            )
+        if self.hi == 0:
+            return f"{self.crashitem}: crashes when run alone"
+        return (
+            f"{self.crashitem}: crashes after the first {self.hi} of the "
+            f"{len(self.tests)} tests which ran before it, the last one being "
+            f"{self.tests[self.hi - 1]}"
+        )
@@ -1,19 +1,31 @@
 from __future__ import annotations
 
 from collections.abc import Sequence
+import copy
 from enum import auto
 from enum import Enum
 from queue import Empty
 from queue import Queue
 import sys
+import time
 from typing import Any
 import warnings
 
 import execnet
 import pytest
 
+from xdist.aggregate import EnvironmentAggregator
+from xdist.crashbisect import CrashBisection
+from xdist.durations import DurationCache
+from xdist.journal import RunJournal
+from xdist.livestatus import LiveStatus
+from xdist.lowmemory import PassedTests
+from xdist.lowmemory import slim_stats
 from xdist.remote import Producer
 from xdist.remote import WorkerInfo
+from xdist.resultlog import make_result_log
+from xdist.resultlog import ResultLog
+from xdist.scheduler import EachLoadScheduling
 from xdist.scheduler import EachScheduling
 from xdist.scheduler import LoadFileScheduling
 from xdist.scheduler import LoadGroupScheduling
@@ -21,6 +33,8 @@ from xdist.scheduler import LoadScheduling
 from xdist.scheduler import LoadScopeScheduling
 from xdist.scheduler import Scheduling
 from xdist.scheduler import WorkStealingScheduling
+from xdist.scheduler.eachload import spec_environment
+from xdist.termbuffer import BufferedTerminalFile
 from xdist.workermanage import NodeManager
 from xdist.workermanage import WorkerController
 
@@ -45,20 +59,73 @@ class DSession:
 
     shouldstop: bool | str
 
+    INTERRUPT_CHECK_INTERVAL = 2.0
+
+    # interval between writes of the buffered terminal output
+    TERMINAL_WRITE_INTERVAL = 0.1
+
+    # events which do not use the scheduler, see loop_once()
+    SCHEDULER_INDEPENDENT_EVENTS = frozenset(
+        ("logstart", "logfinish", "testreport", "collectreport", "warning_recorded")
+    )
+
     def __init__(self, config: pytest.Config) -> None:
         self.config = config
         self.log = Producer("dsession", enabled=config.option.debug)
         self.nodemanager: NodeManager | None = None
         self.sched: Scheduling | None = None
         self.shuttingdown = False
+        self.shouldstop = False
         self.countfailures = 0
         self.maxfail: int = config.getvalue("maxfail")
         self.queue: Queue[tuple[str, dict[str, Any]]] = Queue()
         self._session: pytest.Session | None = None
         self._failed_collection_errors: dict[object, bool] = {}
+        # collected ids by digest, and nodes waiting for the ids of a digest
+        self._collections: dict[str, Sequence[str]] = {}
+        self._collection_waiting: dict[str, list[WorkerController]] = {}
+        # indices of the tests marked with xdist_no_split, by node
+        self._nosplit: dict[WorkerController, Sequence[int]] = {}
+        self._duration_cache: DurationCache | None = None
+        # --xdist-resume: the journal, the serialized reports of the tests
+        # being run by each node, and whether the results of the interrupted
+        # run were reported
+        self._journal: RunJournal | None = None
+        self._journal_reports: dict[WorkerController, list[dict[str, Any]]] = {}
+        self._journal_replayed = False
+        # the tests of the journal which were collected by this run
+        self._resumed: set[str] = set()
+        # --each-aggregate
+        self._aggregator: EnvironmentAggregator | None = None
         self._active_nodes: set[WorkerController] = set()
         self._failed_nodes_count = 0
         self._max_worker_restart = get_default_max_worker_restart(self.config)
+        # --xdist-crash-retries: number of crashes by test, and the workers
+        # running a crashed test alone (None once the test completed)
+        self._crash_retries: int = config.getoption("crashretries")
+        self._crash_counts: dict[str, int] = {}
+        self._retry_nodes: dict[WorkerController, str | None] = {}
+        # --xdist-standby: idle workers replacing crashed ones, with their
+        # collection once they collected
+        self._standby_count: int = config.getoption("standby")
+        self._standby_nodes: dict[WorkerController, Sequence[str] | None] = {}
+        # --xdist-bisect-crashes: tests started by each node, the pending
+        # bisections, the node running a step of one, and the results
+        self._bisect_crashes: bool = config.getoption("bisectcrashes")
+        self._history: dict[WorkerController, list[str]] = {}
+        self._bisections: list[CrashBisection] = []
+        self._bisect_nodes: dict[WorkerController, CrashBisection] = {}
+        self._bisect_results: list[str] = []
+        # --xdist-buffered-output
+        self._terminal_file: BufferedTerminalFile | None = None
+        # --xdist-low-memory: the tests which passed, and whether the
+        # reports of the test being run by each node all passed
+        self.passed_tests: PassedTests | None = None
+        self._passing: dict[WorkerController, bool] = {}
+        # --xdist-result-log
+        self._result_log: ResultLog | None = None
+        # --xdist-live-status
+        self._live_status: LiveStatus | None = None
         # summary message to print at the end of the session
         self._summary_report: str | None = None
         self.terminal = config.pluginmanager.getplugin("terminalreporter")
@@ -75,6 +142,23 @@ class DSession:
         """
         return bool(self.shuttingdown and not self._active_nodes)
 
+    def _buffer_terminal_output(self) -> None:
+        """Write the terminal output from a thread (--xdist-buffered-output)."""
+        tw = self.terminal._tw
+        self._terminal_file = BufferedTerminalFile(
+            tw._file, self.TERMINAL_WRITE_INTERVAL
+        )
+        tw._file = self._terminal_file
+        self._terminal_file.start()
+
+    def _unbuffer_terminal_output(self) -> None:
+        """Write the rest of the buffered terminal output, and the following
+        output directly."""
+        if self._terminal_file is not None:
+            self.terminal._tw._file = self._terminal_file.file
+            self._terminal_file.close()
+            self._terminal_file = None
+
     def report_line(self, line: str) -> None:
         if self.terminal and self.config.option.verbose >= 0:
             self.terminal.write_line(line)
@@ -86,9 +170,39 @@ class DSession:
         The nodes are setup to put their events onto self.queue.  As
         soon as nodes start they will emit the worker_workerready event.
         """
+        if self.config.getoption("bufferedoutput") and self.terminal:
+            self._buffer_terminal_output()
+        if self.config.getoption("durationcache") and self.config.cache is not None:
+            self._duration_cache = DurationCache(self.config)
+        if self.config.getoption("lowmemory"):
+            self.passed_tests = PassedTests()
+        result_log = self.config.getoption("resultlog")
+        if result_log:
+            self._result_log = make_result_log(self.config, result_log)
+        live_status = self.config.getoption("livestatus")
+        if live_status and self.terminal:
+            self._live_status = LiveStatus(live_status, self._duration_cache)
+        if self.config.getoption("resume") and self.config.cache is not None:
+            self._journal = RunJournal(self.config)
+            if self._journal.completed:
+                self.report_line(
+                    f"resuming an interrupted run, which completed "
+                    f"{len(self._journal.completed)} tests"
+                )
         self.nodemanager = NodeManager(self.config)
         nodes = self.nodemanager.setup_nodes(putevent=self.queue.put)
         self._active_nodes.update(nodes)
+        if self.config.getoption("eachaggregate"):
+            self._aggregator = EnvironmentAggregator(
+                self.config, self.nodemanager.specs
+            )
+        # standby nodes for each environment, with its first spec
+        environments: dict[str, execnet.XSpec] = {}
+        for spec in self.nodemanager.specs:
+            environments.setdefault(spec_environment(spec), spec)
+        for spec in environments.values():
+            for _ in range(self._standby_count):
+                self._spawn_standby_node(spec)
         self._session = session
         ramp = self.config.getoption("ramp")
         if ramp:
@@ -99,12 +213,53 @@ class DSession:
             )
 
     @pytest.hookimpl
-    def pytest_sessionfinish(self) -> None:
+    def pytest_sessionfinish(self, exitstatus: int) -> None:
         """Shutdown all nodes."""
         nm = getattr(self, "nodemanager", None)  # if not fully initialized
         if nm is not None:
             nm.teardown_nodes()
         self._session = None
+        # the terminal summary is written directly
+        self._unbuffer_terminal_output()
+        if self._result_log is not None:
+            self._result_log.close()
+            self._result_log = None
+        if self._duration_cache is not None:
+            self._duration_cache.save()
+        if self._journal is not None:
+            # a run stopped by -x or --maxfail ended normally
+            stopped_by_maxfail = self.maxfail and self.countfailures >= self.maxfail
+            self._journal.close(
+                finished=bool(stopped_by_maxfail)
+                or exitstatus
+                not in (pytest.ExitCode.INTERRUPTED, pytest.ExitCode.INTERNAL_ERROR)
+            )
+
+    @pytest.hookimpl
+    def pytest_unconfigure(self) -> None:
+        # if the session did not finish, e.g. on an internal error
+        self._unbuffer_terminal_output()
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        if self.passed_tests is not None and self.terminal and report.passed:
+            slim_stats(self.terminal.stats, report)
+
+    @pytest.hookimpl
+    def pytest_configure_node(self, node: WorkerController) -> None:
+        lazy = bool(self.config.getoption("lazycollection"))
+        node.workerinput["lazycollection"] = lazy
+        # with lazy collection each worker collects different tests, so there
+        # is nothing to gain from exchanging digests first
+        node.workerinput["collectiondigest"] = not lazy
+        if self._journal is not None:
+            node.workerinput["completed"] = list(self._journal.completed)
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_xdist_scope_cost(self, nodeids: Sequence[str]) -> float | None:
+        if self._duration_cache is None:
+            return None
+        return self._duration_cache.estimate(nodeids)
 
     @pytest.hookimpl
     def pytest_collection(self) -> bool:
@@ -120,6 +275,8 @@ class DSession:
         dist = config.getvalue("dist")
         if dist == "each":
             return EachScheduling(config, log)
+        if dist == "eachload":
+            return EachLoadScheduling(config, log)
         if dist == "load":
             return LoadScheduling(config, log)
         if dist == "loadscope":
@@ -146,32 +303,158 @@ class DSession:
             if self.shouldstop:
                 self.triggershutdown()
                 pending_exception = Interrupted(str(self.shouldstop))
+        if self._aggregator is not None:
+            self._aggregator.flush()
         if pending_exception:
             raise pending_exception
         return True
 
     def loop_once(self) -> None:
-        """Process one callback from one of the workers."""
-        while 1:
-            if not self._active_nodes:
-                # If everything has died stop looping
-                self.triggershutdown()
-                raise RuntimeError("Unexpectedly no active workers available")
+        """Process all events queued by the workers, waiting for at least one.
+
+        Events are queued by the receiver threads of the worker gateways,
+        including the ``errordown`` event when a worker dies, so the wait
+        is only interrupted by actual events.  The scheduler state is
+        evaluated once for the whole batch.
+        """
+        if not self._active_nodes:
+            # If everything has died stop looping
+            self.triggershutdown()
+            raise RuntimeError("Unexpectedly no active workers available")
+        eventcalls = [self._get_event()]
+        while True:
             try:
-                eventcall = self.queue.get(timeout=2.0)
-                break
+                eventcalls.append(self.queue.get_nowait())
             except Empty:
+                break
+        # Test completions are passed to the scheduler together per node,
+        # before any event which depends on the scheduler state.
+        completed: dict[WorkerController, list[tuple[int, float]]] = {}
+        for callname, kwargs in eventcalls:
+            assert callname, kwargs
+            if kwargs.get("node") in self._bisect_nodes:
+                self._bisection_event(callname, **kwargs)
                 continue
-        callname, kwargs = eventcall
-        assert callname, kwargs
-        method = "worker_" + callname
-        call = getattr(self, method)
-        self.log("calling method", method, kwargs)
-        call(**kwargs)
+            if callname == "runtest_protocol_complete":
+                if self._journal is not None:
+                    # in event order, the reports of the node are of this test
+                    self._record_completed(kwargs["node"])
+                if self.passed_tests is not None and self._passing.pop(
+                    kwargs["node"], False
+                ):
+                    self.passed_tests.add(kwargs["item_index"])
+                completed.setdefault(kwargs["node"], []).append(
+                    (kwargs["item_index"], kwargs["duration"])
+                )
+                continue
+            if completed and callname not in self.SCHEDULER_INDEPENDENT_EVENTS:
+                self._mark_tests_complete(completed)
+            method = "worker_" + callname
+            call = getattr(self, method)
+            self.log("calling method", method, kwargs)
+            call(**kwargs)
+            if self.shouldstop:
+                # before the completions of the batch which follow can
+                # schedule more tests, which would run before the shutdown
+                self.triggershutdown()
+        if completed:
+            self._mark_tests_complete(completed)
+        self._write_live_status()
         assert self.sched is not None
         if self.sched.tests_finished:
             self.triggershutdown()
 
+    def _mark_tests_complete(
+        self, completed: dict[WorkerController, list[tuple[int, float]]]
+    ) -> None:
+        assert self.sched is not None
+        for node, items in completed.items():
+            if node in self._retry_nodes:
+                self._retry_nodes[node] = None
+                continue
+            if len(items) == 1 or not hasattr(self.sched, "mark_tests_complete"):
+                # schedulers from plugins might not implement the batch variant
+                for item_index, duration in items:
+                    self.worker_runtest_protocol_complete(node, item_index, duration)
+            else:
+                item_indices = [item_index for item_index, _ in items]
+                self.log("marking tests complete", node, item_indices)
+                self.sched.mark_tests_complete(node, item_indices, items[-1][1])
+        completed.clear()
+
+    def _record_completed(self, node: WorkerController) -> None:
+        assert self._journal is not None
+        reports = self._journal_reports.pop(node, [])
+        if reports:
+            self._journal.add(reports[0]["nodeid"], reports)
+
+    def _replay_journal(self) -> None:
+        """Report the results of the tests completed by the interrupted run,
+        and collected by this one."""
+        if self._journal is None or self._journal_replayed:
+            return
+        self._journal_replayed = True
+        for nodeid, reports in self._journal.completed.items():
+            if nodeid not in self._resumed:
+                continue
+            for data in reports:
+                rep = self.config.hook.pytest_report_from_serializable(
+                    config=self.config, data=data
+                )
+                self.config.hook.pytest_runtest_logreport(report=rep)
+                self._handlefailures(rep)
+                if self._result_log is not None:
+                    self._result_log.add_report(rep, None)
+
+    def _get_event(self) -> tuple[str, dict[str, Any]]:
+        timeout = self.INTERRUPT_CHECK_INTERVAL
+        if self._live_status is not None:
+            timeout = min(timeout, self._live_status.interval)
+        while True:
+            try:
+                # The timeout only keeps the wait interruptible by Ctrl-C
+                # on Windows, where blocking lock acquisitions are not,
+                # and the status line written while no test completes.
+                return self.queue.get(timeout=timeout)
+            except Empty:
+                self._write_live_status()
+
+    def _write_live_status(self) -> None:
+        """Write the --xdist-live-status line, if it is due.
+
+        The line is written as a line of its own rather than rewritten in
+        place, as the progress output of the tests is written to the same
+        line.
+        """
+        status = self._live_status
+        if status is None or status.started is None:
+            return
+        now = time.monotonic()
+        if not status.due(now):
+            return
+        # gw2 before gw10
+        workers = sorted(
+            (node.gateway.id for node in self._active_nodes),
+            key=lambda name: (len(name), name),
+        )
+        # the tests held by the scheduler, and the crashed tests to retry
+        pending: int | None = getattr(self.sched, "pending_count", None)
+        if pending is not None:
+            pending += sum(1 for nodeid in self._retry_nodes.values() if nodeid)
+        self.terminal.write_line(status.line(workers, now, pending))
+
+    def _start_live_status(self, ids: Sequence[str]) -> None:
+        assert self._live_status is not None
+        runs = 1
+        if isinstance(self.sched, EachScheduling):
+            runs = self.sched.numnodes
+        elif isinstance(self.sched, EachLoadScheduling):
+            runs = len(self.sched.groups)
+        elif isinstance(self.sched, LoadScopeScheduling) and self.sched.lazy_collection:
+            assert self.sched.collection is not None
+            ids = self.sched.collection
+        self._live_status.start(ids, runs)
+
     #
     # callbacks for processing events from workers
     #
@@ -191,7 +474,16 @@ class DSession:
         node.workerinfo["spec"] = node.gateway.spec
 
         self.config.hook.pytest_testnodeready(node=node)
-        if self.shuttingdown:
+        if node in self._standby_nodes:
+            # added to the scheduler when it replaces a crashed node
+            if self.shuttingdown:
+                node.shutdown()
+        elif node in self._retry_nodes:
+            # not part of the scheduling, runs its test even if all other
+            # tests are done
+            if self.shouldstop:
+                node.shutdown()
+        elif self.shuttingdown:
             node.shutdown()
         else:
             assert self.sched is not None
@@ -222,6 +514,9 @@ class DSession:
             if node in self.sched.nodes:
                 crashitem = self.sched.remove_node(node)
                 assert not crashitem, (crashitem, node)
+        self._retry_nodes.pop(node, None)
+        self._standby_nodes.pop(node, None)
+        self._history.pop(node, None)
         self._active_nodes.remove(node)
 
     def worker_internal_error(
@@ -245,6 +540,26 @@ class DSession:
     def worker_errordown(self, node: WorkerController, error: object | None) -> None:
         """Emitted by the WorkerController when a node dies."""
         self.config.hook.pytest_testnodedown(node=node, error=error)
+        # the reports of the test it crashed in
+        self._journal_reports.pop(node, None)
+        self._passing.pop(node, None)
+        if node in self._standby_nodes:
+            # not replaced: it crashed before running any test
+            del self._standby_nodes[node]
+            self._active_nodes.remove(node)
+            return
+        if node in self._retry_nodes:
+            crashitem = self._retry_nodes.pop(node)
+            if crashitem:
+                self._retry_crashitem(crashitem, node)
+            self._active_nodes.remove(node)
+            return
+        for waiting in self._collection_waiting.values():
+            if node in waiting:
+                if waiting[0] is node and len(waiting) > 1:
+                    # it was asked for the ids: ask the next one
+                    waiting[1].send_collection_request()
+                waiting.remove(node)
         assert self.sched is not None
         try:
             crashitem = self.sched.remove_node(node)
@@ -252,7 +567,10 @@ class DSession:
             pass
         else:
             if crashitem:
-                self.handle_crashitem(crashitem, node)
+                self._retry_crashitem(crashitem, node)
+                if self._bisect_crashes:
+                    self._queue_bisection(crashitem, node)
+        self._history.pop(node, None)
 
         self._failed_nodes_count += 1
         maximum_reached = (
@@ -270,16 +588,47 @@ class DSession:
         else:
             self.report_line("\nreplacing crashed worker %s" % node.gateway.id)
             self.shuttingdown = False
-            self._clone_node(node)
+            if not self._promote_standby_node(node):
+                self._clone_node(node)
         self._active_nodes.remove(node)
 
     @pytest.hookimpl
     def pytest_terminal_summary(self, terminalreporter: Any) -> None:
+        if self._aggregator is not None and self._aggregator.labels:
+            terminalreporter.write_sep("=", "xdist environments")
+            for line in self._aggregator.summary():
+                terminalreporter.write_line(line)
+        if self._bisect_results:
+            terminalreporter.write_sep("=", "xdist crash bisection")
+            for line in self._bisect_results:
+                terminalreporter.write_line(line)
         if self.config.option.verbose >= 0 and self._summary_report:
             terminalreporter.write_sep("=", f"xdist: {self._summary_report}")
 
+    def worker_collectionfiles(
+        self, node: WorkerController, files: Sequence[str]
+    ) -> None:
+        """Worker has listed its test files without collecting them.
+
+        Only sent with ``--lazy-collection``: the scheduler assigns part of the
+        files to the worker, which then collects only these.
+        """
+        crashitem = self._retry_nodes.get(node)
+        if crashitem:
+            fspath = crashitem.split("::")[0]
+            node.send_collect_files([file for file in files if file == fspath])
+            return
+        if isinstance(self.sched, LoadScopeScheduling):
+            files = self.sched.assign_files(node, files)
+        node.send_collect_files(files)
+
     def worker_collectionfinish(
-        self, node: WorkerController, ids: Sequence[str]
+        self,
+        node: WorkerController,
+        ids: Sequence[str] | None = None,
+        digest: str | None = None,
+        nosplit: Sequence[int] | None = None,
+        resumed: Sequence[str] | None = None,
     ) -> None:
         """Worker has finished test collection.
 
@@ -288,14 +637,55 @@ class DSession:
         initial nodes have submitted their collections), then tells the
         scheduler to schedule the collected items.  When initiating
         scheduling the first time it logs which scheduler is in use.
+
+        Workers only send the ``digest`` of their collection at first: the
+        ids are requested from the first worker with a given digest, and
+        reused for all other workers with the same one.
+
+        With ``--loadscope-split``, ``nosplit`` are the indices of the tests
+        marked with ``xdist_no_split`` in the collection of the worker.
+
+        With ``--xdist-resume``, ``resumed`` are the tests completed by the
+        interrupted run which the worker collected, and deselected.
         """
-        if self.shuttingdown:
+        if self.shuttingdown and node not in self._retry_nodes:
+            return
+        if nosplit:
+            self._nosplit[node] = nosplit
+        if resumed:
+            self._resumed.update(resumed)
+        if digest is not None:
+            if ids is None:
+                ids = self._collections.get(digest)
+                if ids is None:
+                    waiting = self._collection_waiting.setdefault(digest, [])
+                    if not waiting:
+                        node.send_collection_request()
+                    waiting.append(node)
+                    return
+            else:
+                self._collections[digest] = ids
+                for other in self._collection_waiting.pop(digest, []):
+                    if other is not node:
+                        self._add_node_collection(other, ids)
+        assert ids is not None
+        self._add_node_collection(node, ids)
+
+    def _add_node_collection(self, node: WorkerController, ids: Sequence[str]) -> None:
+        if node in self._standby_nodes:
+            self._standby_nodes[node] = ids
+            return
+        if node in self._retry_nodes:
+            self._run_crashitem(node, ids)
             return
         self.config.hook.pytest_xdist_node_collection_finished(node=node, ids=ids)
+        nosplit = self._nosplit.pop(node, None)
+        if nosplit and isinstance(self.sched, LoadScopeScheduling):
+            self.sched.add_unsplittable(ids[index] for index in nosplit)
         # tell session which items were effectively collected otherwise
         # the controller node will finish the session with EXIT_NOTESTSCOLLECTED
         assert self._session is not None
-        self._session.testscollected = len(ids)
+        self._session.testscollected = len(ids) + len(self._resumed)
         assert self.sched is not None
         self.sched.add_node_collection(node, ids)
         if self.terminal:
@@ -310,7 +700,19 @@ class DSession:
                     self.terminal.write_line(
                         f"scheduling tests via {self.sched.__class__.__name__}"
                     )
+            self._replay_journal()
             self.sched.schedule()
+            if self._live_status is not None and self._live_status.started is None:
+                self._start_live_status(ids)
+            if self.passed_tests is not None and not self.passed_tests.collection:
+                self.passed_tests.set_collection(ids)
+            if (
+                isinstance(self.sched, LoadScopeScheduling)
+                and self.sched.lazy_collection
+                and self.sched.collection is not None
+            ):
+                # each node only collected its own part of the tests
+                self._session.testscollected = len(self.sched.collection)
 
     def worker_logstart(
         self,
@@ -319,7 +721,12 @@ class DSession:
         location: tuple[str, int | None, str],
     ) -> None:
         """Emitted when a node calls the pytest_runtest_logstart hook."""
-        self.config.hook.pytest_runtest_logstart(nodeid=nodeid, location=location)
+        if self._bisect_crashes:
+            self._history.setdefault(node, []).append(nodeid)
+        if self._live_status is not None:
+            self._live_status.test_started(node.gateway.id)
+        if self._aggregator is None:
+            self.config.hook.pytest_runtest_logstart(nodeid=nodeid, location=location)
 
     def worker_logfinish(
         self,
@@ -328,13 +735,30 @@ class DSession:
         location: tuple[str, int | None, str],
     ) -> None:
         """Emitted when a node calls the pytest_runtest_logfinish hook."""
-        self.config.hook.pytest_runtest_logfinish(nodeid=nodeid, location=location)
+        if self._live_status is not None:
+            self._live_status.test_finished(node.gateway.id, nodeid)
+        if self._aggregator is None:
+            self.config.hook.pytest_runtest_logfinish(nodeid=nodeid, location=location)
 
     def worker_testreport(self, node: WorkerController, rep: pytest.TestReport) -> None:
         """Emitted when a node calls the pytest_runtest_logreport hook."""
+        if self._journal is not None:
+            data = self.config.hook.pytest_report_to_serializable(
+                config=self.config, report=rep
+            )
+            self._journal_reports.setdefault(node, []).append(data)
+        if self._result_log is not None:
+            self._result_log.add_report(rep, node.gateway.id)
+        if self.passed_tests is not None:
+            self._passing[node] = self._passing.get(node, True) and rep.passed
         rep.node = node  # type: ignore[attr-defined]
-        self.config.hook.pytest_runtest_logreport(report=rep)
+        if self._aggregator is not None:
+            self._aggregator.add(node, rep)
+        else:
+            self.config.hook.pytest_runtest_logreport(report=rep)
         self._handlefailures(rep)
+        if self._duration_cache is not None:
+            self._duration_cache.add(rep.nodeid, rep.duration)
 
     def worker_runtest_protocol_complete(
         self, node: WorkerController, item_index: int, duration: float
@@ -401,8 +825,65 @@ class DSession:
         self.nodemanager.group.allocate_id(spec)
         clone = self.nodemanager.setup_node(spec, self.queue.put)
         self._active_nodes.add(clone)
+        if self._aggregator is not None:
+            self._aggregator.add_replacement(clone, node)
         return clone
 
+    def _spawn_extra_node(self, spec: execnet.XSpec | None = None) -> WorkerController:
+        """Start a node outside of the scheduling, using the given spec or
+        the first one.
+
+        Its status is not shown.
+        """
+        assert self.nodemanager is not None
+        spec = copy.copy(spec or self.nodemanager.specs[0])
+        spec.id = None
+        self.nodemanager.group.allocate_id(spec)
+        if self.terminal:
+            self.trdist.hidden.add(str(spec.id))
+        node = self.nodemanager.setup_node(spec, self.queue.put)
+        self._active_nodes.add(node)
+        return node
+
+    def _spawn_standby_node(
+        self, spec: execnet.XSpec | None = None
+    ) -> WorkerController:
+        """Start a standby node, which collects and then waits to replace a
+        crashed node."""
+        node = self._spawn_extra_node(spec)
+        self._standby_nodes[node] = None
+        return node
+
+    def _promote_standby_node(self, crashed: WorkerController) -> bool:
+        """Add a standby node which finished collection to the scheduler in
+        place of a crashed node, and start a new standby node in its place.
+
+        Returns False if no standby node of the environment of the crashed
+        node finished collection yet.
+        """
+        environment = spec_environment(crashed.gateway.spec)
+        node = next(
+            (
+                node
+                for node, ids in self._standby_nodes.items()
+                if ids is not None
+                and spec_environment(node.gateway.spec) == environment
+            ),
+            None,
+        )
+        if node is None:
+            return False
+        ids = self._standby_nodes.pop(node)
+        assert ids is not None
+        self.log("promoting standby node", node)
+        if self.terminal:
+            self.trdist.hidden.discard(node.gateway.spec.id)
+        assert self.sched is not None
+        self.sched.add_node(node)
+        self._add_node_collection(node, ids)
+        self._spawn_standby_node(node.gateway.spec)
+        return True
+
     def _failed_worker_collectreport(
         self,
         node: WorkerController,
@@ -414,6 +895,8 @@ class DSession:
             self._failed_collection_errors[rep.longrepr] = True
             self.config.hook.pytest_collectreport(report=rep)
             self._handlefailures(rep)
+            if self._result_log is not None:
+                self._result_log.add_report(rep, node.gateway.id)
 
     def _handlefailures(
         self,
@@ -435,12 +918,118 @@ class DSession:
             assert self.sched is not None
             for node in self.sched.nodes:
                 node.shutdown()
+            if self.shouldstop:
+                for node in self._retry_nodes:
+                    node.shutdown()
+                for node in self._bisect_nodes:
+                    node.shutdown()
+            for node in self._standby_nodes:
+                node.shutdown()
+
+    def _retry_crashitem(self, nodeid: str, worker: WorkerController) -> None:
+        """Run a test which crashed its worker again, alone on a new worker.
+
+        The test is reported as failed once it crashed more than
+        ``--xdist-crash-retries`` times.
+        """
+        crashes = self._crash_counts[nodeid] = self._crash_counts.get(nodeid, 0) + 1
+        if crashes > self._crash_retries or self.shouldstop:
+            self.handle_crashitem(nodeid, worker)
+            return
+        self.report_line(
+            f"\nworker {worker.gateway.id} crashed while running {nodeid!r}, "
+            f"running it again alone on a new worker "
+            f"({crashes}/{self._crash_retries})"
+        )
+        clone = self._clone_node(worker)
+        self._retry_nodes[clone] = nodeid
+
+    def _run_crashitem(self, node: WorkerController, ids: Sequence[str]) -> None:
+        """Send the test to retry to the worker running it alone."""
+        nodeid = self._retry_nodes[node]
+        assert nodeid is not None
+        try:
+            index = ids.index(nodeid)
+        except ValueError:
+            # not collected by the new worker, report the crash
+            self._retry_nodes[node] = None
+            self.handle_crashitem(nodeid, node)
+        else:
+            node.send_runtest_some([index])
+        node.shutdown()
+
+    def _queue_bisection(self, nodeid: str, worker: WorkerController) -> None:
+        """Bisect the tests run by a crashed node before the crashed test."""
+        history = self._history.pop(worker, [])
+        if history and history[-1] == nodeid:
+            history.pop()
+        if any(b.crashitem == nodeid for b in self._bisections):
+            return
+        bisection = CrashBisection(nodeid, history)
+        self._bisections.append(bisection)
+        self.report_line(
+            f"\nbisecting the crash of {nodeid!r} over the {len(history)} tests "
+            f"which ran before it (at most {bisection.runs} runs)"
+        )
+        self._run_bisection_step()
+
+    def _run_bisection_step(self) -> None:
+        """Start a node for the next step of the first unfinished bisection."""
+        if self._bisect_nodes or self.shouldstop:
+            return
+        for bisection in self._bisections:
+            if bisection.next_tests() is not None:
+                node = self._spawn_extra_node()
+                self._bisect_nodes[node] = bisection
+                return
+
+    def _bisection_event(
+        self, callname: str, node: WorkerController, **kwargs: Any
+    ) -> None:
+        """Process an event of a node running a step of a crash bisection.
+
+        Its tests are not reported, only whether it crashed while running the
+        crashed test.
+        """
+        bisection = self._bisect_nodes[node]
+        if callname == "workerready":
+            if self.shouldstop:
+                node.shutdown()
+        elif callname == "collectionfiles":
+            fspaths = {nodeid.split("::")[0] for nodeid in bisection.current_tests}
+            node.send_collect_files([f for f in kwargs["files"] if f in fspaths])
+        elif callname == "collectionfinish":
+            ids = kwargs["ids"]
+            if ids is None:
+                ids = self._collections.get(kwargs["digest"])
+            if ids is None:
+                node.send_collection_request()
+                return
+            index = {nodeid: i for i, nodeid in enumerate(ids)}
+            node.send_runtest_some(
+                [index[t] for t in bisection.current_tests if t in index]
+            )
+            node.shutdown()
+        elif callname == "logstart":
+            bisection.running = kwargs["nodeid"]
+        elif callname in ("workerfinished", "errordown"):
+            del self._bisect_nodes[node]
+            self._active_nodes.remove(node)
+            crashed = callname == "errordown" and (
+                bisection.running == bisection.crashitem
+            )
+            bisection.record(crashed)
+            if bisection.done:
+                self._bisect_results.append(bisection.result())
+            self._run_bisection_step()
 
     def handle_crashitem(self, nodeid: str, worker: WorkerController) -> None:
         # XXX get more reporting info by recording pytest_runtest_logstart?
-        # XXX count no of failures and retry N times
         fspath = nodeid.split("::")[0]
         msg = f"worker {worker.gateway.id!r} crashed while running {nodeid!r}"
+        crashes = self._crash_counts.get(nodeid, 1)
+        if crashes > 1:
+            msg += f" ({crashes} times, the last ones alone on a new worker)"
         rep = pytest.TestReport(
             nodeid=nodeid,
             location=(fspath, None, fspath),
@@ -456,7 +1045,12 @@ class DSession:
             report=rep,
             sched=self.sched,
         )
-        self.config.hook.pytest_runtest_logreport(report=rep)
+        if self._result_log is not None:
+            self._result_log.add_report(rep, worker.gateway.id)
+        if self._aggregator is not None:
+            self._aggregator.add(worker, rep)
+        else:
+            self.config.hook.pytest_runtest_logreport(report=rep)
 
 
 class WorkerStatus(Enum):
@@ -480,6 +1074,9 @@ class TerminalDistReporter:
         self.config = config
         self.tr = config.pluginmanager.getplugin("terminalreporter")
         self._status: dict[object, tuple[WorkerStatus, int]] = {}
+        # ids of the workers outside of the scheduling (standby workers,
+        # crash bisection), whose status is not shown
+        self.hidden: set[str] = set()
         self._lastlen = 0
         self._isatty = getattr(self.tr, "isatty", self.tr.hasmarkup)
 
@@ -498,13 +1095,18 @@ class TerminalDistReporter:
         tests_collected: int,
         show: bool = True,
     ) -> None:
+        if spec.id in self.hidden:
+            return
         self._status[spec.id] = (status, tests_collected)
         if show and self._isatty:
             self.rewrite(self.getstatus())
 
     def getstatus(self) -> str:
         if self.config.option.verbose >= 0:
-            line = get_workers_status_line(list(self._status.values()))
+            line = get_workers_status_line(
+                list(self._status.values()),
+                partitioned=bool(self.config.getoption("lazycollection")),
+            )
             if line:
                 return line
 
@@ -577,19 +1179,27 @@ def get_default_max_worker_restart(config: pytest.Config) -> int | None:
 
 def get_workers_status_line(
     status_and_items: Sequence[tuple[WorkerStatus, int]],
+    *,
+    partitioned: bool = False,
 ) -> str:
     """
     Return the line to display during worker setup/collection based on the
     status of the workers and number of tests collected for each.
+
+    ``partitioned`` means that each worker collected a different part of the
+    tests (``--lazy-collection``), instead of all of them.
     """
     statuses = [s for s, c in status_and_items]
     total_workers = len(statuses)
     workers_noun = "worker" if total_workers == 1 else "workers"
     if status_and_items and all(s == WorkerStatus.CollectionDone for s in statuses):
-        # All workers collect the same number of items, so we grab
-        # the total number of items from the first worker.
-        first = status_and_items[0]
-        _status, tests_collected = first
+        if partitioned:
+            tests_collected = sum(c for s, c in status_and_items)
+        else:
+            # All workers collect the same number of items, so we grab
+            # the total number of items from the first worker.
+            first = status_and_items[0]
+            _status, tests_collected = first
         tests_noun = "item" if tests_collected == 1 else "items"
         return f"{total_workers} {workers_noun} [{tests_collected} {tests_noun}]"
     if WorkerStatus.CollectionDone in statuses:
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+import pytest
+
+
+class DurationCache:
+    """Test durations of previous runs, kept in the pytest cache.
+
+    The duration of a test is the total duration of its setup, call and
+    teardown phases.  Durations measured in the current run replace the
+    stored ones when the run finishes; tests which did not run keep their
+    previous duration.
+    """
+
+    KEY = "xdist/durations"
+
+    def __init__(self, config: pytest.Config) -> None:
+        assert config.cache is not None
+        self.cache = config.cache
+        self.durations: dict[str, float] = self.cache.get(self.KEY, {})
+        self.measured: dict[str, float] = {}
+        self._mean: float | None = None
+
+    @property
+    def mean(self) -> float | None:
+        """The mean stored duration, None if no duration is known."""
+        if self._mean is None and self.durations:
+            self._mean = sum(self.durations.values()) / len(self.durations)
+        return self._mean
+
+    def add(self, nodeid: str, duration: float) -> None:
+        """Add the duration of a phase of a test of the current run."""
+        self.measured[nodeid] = self.measured.get(nodeid, 0.0) + duration
+
+    def estimate(self, nodeids: Iterable[str]) -> float | None:
+        """Return the expected total duration of the given tests.
+
+        Tests without a known duration are expected to take the mean
+        duration.  Returns None if no duration is known at all.
+        """
+        mean = self.mean
+        if mean is None:
+            return None
+        durations = self.durations
+        return sum(durations.get(nodeid, mean) for nodeid in nodeids)
+
+    def save(self) -> None:
+        """Store the durations measured in the current run."""
+        if not self.measured:
+            return
+        self.durations.update(self.measured)
+        self.measured = {}
+        self._mean = None
+        self.cache.set(self.KEY, self.durations)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+import hashlib
+import json
+from typing import Any
+from typing import TextIO
+
+import pytest
+
+
+class RunJournal:
+    """Tests completed by a run, with their reports, kept in the pytest cache.
+
+    Each completed test is appended to the journal as soon as the worker
+    running it signals the end of its run test protocol, together with the
+    serialized reports of its phases, so the journal survives the run being
+    killed.  A run started with the journal of an interrupted run skips the
+    tests recorded in it which it collected, and replays their reports
+    instead.
+
+    Since the tests run depend on the command line arguments, a separate
+    journal is kept for each set of arguments: a run only resumes a run
+    interrupted with the same arguments.  The journal is removed when a run
+    finishes without being interrupted.
+    """
+
+    def __init__(self, config: pytest.Config) -> None:
+        assert config.cache is not None
+        args = "\0".join(str(x) for x in config.invocation_params.args)
+        argshash = hashlib.sha256(args.encode("utf-8", "surrogatepass")).hexdigest()
+        self.path = config.cache.mkdir("xdist") / f"journal-{argshash[:16]}.jsonl"
+        # nodeid -> serialized reports, of the interrupted run
+        self.completed: dict[str, list[dict[str, Any]]] = self._load()
+        self._file: TextIO | None = None
+
+    def _load(self) -> dict[str, list[dict[str, Any]]]:
+        completed: dict[str, list[dict[str, Any]]] = {}
+        try:
+            f = self.path.open(encoding="utf-8")
+        except OSError:
+            return completed
+        with f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # the last line of a killed run may be truncated
+                    break
+                completed[entry["nodeid"]] = entry["reports"]
+        return completed
+
+    def add(self, nodeid: str, reports: Sequence[dict[str, Any]]) -> None:
+        """Record a completed test with the serialized reports of its phases."""
+        if self._file is None:
+            # keep the tests completed by the interrupted run, if any
+            self._file = self.path.open("a", encoding="utf-8")
+        entry = {"nodeid": nodeid, "reports": reports}
+        self._file.write(json.dumps(entry, default=str) + "\n")
+        self._file.flush()
+
+    def close(self, finished: bool) -> None:
+        """Close the journal, and remove it if the run finished."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if finished:
+            self.path.unlink(missing_ok=True)
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+import time
+
+from xdist.durations import DurationCache
+
+
+def format_duration(seconds: float) -> str:
+    """Format a duration as e.g. ``1h02m``, ``3m05s`` or ``42s``."""
+    seconds = round(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+class LiveStatus:
+    """Throughput of the workers while the tests run, for a status line.
+
+    The status line shows the number of tests completed per second by each
+    worker since the previous line, the workers not running a test, the
+    number of tests not completed yet, and the expected remaining duration.
+    The latter is based on the durations of previous runs if they are known
+    (``--duration-cache``), and on the throughput of the run so far
+    otherwise.  The number of tests not completed yet is the one given by
+    the scheduler, if any, and the number of tests to run minus those which
+    completed otherwise.
+    """
+
+    def __init__(self, interval: float, durations: DurationCache | None) -> None:
+        self.interval = interval
+        self.durations = durations
+        self.last = time.monotonic()
+        # when the tests to run were set, None before
+        self.started: float | None = None
+        self.total = 0
+        self.done = 0
+        # expected duration of the tests not completed yet
+        self.remaining_cost: float | None = None
+        # tests completed by each worker since the previous line
+        self.completed: dict[str, int] = {}
+        self.running: set[str] = set()
+
+    def start(self, nodeids: Sequence[str], runs: int = 1) -> None:
+        """Set the tests to run, each of them ``runs`` times."""
+        self.started = time.monotonic()
+        self.total = len(nodeids) * runs
+        if self.durations is not None:
+            cost = self.durations.estimate(nodeids)
+            self.remaining_cost = None if cost is None else cost * runs
+
+    def test_started(self, worker: str) -> None:
+        self.running.add(worker)
+
+    def test_finished(self, worker: str, nodeid: str) -> None:
+        self.running.discard(worker)
+        self.completed[worker] = self.completed.get(worker, 0) + 1
+        self.done += 1
+        if self.remaining_cost is not None and self.durations is not None:
+            cost = self.durations.estimate([nodeid]) or 0.0
+            self.remaining_cost = max(0.0, self.remaining_cost - cost)
+
+    def due(self, now: float) -> bool:
+        return now - self.last >= self.interval
+
+    def line(
+        self, workers: Sequence[str], now: float, pending: int | None = None
+    ) -> str:
+        """Return the status line, and start a new measuring interval."""
+        elapsed = max(now - self.last, 1e-9)
+        rates = ", ".join(
+            f"{worker} {self.completed.get(worker, 0) / elapsed:.1f}/s"
+            for worker in workers
+        )
+        idle = sum(1 for worker in workers if worker not in self.running)
+        if pending is None:
+            pending = max(0, self.total - self.done)
+        workers_noun = "worker" if len(workers) == 1 else "workers"
+        parts = [
+            f"{len(workers)} {workers_noun}",
+            f"{idle} idle",
+            f"{pending} tests pending",
+        ]
+        eta = self.eta(len(workers), now, pending)
+        if eta is not None:
+            parts.append(f"ETA {format_duration(eta)}")
+        self.completed.clear()
+        self.last = now
+        return f"[xdist] {', '.join(parts)}: {rates}"
+
+    def eta(self, workers: int, now: float, pending: int | None = None) -> float | None:
+        """Return the expected remaining duration of the run, if known."""
+        if self.remaining_cost is not None and workers:
+            return self.remaining_cost / workers
+        if pending is None:
+            pending = self.total - self.done
+        if self.started is None or not self.done or pending <= 0:
+            return None
+        return pending * (now - self.started) / self.done
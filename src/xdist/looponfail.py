@@ -9,18 +9,26 @@ the controlling process which should best never happen.
 
 from __future__ import annotations
 
+from collections.abc import Generator
+from collections.abc import Iterator
 from collections.abc import Sequence
+import fnmatch
+import json
 import os
 from pathlib import Path
+import re
 import sys
 import time
 from typing import Any
+from typing import TYPE_CHECKING
 
 from _pytest._io import TerminalWriter
 import execnet
 import pytest
 
-from xdist._path import visit_path
+
+if TYPE_CHECKING:
+    from xdist.workermanage import WorkerController
 
 
 @pytest.hookimpl
@@ -33,7 +41,23 @@ def pytest_addoption(parser: pytest.Parser) -> None:
         dest="looponfail",
         default=False,
         help="Run tests in subprocess: wait for files to be modified, then "
-        "re-run failing test set until all pass.",
+        "re-run failing test set until all pass.\n"
+        "Combine with -n/--tx to distribute the test runs across workers.",
+    )
+    group.addoption(
+        "--looponfail-impact",
+        action="store",
+        dest="looponfailimpact",
+        choices=["no", "only", "first"],
+        default="no",
+        help=(
+            "Select the tests to re-run with --looponfail using the files each "
+            "test executed in previous runs.\n\n"
+            "only: after a change, run only the tests impacted by the changed files.\n\n"
+            "first: run the impacted tests first, then the rest of the test suite "
+            "once they pass.\n\n"
+            "(default) no: re-run the whole test suite."
+        ),
     )
 
 
@@ -48,23 +72,75 @@ def pytest_cmdline_main(config: pytest.Config) -> int | None:
     return None
 
 
-def looponfail_main(config: pytest.Config) -> None:
-    remotecontrol = RemoteControl(config)
+@pytest.hookimpl
+def pytest_collection(session: pytest.Session) -> bool | None:
+    """Collect the failure trails sent by a distributed looponfail session.
+
+    When looponfail is combined with ``-n``/``--tx``, the failing tests are run
+    by regular xdist workers, which receive the trails through their
+    ``workerinput`` (see ``WorkerFailSession.pytest_configure_node``).
+    """
+    workerinput = getattr(session.config, "workerinput", None)
+    if workerinput is None or not workerinput.get("looponfailtrails"):
+        return None
+    try:
+        session.perform_collect(workerinput["looponfailtrails"])
+    except pytest.UsageError:
+        session.perform_collect(None)
+    return True
+
+
+@pytest.hookimpl
+def pytest_configure(config: pytest.Config) -> None:
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None and "looponfailimpact" in workerinput:
+        tracker = ImpactTracker(config, workerinput["looponfailimpact"])
+        config.pluginmanager.register(tracker, "looponfailimpact")
+
+
+def get_rootdirs(config: pytest.Config) -> list[Path]:
     config_roots = config.getini("looponfailroots")
     if not config_roots:
         config_roots = [Path.cwd()]
-    rootdirs = [Path(root) for root in config_roots]
-    statrecorder = StatRecorder(rootdirs)
+    return [Path(root) for root in config_roots]
+
+
+def get_snapshotpath(config: pytest.Config) -> Path | None:
+    """Return where StatRecorder keeps its snapshot, inside the pytest cache."""
+    if not config.pluginmanager.has_plugin("cacheprovider"):
+        return None
+    # The controlling process is not configured, so config.cache is not set.
+    cache = pytest.Cache.for_config(config, _ispytest=True)
+    return cache.mkdir("xdist-looponfail") / "statrecorder.json"
+
+
+def looponfail_main(config: pytest.Config) -> None:
+    remotecontrol = RemoteControl(config)
+    rootdirs = get_rootdirs(config)
+    statrecorder = StatRecorder(
+        rootdirs,
+        ignore=config.getini("looponfailignore"),
+        snapshotpath=get_snapshotpath(config),
+    )
     try:
         while 1:
             remotecontrol.loop_once()
             if not remotecontrol.failures and remotecontrol.wasfailing:
                 # the last failures passed, let's immediately rerun all
                 continue
+            if (
+                not remotecontrol.failures
+                and remotecontrol.wasimpacted
+                and remotecontrol.impact == "first"
+            ):
+                # the impacted tests passed, let's immediately run the rest
+                continue
             repr_pytest_looponfailinfo(
                 failreports=remotecontrol.failures, rootdirs=rootdirs
             )
             statrecorder.waitonchange(checkinterval=2.0)
+            if remotecontrol.impact != "no":
+                remotecontrol.changed.update(str(p) for p in statrecorder.changedfiles)
     except KeyboardInterrupt:
         print()
 
@@ -75,6 +151,9 @@ class RemoteControl:
     def __init__(self, config: pytest.Config) -> None:
         self.config = config
         self.failures: list[str] = []
+        self.impact: str = config.option.looponfailimpact
+        # files changed since the impacted tests last passed
+        self.changed: set[str] = set()
 
     def trace(self, *args: object) -> None:
         if self.config.option.debug:
@@ -115,10 +194,21 @@ class RemoteControl:
             self.gateway.exit()
             del self.gateway
 
+    def impacted_by(self) -> list[str] | None:
+        """Return the changed files selecting the tests of the next run.
+
+        None means the impact of the changes is not used to select tests:
+        either the failing tests or the whole test suite are run.
+        """
+        if self.failures or self.impact == "no" or not self.changed:
+            return None
+        return sorted(self.changed)
+
     def runsession(self) -> tuple[list[str], list[str], bool]:
         try:
-            self.trace("sending", self.failures)
-            self.channel.send(self.failures)
+            command = (self.failures, self.impacted_by())
+            self.trace("sending", command)
+            self.channel.send(command)
             try:
                 return self.channel.receive()  # type: ignore[no-any-return]
             except self.channel.RemoteError:
@@ -131,6 +221,7 @@ class RemoteControl:
     def loop_once(self) -> None:
         self.setup()
         self.wasfailing = self.failures and len(self.failures)
+        self.wasimpacted = self.impacted_by() is not None
         result = self.runsession()
         failures, _reports, collection_failed = result
         if collection_failed:
@@ -141,6 +232,8 @@ class RemoteControl:
                 if failure not in uniq_failures:
                     uniq_failures.append(failure)
             self.failures = uniq_failures
+            if self.wasimpacted and not self.failures:
+                self.changed.clear()
 
 
 def repr_pytest_looponfailinfo(
@@ -217,6 +310,14 @@ class WorkerFailSession:
         hook.pytest_collection_finish(session=session)
         return True
 
+    @pytest.hookimpl
+    def pytest_configure_node(self, node: WorkerController) -> None:
+        # Only called when distributing (-n/--tx): the controller does not
+        # collect, so pass the trails on to the workers instead.
+        node.workerinput["looponfailtrails"] = self.current_command
+        if self.config.option.looponfailimpact != "no":
+            node.workerinput["looponfailimpact"] = self.changed
+
     @pytest.hookimpl
     def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
         if report.failed:
@@ -235,7 +336,10 @@ class WorkerFailSession:
         except KeyboardInterrupt:
             return  # in the worker we can't do much about this
         self.DEBUG("received", command)
-        self.current_command = command
+        self.current_command, self.changed = command
+        if self.config.option.looponfailimpact != "no":
+            tracker = ImpactTracker(self.config, self.changed)
+            self.config.pluginmanager.register(tracker, "looponfailimpact")
         self.config.hook.pytest_cmdline_main(config=self.config)
         trails, failreports = [], []
         for rep in self.recorded_failures:
@@ -247,10 +351,177 @@ class WorkerFailSession:
         self.channel.send(result)
 
 
+class ImpactTracker:
+    """Select the tests impacted by changed files, and record which files
+    each test executes.
+
+    The recorded files are kept in the pytest cache as a map of test node ids
+    to source files.  Tests not present in that map yet are always selected.
+    """
+
+    CACHE_KEY = "xdist/looponfail/impact"
+
+    def __init__(self, config: pytest.Config, changed: Sequence[str] | None) -> None:
+        self.config = config
+        self.changed = changed
+        self.rootprefixes = tuple(
+            os.path.join(os.path.abspath(root), "") for root in get_rootdirs(config)
+        )
+        self.recorded: dict[str, list[str]] = {}
+        self.tracer = FileTracer()
+
+    def is_impacted(self, files: Sequence[str] | None) -> bool:
+        assert self.changed is not None
+        return files is None or not set(self.changed).isdisjoint(files)
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(
+        self, config: pytest.Config, items: list[pytest.Item]
+    ) -> None:
+        if self.changed is None:
+            return
+        # Changes to conftest and non-Python files can impact any test.
+        for path in self.changed:
+            if not path.endswith(".py") or os.path.basename(path) == "conftest.py":
+                return
+        cache = getattr(config, "cache", None)
+        if cache is None:
+            return
+        index: dict[str, list[str]] = cache.get(self.CACHE_KEY, {})
+        selected = []
+        deselected = []
+        for item in items:
+            if self.is_impacted(index.get(item.nodeid)):
+                selected.append(item)
+            else:
+                deselected.append(item)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(
+        self, item: pytest.Item
+    ) -> Generator[None, object, None]:
+        self.tracer.start()
+        try:
+            yield
+        finally:
+            files = self.tracer.stop()
+        self.recorded[item.nodeid] = sorted(
+            f for f in files if f.startswith(self.rootprefixes)
+        )
+
+    @pytest.hookimpl
+    def pytest_testnodedown(self, node: WorkerController, error: object) -> None:
+        workeroutput = getattr(node, "workeroutput", {})
+        self.recorded.update(workeroutput.get("looponfailimpact", {}))
+
+    @pytest.hookimpl
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        self.tracer.close()
+        if hasattr(self.config, "workerinput"):
+            self.config.workeroutput["looponfailimpact"] = self.recorded  # type: ignore[attr-defined]
+            return
+        cache = getattr(self.config, "cache", None)
+        if cache is None or not self.recorded:
+            return
+        index = cache.get(self.CACHE_KEY, {})
+        index.update(self.recorded)
+        cache.set(self.CACHE_KEY, index)
+
+
+class FileTracer:
+    """Record the source files executing Python code between ``start()`` and
+    ``stop()``.
+
+    Uses ``sys.monitoring`` on Python 3.12+, where each code object only
+    reports its first call, and a profile function otherwise.
+    """
+
+    def __init__(self) -> None:
+        self.files: set[str] = set()
+        self._monitoring: Any = getattr(sys, "monitoring", None)
+        if self._monitoring is not None:
+            tool_id = self._monitoring.PROFILER_ID
+            try:
+                self._monitoring.use_tool_id(tool_id, "xdist-looponfail")
+            except ValueError:
+                # already used by another profiler
+                self._monitoring = None
+            else:
+                self._monitoring.register_callback(
+                    tool_id, self._monitoring.events.PY_START, self._py_start
+                )
+
+    def _py_start(self, code: Any, instruction_offset: int) -> object:
+        self.files.add(code.co_filename)
+        return self._monitoring.DISABLE
+
+    def _profile(self, frame: Any, event: str, arg: object) -> None:
+        if event == "call":
+            self.files.add(frame.f_code.co_filename)
+
+    def start(self) -> None:
+        self.files = set()
+        if self._monitoring is not None:
+            self._monitoring.restart_events()
+            self._monitoring.set_events(
+                self._monitoring.PROFILER_ID, self._monitoring.events.PY_START
+            )
+        else:
+            sys.setprofile(self._profile)
+
+    def stop(self) -> set[str]:
+        if self._monitoring is not None:
+            self._monitoring.set_events(self._monitoring.PROFILER_ID, 0)
+        else:
+            sys.setprofile(None)
+        return self.files
+
+    def close(self) -> None:
+        if self._monitoring is not None:
+            self._monitoring.free_tool_id(self._monitoring.PROFILER_ID)
+            self._monitoring = None
+
+
 class StatRecorder:
-    def __init__(self, rootdirlist: Sequence[Path]) -> None:
+    """Detect changes to the files below a list of root directories.
+
+    The filtered listing of each directory is cached together with the
+    directory's modification time, so directories without added, removed or
+    renamed entries are not listed again on every check.  Files are still
+    stat'ed on every check, as modifying a file in place does not change the
+    modification time of its directory.
+
+    :param ignore: ``.gitignore``-style patterns of files and directories to
+        skip, relative to each root directory.
+    :param snapshotpath: file in which the caches are saved after each change
+        and loaded from at creation, so the first check after a restart does
+        not list every directory again.
+    """
+
+    # Directories modified more recently than this (in seconds) are listed
+    # again on the next check: entries added within the timestamp granularity
+    # of the file system would not change the directory modification time.
+    RACY_DIR_SECONDS = 2.0
+
+    def __init__(
+        self,
+        rootdirlist: Sequence[Path],
+        ignore: Sequence[str] = (),
+        snapshotpath: Path | None = None,
+    ) -> None:
         self.rootdirlist = rootdirlist
-        self.statcache: dict[Path, os.stat_result] = {}
+        self.ignore = IgnorePatterns(ignore)
+        self.snapshotpath = snapshotpath
+        # file -> (st_mtime_ns, st_size)
+        self.statcache: dict[Path, tuple[int, int]] = {}
+        # directory -> (st_mtime_ns, files, subdirectories)
+        self.dircache: dict[Path, tuple[int, list[str], list[str]]] = {}
+        # files modified, created or removed in the last check()
+        self.changedfiles: list[Path] = []
+        self.load_snapshot()
         self.check()  # snapshot state
 
     def fil(self, p: Path) -> bool:
@@ -266,25 +537,71 @@ class StatRecorder:
                 return
             time.sleep(checkinterval)
 
+    def listdir(
+        self,
+        rootdir: Path,
+        dirpath: Path,
+        dircache: dict[Path, tuple[int, list[str], list[str]]],
+    ) -> tuple[list[str], list[str]]:
+        """Return the names of the files and subdirectories to check in ``dirpath``."""
+        mtime = dirpath.stat().st_mtime_ns
+        cached = dircache.get(dirpath)
+        if cached is not None and cached[0] == mtime:
+            self.dircache[dirpath] = cached
+            return cached[1], cached[2]
+        files = []
+        dirs = []
+        with os.scandir(dirpath) as entries:
+            for entry in entries:
+                p = Path(entry.path)
+                relpath = p.relative_to(rootdir).as_posix()
+                if entry.is_dir(follow_symlinks=False):
+                    if self.rec(p) and not self.ignore.match(relpath, isdir=True):
+                        dirs.append(entry.name)
+                elif self.fil(p) and not self.ignore.match(relpath, isdir=False):
+                    files.append(entry.name)
+        if time.time() - mtime / 1e9 > self.RACY_DIR_SECONDS:
+            self.dircache[dirpath] = (mtime, files, dirs)
+        return files, dirs
+
+    def walk(
+        self,
+        rootdir: Path,
+        dircache: dict[Path, tuple[int, list[str], list[str]]],
+    ) -> Iterator[Path]:
+        stack = [rootdir]
+        while stack:
+            dirpath = stack.pop()
+            try:
+                files, dirs = self.listdir(rootdir, dirpath, dircache)
+            except OSError:
+                # removed while walking
+                continue
+            for name in files:
+                yield dirpath / name
+            stack.extend(dirpath / name for name in dirs)
+
     def check(self, removepycfiles: bool = True) -> bool:
         changed = False
-        newstat: dict[Path, os.stat_result] = {}
+        changedfiles: list[Path] = []
+        newstat: dict[Path, tuple[int, int]] = {}
+        dircache, self.dircache = self.dircache, {}
         for rootdir in self.rootdirlist:
-            for path in visit_path(rootdir, filter=self.fil, recurse=self.rec):
+            for path in self.walk(rootdir, dircache):
                 oldstat = self.statcache.pop(path, None)
                 try:
-                    curstat = path.stat()
+                    st = path.stat()
                 except OSError:
                     if oldstat:
                         changed = True
+                        changedfiles.append(path)
                 else:
+                    curstat = (st.st_mtime_ns, st.st_size)
                     newstat[path] = curstat
                     if oldstat is not None:
-                        if (
-                            oldstat.st_mtime != curstat.st_mtime
-                            or oldstat.st_size != curstat.st_size
-                        ):
+                        if oldstat != curstat:
                             changed = True
+                            changedfiles.append(path)
                             print("# MODIFIED", path)
                             if removepycfiles and path.suffix == ".py":
                                 pycfile = path.with_suffix(".pyc")
@@ -293,7 +610,91 @@ class StatRecorder:
 
                     else:
                         changed = True
+                        changedfiles.append(path)
         if self.statcache:
             changed = True
+            changedfiles.extend(self.statcache)
         self.statcache = newstat
+        self.changedfiles = changedfiles
+        if changed:
+            self.save_snapshot()
         return changed
+
+    def _snapshot_key(self) -> dict[str, list[str]]:
+        return {
+            "rootdirs": [str(x) for x in self.rootdirlist],
+            "ignore": self.ignore.patterns,
+        }
+
+    def load_snapshot(self) -> None:
+        if self.snapshotpath is None:
+            return
+        try:
+            with open(self.snapshotpath, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("key") != self._snapshot_key():
+            return
+        self.statcache = {
+            Path(path): (mtime, size) for path, (mtime, size) in data["files"].items()
+        }
+        self.dircache = {
+            Path(path): (mtime, files, dirs)
+            for path, (mtime, files, dirs) in data["dirs"].items()
+        }
+
+    def save_snapshot(self) -> None:
+        if self.snapshotpath is None:
+            return
+        data = {
+            "key": self._snapshot_key(),
+            "files": {str(path): stat for path, stat in self.statcache.items()},
+            "dirs": {str(path): entry for path, entry in self.dircache.items()},
+        }
+        tmppath = self.snapshotpath.with_name(self.snapshotpath.name + ".tmp")
+        try:
+            with open(tmppath, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmppath, self.snapshotpath)
+        except OSError:
+            pass  # the snapshot is only an optimization
+
+
+class IgnorePatterns:
+    """Match paths relative to a root directory against ``.gitignore``-style
+    patterns.
+
+    Patterns use shell-style wildcards.  A pattern prefixed with ``!``
+    re-includes paths ignored by a previous pattern, a trailing ``/`` only
+    matches directories, and a pattern containing a ``/`` elsewhere is
+    matched against the whole relative path instead of only the name.
+    Empty lines and lines starting with ``#`` are ignored.
+    """
+
+    def __init__(self, patterns: Sequence[str]) -> None:
+        self.patterns = [str(x) for x in patterns]
+        self._rules: list[tuple[re.Pattern[str], bool, bool, bool]] = []
+        for line in self.patterns:
+            pattern = line.strip()
+            if not pattern or pattern.startswith("#"):
+                continue
+            negate = pattern.startswith("!")
+            if negate:
+                pattern = pattern[1:]
+            dironly = pattern.endswith("/")
+            pattern = pattern.rstrip("/")
+            anchored = "/" in pattern
+            regex = re.compile(fnmatch.translate(pattern.lstrip("/")))
+            self._rules.append((regex, negate, dironly, anchored))
+
+    def match(self, relpath: str, isdir: bool) -> bool:
+        """Return True if the path (using ``/`` separators) is ignored."""
+        name = relpath.rsplit("/", 1)[-1]
+        ignored = False
+        for regex, negate, dironly, anchored in self._rules:
+            if dironly and not isdir:
+                continue
+            if regex.match(relpath if anchored else name):
+                ignored = not negate
+        return ignored
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from collections.abc import Sequence
+from typing import Any
+
+import pytest
+
+
+# shared by the terminal stats of all passed phases, see slim_stats()
+PASSED_REPORT = pytest.TestReport(
+    nodeid="",
+    location=("", None, ""),
+    keywords={},
+    outcome="passed",
+    longrepr=None,
+    when="call",
+)
+
+
+def slim_stats(stats: dict[str, list[Any]], report: pytest.TestReport) -> None:
+    """Replace the report of a passed phase in the terminal stats.
+
+    The terminal reporter keeps every report in its stats, which are only
+    used to count the passed ones, so they are replaced by a shared
+    placeholder and the reports themselves are freed.  Only the plain passed
+    categories are slimmed: the reports of xpassed tests, for instance, are
+    shown by ``-rX`` and kept.
+    """
+    for category in ("passed", ""):
+        reports = stats.get(category)
+        if reports and reports[-1] is report:
+            reports[-1] = PASSED_REPORT
+            return
+
+
+class PassedTests:
+    """Tests which passed, with a byte per test of the collection.
+
+    With ``--xdist-low-memory``, the controller keeps the reports of failed
+    and skipped tests, and only records which tests passed, by their index
+    in the collection of the workers.
+    """
+
+    def __init__(self) -> None:
+        self.collection: Sequence[str] = ()
+        self._passed = bytearray()
+        self._count = 0
+
+    def set_collection(self, collection: Sequence[str]) -> None:
+        self.collection = collection
+        self._passed = bytearray(len(collection))
+        self._count = 0
+
+    def add(self, index: int) -> None:
+        """Record that the test at the index of the collection passed."""
+        if not self._passed[index]:
+            self._passed[index] = 1
+            self._count += 1
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        """Return the ids of the tests which passed, in collection order."""
+        start = 0
+        while (index := self._passed.find(1, start)) != -1:
+            yield self.collection[index]
+            start = index + 1
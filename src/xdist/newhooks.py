@@ -99,6 +99,22 @@ def pytest_xdist_make_scheduler(
     """Return a node scheduler implementation."""
 
 
+@pytest.hookspec(firstresult=True)
+def pytest_xdist_scope_cost(
+    config: pytest.Config, scope: str, nodeids: Sequence[str]
+) -> float | None:
+    """
+    Return the expected cost (usually in seconds) of running the tests of a
+    scope, for ``--dist loadscope``, ``loadfile`` and ``loadgroup``.
+
+    Scopes expected to cost most are scheduled first.  With
+    ``--duration-cache`` the durations of previous runs are used by default;
+    otherwise the number of tests is used as the cost.
+
+    .. versionadded:: 3.9
+    """
+
+
 @pytest.hookspec(firstresult=True)
 def pytest_xdist_auto_num_workers(config: pytest.Config) -> int:
     """
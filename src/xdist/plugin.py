@@ -166,6 +166,36 @@ def parse_ramp_duration(s: str) -> float:
     return seconds * multipliers[unit]
 
 
+def parse_prefetch(s: str) -> tuple[int, float]:
+    """Parse a prefetch depth: a number of work units, or a duration with
+    an s, m or h suffix.
+
+    :returns: the number of units and the number of seconds, one of them 0.
+    """
+    value = s.strip()
+    if value.isdigit():
+        return int(value), 0.0
+    try:
+        if not value[-1:].isalpha():
+            raise ValueError(value)
+        return 0, parse_ramp_duration(value)
+    except (ValueError, pytest.UsageError) as e:
+        raise pytest.UsageError(
+            "--loadscope-prefetch must be a number of work units or a duration "
+            "with s, m, or h suffix"
+        ) from e
+
+
+def parse_shm_size(s: str) -> int:
+    try:
+        mib = int(s)
+    except ValueError:
+        mib = 0
+    if mib <= 0:
+        raise pytest.UsageError("--shm-reports must be a positive number of MiB")
+    return mib * 1024 * 1024
+
+
 @pytest.hookimpl
 def pytest_addoption(parser: pytest.Parser) -> None:
     # 'Help' formatting (same rules as pytest's):
@@ -203,6 +233,101 @@ def pytest_addoption(parser: pytest.Parser) -> None:
         help="Maximum number of workers that can be restarted "
         "when crashed (set to zero to disable this feature)",
     )
+    group.addoption(
+        "--xdist-crash-retries",
+        action="store",
+        type=int,
+        default=0,
+        dest="crashretries",
+        metavar="N",
+        help=(
+            "Run a test which crashed its worker again, alone on a new worker, "
+            "up to N times before reporting it as failed"
+        ),
+    )
+    group.addoption(
+        "--xdist-bisect-crashes",
+        action="store_true",
+        default=False,
+        dest="bisectcrashes",
+        help=(
+            "When a test crashes its worker, find out which of the tests run "
+            "before it on that worker must run for it to crash, by running "
+            "them again on new workers"
+        ),
+    )
+    group.addoption(
+        "--xdist-standby",
+        action="store",
+        type=int,
+        default=0,
+        dest="standby",
+        metavar="N",
+        help=(
+            "Keep N standby workers for each environment (--tx specification) "
+            "which collect the tests and then wait, to replace crashed workers "
+            "without delay"
+        ),
+    )
+    group.addoption(
+        "--xdist-resume",
+        action="store_true",
+        default=False,
+        dest="resume",
+        help=(
+            "Record the completed tests in a journal in the pytest cache, and "
+            "skip the tests completed by a previous run with this option "
+            "which was interrupted, reporting their previous results instead"
+        ),
+    )
+    group.addoption(
+        "--xdist-buffered-output",
+        action="store_true",
+        default=False,
+        dest="bufferedoutput",
+        help=(
+            "Buffer the terminal output of the controller, and write it from "
+            "a separate thread 10 times per second, so that a slow terminal "
+            "or log pipe does not slow down the distribution of tests"
+        ),
+    )
+    group.addoption(
+        "--xdist-low-memory",
+        action="store_true",
+        default=False,
+        dest="lowmemory",
+        help=(
+            "Keep the reports of failed and skipped tests only, and record "
+            "which tests passed with a byte per test, so that the memory "
+            "used by the controller does not grow with the number of passed "
+            "tests. Passed tests cannot be reported with -rp, -rP or -rA"
+        ),
+    )
+    group.addoption(
+        "--xdist-result-log",
+        action="store",
+        default=None,
+        dest="resultlog",
+        metavar="PATH",
+        help=(
+            "Write the test reports to PATH as they arrive from the workers, "
+            "as JUnit XML if PATH ends with .xml and as JSON lines otherwise"
+        ),
+    )
+    group.addoption(
+        "--xdist-live-status",
+        action="store",
+        type=float,
+        default=0.0,
+        dest="livestatus",
+        metavar="SECONDS",
+        help=(
+            "Every SECONDS seconds while the tests run, write a status line "
+            "with the tests per second of each worker, the idle workers, the "
+            "pending tests and the expected remaining duration (default: 0, "
+            "no status line)"
+        ),
+    )
     group.addoption(
         "--ramp",
         action="store",
@@ -221,6 +346,7 @@ def pytest_addoption(parser: pytest.Parser) -> None:
         action="store",
         choices=[
             "each",
+            "eachload",
             "load",
             "loadscope",
             "loadfile",
@@ -233,6 +359,9 @@ def pytest_addoption(parser: pytest.Parser) -> None:
         help=(
             "Set mode for distributing tests to exec environments.\n\n"
             "each: Send each test to all available environments.\n\n"
+            "eachload: Send each test to one of the workers of each"
+            " environment (workers with the same --tx specification),"
+            " load balancing between them.\n\n"
             "load: Load balance by sending any pending test to any"
             " available environment.\n\n"
             "loadscope: Load balance by sending pending groups of tests in"
@@ -252,6 +381,7 @@ def pytest_addoption(parser: pytest.Parser) -> None:
         default=True,
         help=(
             "Pytest-xdist will default reorder tests by number of tests per scope "
+            "(or by expected duration, see --duration-cache) "
             "when used in conjunction with loadscope.\n"
             "This option will enable loadscope reorder which will improve the "
             "parallelism of the test suite.\n"
@@ -271,6 +401,45 @@ def pytest_addoption(parser: pytest.Parser) -> None:
             "other plugins that specify tests in a specific order."
         ),
     )
+    group.addoption(
+        "--loadscope-split",
+        dest="loadscopesplit",
+        action="store_true",
+        default=False,
+        help=(
+            "With --dist=loadscope or loadfile, split the groups of tests "
+            "expected to take longer than the total divided by the number of "
+            "workers into several work units, which can run on different "
+            "workers.\n"
+            "Groups with tests marked with xdist_no_split are kept together."
+        ),
+    )
+    group.addoption(
+        "--loadscope-prefetch",
+        dest="loadscopeprefetch",
+        metavar="depth",
+        type=parse_prefetch,
+        default=None,
+        help=(
+            "With --dist=loadscope, loadfile or loadgroup, keep this many "
+            "groups of tests queued on each worker besides the running one, "
+            "or, with an s, m or h suffix, keep groups expected to take this "
+            "long queued (see --duration-cache).\n"
+            "By default a worker gets the next group when it has at most "
+            "two tests left."
+        ),
+    )
+    group.addoption(
+        "--each-aggregate",
+        action="store_true",
+        default=False,
+        dest="eachaggregate",
+        help=(
+            "With --dist=each, report each test once, with its most severe "
+            "outcome across the environments, and show the outcomes of each "
+            "environment at the end of the session"
+        ),
+    )
     group.addoption(
         "--tx",
         dest="tx",
@@ -325,6 +494,44 @@ def pytest_addoption(parser: pytest.Parser) -> None:
             "on every test run."
         ),
     )
+    group.addoption(
+        "--shm-reports",
+        dest="shmreports",
+        action="store",
+        type=parse_shm_size,
+        default=None,
+        metavar="MiB",
+        help=(
+            "Transfer test reports of local popen workers through a shared "
+            "memory ring buffer of the given size in MiB per worker, instead "
+            "of serializing them over the execnet channel.\n"
+            "Reports which do not fit fall back to the channel."
+        ),
+    )
+    group.addoption(
+        "--duration-cache",
+        dest="durationcache",
+        action="store_true",
+        default=False,
+        help=(
+            "Keep the test durations in the pytest cache, and use them with "
+            "--dist=loadscope, loadfile and loadgroup to start the groups of "
+            "tests expected to take longest first (see "
+            "--loadscope-reorder)."
+        ),
+    )
+    group.addoption(
+        "--lazy-collection",
+        dest="lazycollection",
+        action="store_true",
+        default=False,
+        help=(
+            "With --dist=loadscope or --dist=loadfile, let workers first only "
+            "list the test files, and then import and collect only the files "
+            "the controller assigns to them.\n"
+            "Each worker then only runs tests from its own files."
+        ),
+    )
     group.addoption(
         "--maxschedchunk",
         action="store",
@@ -356,6 +563,12 @@ def pytest_addoption(parser: pytest.Parser) -> None:
         type="paths",
         help="directories to check for changes. Default: current directory.",
     )
+    parser.addini(
+        "looponfailignore",
+        type="linelist",
+        help=".gitignore-style patterns of files and directories to not check "
+        "for changes, relative to the looponfailroots.",
+    )
 
 
 # -------------------------------------------------------------------------
@@ -382,6 +595,12 @@ def pytest_configure(config: pytest.Config) -> None:
         "in relation to one another. Provided by pytest-xdist."
     )
     config.addinivalue_line("markers", config_line)
+    config.addinivalue_line(
+        "markers",
+        "xdist_no_split: keep the tests of the group (module, class or file) of "
+        "this test in the same worker with --loadscope-split. "
+        "Provided by pytest-xdist.",
+    )
 
     # Skip this plugin entirely when only doing collection.
     if config.getvalue("collectonly"):
@@ -450,6 +669,51 @@ def pytest_cmdline_main(config: pytest.Config) -> None:
         raise pytest.UsageError(
             "--pdb is incompatible with distributing tests; try using -n0 or -nauto."
         )
+    if val("lazycollection") and _is_distribution_mode(config):
+        if val("dist") not in ("loadscope", "loadfile"):
+            raise pytest.UsageError(
+                "--lazy-collection requires --dist=loadscope or --dist=loadfile."
+            )
+        if any("::" in arg for arg in config.args):
+            # tests can only be selected by id after importing their files
+            config.option.lazycollection = False
+    if (
+        val("eachaggregate")
+        and _is_distribution_mode(config)
+        and val("dist") not in ("each", "eachload")
+    ):
+        raise pytest.UsageError(
+            "--each-aggregate requires --dist=each or --dist=eachload."
+        )
+    if val("livestatus") < 0:
+        raise pytest.UsageError(
+            "--xdist-live-status must be a non-negative number of seconds."
+        )
+    if val("standby") < 0:
+        raise pytest.UsageError("--xdist-standby must be a non-negative number.")
+    if val("crashretries") < 0:
+        raise pytest.UsageError("--xdist-crash-retries must be a non-negative number.")
+    if val("lowmemory") and val("lazycollection"):
+        raise pytest.UsageError(
+            "--xdist-low-memory cannot be used with --lazy-collection."
+        )
+    if val("lowmemory") and set(val("reportchars") or "") & set("pPA"):
+        # the reports of passed tests are not kept
+        raise pytest.UsageError(
+            "--xdist-low-memory cannot be used with -rp, -rP or -rA."
+        )
+    if val("standby") and val("lazycollection"):
+        raise pytest.UsageError(
+            "--xdist-standby cannot be used with --lazy-collection."
+        )
+    if (
+        val("standby")
+        and _is_distribution_mode(config)
+        and val("dist") in ("each", "eachload")
+    ):
+        raise pytest.UsageError(
+            "--xdist-standby cannot be used with --dist=each or --dist=eachload."
+        )
 
 
 # -------------------------------------------------------------------------
@@ -9,12 +9,16 @@ needs not to be installed in remote environments.
 from __future__ import annotations
 
 import collections
+from collections.abc import Callable
 from collections.abc import Generator
 from collections.abc import Iterable
 from collections.abc import Sequence
 import contextlib
 import enum
+import hashlib
 import os
+import pickle
+import struct
 import sys
 import time
 from typing import Any
@@ -59,6 +63,90 @@ class Producer:
         return type(self)(name, enabled=self.enabled)
 
 
+class ShmRing:
+    """Single-producer, single-consumer ring buffer in shared memory.
+
+    Used to transfer report payloads from local workers to the controller:
+    the worker pickles a payload into the ring and sends only its position
+    and length over the channel, which keeps the events in order.  The
+    controller reads the payload back and advances the read position stored
+    in the header, freeing the space for the worker.
+    """
+
+    HEADER = struct.Struct("<Q")  # read position
+
+    def __init__(self, shm: Any) -> None:
+        self.shm = shm
+        self.capacity = shm.size - self.HEADER.size
+        # only used by the producer, the consumer gets positions with each payload
+        self.writepos = 0
+
+    @classmethod
+    def create(cls, size: int) -> ShmRing:
+        from multiprocessing import shared_memory
+
+        # new segments are zero-filled, so the read position starts at 0
+        return cls(shared_memory.SharedMemory(create=True, size=cls.HEADER.size + size))
+
+    @classmethod
+    def attach(cls, name: str) -> ShmRing:
+        from multiprocessing import shared_memory
+
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name)
+            if os.name == "posix":
+                # The creator owns the segment: do not let the resource
+                # tracker of this process unlink it when it exits.
+                from multiprocessing import resource_tracker
+
+                resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+        return cls(shm)
+
+    @property
+    def name(self) -> str:
+        return str(self.shm.name)
+
+    def write(self, obj: object) -> tuple[int, int] | None:
+        """Store ``obj`` and return its position and length, or None if
+        the ring has not enough free space for it."""
+        payload = pickle.dumps(obj)
+        length = len(payload)
+        (readpos,) = self.HEADER.unpack_from(self.shm.buf, 0)
+        if length > self.capacity - (self.writepos - readpos):
+            return None
+        start = self.writepos
+        offset = start % self.capacity
+        first = min(length, self.capacity - offset)
+        base = self.HEADER.size
+        self.shm.buf[base + offset : base + offset + first] = payload[:first]
+        if first < length:
+            self.shm.buf[base : base + length - first] = payload[first:]
+        self.writepos += length
+        return start, length
+
+    def read(self, start: int, length: int) -> Any:
+        """Return the object stored by :meth:`write` at the given position,
+        freeing its space."""
+        offset = start % self.capacity
+        base = self.HEADER.size
+        if offset + length <= self.capacity:
+            obj = pickle.loads(self.shm.buf[base + offset : base + offset + length])
+        else:
+            first = self.capacity - offset
+            payload = bytes(self.shm.buf[base + offset : base + self.capacity])
+            payload += bytes(self.shm.buf[base : base + length - first])
+            obj = pickle.loads(payload)
+        self.HEADER.pack_into(self.shm.buf, 0, start + length)
+        return obj
+
+    def close(self, unlink: bool = False) -> None:
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
 def worker_title(title: str) -> None:
     try:
         setproctitle(title)
@@ -121,12 +209,32 @@ class WorkerInteractor:
         self.channel = channel
         self.torun = TestQueue(self.channel.gateway.execmodel)
         self.nextitem_index: int | None | Literal[Marker.SHUTDOWN] = None
+        shmname = workerinput.get("shmreports")
+        self.shmring = ShmRing.attach(shmname) if shmname else None
+        self.lazycollection = (
+            LazyCollection(self.assign_collect_files)
+            if workerinput.get("lazycollection")
+            else None
+        )
+        # --xdist-resume: tests completed by the interrupted run, and those
+        # of them which were collected, and deselected
+        self.completed = frozenset(workerinput.get("completed", ()))
+        self.resumed: list[str] = []
         config.pluginmanager.register(self)
 
     def sendevent(self, name: str, **kwargs: object) -> None:
         self.log("sending", name, kwargs)
         self.channel.send((name, kwargs))
 
+    def sendreport(self, name: str, data: dict[str, Any]) -> None:
+        """Send a serialized report, through shared memory if possible."""
+        if self.shmring is not None:
+            shm = self.shmring.write(data)
+            if shm is not None:
+                self.sendevent(name, shm=shm)
+                return
+        self.sendevent(name, data=data)
+
     @pytest.hookimpl
     def pytest_internalerror(self, excrepr: object) -> None:
         formatted_error = str(excrepr)
@@ -151,8 +259,35 @@ class WorkerInteractor:
         self.sendevent("workerfinished", workeroutput=workeroutput)
 
     @pytest.hookimpl
-    def pytest_collection(self) -> None:
+    def pytest_collection(self, session: pytest.Session) -> bool | None:
         self.sendevent("collectionstart")
+        lazy = self.lazycollection
+        if lazy is None:
+            return None
+        # List the test files without importing them, and only collect the
+        # files the controller assigns to this worker (--lazy-collection).
+        self.config.pluginmanager.register(lazy, "xdist_lazycollection")
+        try:
+            session.perform_collect()
+        finally:
+            self.config.pluginmanager.unregister(lazy)
+        return True
+
+    def assign_collect_files(self, files: list[str]) -> list[str]:
+        """Send the test files listed, and wait for the controller to assign
+        the files to collect."""
+        self.sendevent("collectionfiles", files=files)
+        while True:
+            try:
+                command = self.channel.receive()
+            except EOFError:
+                command = Marker.SHUTDOWN
+            if command is not Marker.SHUTDOWN and command[0] == "collectfiles":
+                assigned: list[str] = command[1]["files"]
+                return assigned
+            self.handle_command(command)
+            if command is Marker.SHUTDOWN or command[0] == "shutdown":
+                return []
 
     def handle_command(
         self, command: tuple[str, dict[str, Any]] | Literal[Marker.SHUTDOWN]
@@ -174,6 +309,13 @@ class WorkerInteractor:
             self.torun.put(Marker.SHUTDOWN)
         elif name == "steal":
             self.steal(kwargs["indices"])
+        elif name == "sendcollection":
+            self.sendevent(
+                "collectionfinish",
+                topdir=str(self.config.rootpath),
+                ids=self.collection_ids,
+                digest=collection_digest(self.collection_ids),
+            )
 
     def steal(self, indices: Sequence[int]) -> None:
         """
@@ -262,14 +404,44 @@ class WorkerInteractor:
                 if not gnames:
                     continue
                 item._nodeid = f"{item.nodeid}@{'_'.join(sorted(gnames))}"
+        if self.completed:
+            deselected = [item for item in items if item.nodeid in self.completed]
+            self.resumed = [item.nodeid for item in deselected]
+            if deselected:
+                items[:] = [item for item in items if item.nodeid not in self.completed]
+                config.hook.pytest_deselected(items=deselected)
 
     @pytest.hookimpl
     def pytest_collection_finish(self, session: pytest.Session) -> None:
-        self.sendevent(
-            "collectionfinish",
-            topdir=str(self.config.rootpath),
-            ids=[item.nodeid for item in session.items],
-        )
+        ids = [item.nodeid for item in session.items]
+        kwargs: dict[str, Any] = {}
+        if self.config.getvalue("loadscopesplit"):
+            # indices of the tests whose scope must not be split
+            kwargs["nosplit"] = [
+                index
+                for index, item in enumerate(session.items)
+                if item.get_closest_marker("xdist_no_split")
+            ]
+        if self.resumed:
+            kwargs["resumed"] = self.resumed
+        workerinput: dict[str, Any] = self.config.workerinput  # type: ignore[attr-defined]
+        if workerinput.get("collectiondigest"):
+            # Only send the digest, the controller asks for the ids with the
+            # "sendcollection" command if no other worker sent them already.
+            self.collection_ids = ids
+            self.sendevent(
+                "collectionfinish",
+                topdir=str(self.config.rootpath),
+                digest=collection_digest(ids),
+                **kwargs,
+            )
+        else:
+            self.sendevent(
+                "collectionfinish",
+                topdir=str(self.config.rootpath),
+                ids=ids,
+                **kwargs,
+            )
 
     @pytest.hookimpl
     def pytest_runtest_logstart(
@@ -296,7 +468,7 @@ class WorkerInteractor:
         data["worker_id"] = self.workerid
         data["testrun_uid"] = self.testrunuid
         assert self.session.items[self.item_index].nodeid == report.nodeid
-        self.sendevent("testreport", data=data)
+        self.sendreport("testreport", data)
 
     @pytest.hookimpl
     def pytest_collectreport(self, report: pytest.CollectReport) -> None:
@@ -305,7 +477,7 @@ class WorkerInteractor:
             data = self.config.hook.pytest_report_to_serializable(
                 config=self.config, report=report
             )
-            self.sendevent("collectreport", data=data)
+            self.sendreport("collectreport", data)
 
     @pytest.hookimpl
     def pytest_warning_recorded(
@@ -324,6 +496,47 @@ class WorkerInteractor:
         )
 
 
+class LazyCollection:
+    """Restrict the collection of a worker to some test files.
+
+    The collectors of the test files are set aside in ``files`` instead of
+    being collected, so the collection lists the test files without
+    importing them.  Before the collected items are modified, the files are
+    sent to the controller with ``assign``, and only the files it assigns to
+    the worker are collected, so the collection runs, and its hooks are
+    called, once.
+    """
+
+    def __init__(self, assign: Callable[[list[str]], list[str]]) -> None:
+        self.assign = assign
+        self.files: dict[str, pytest.File] = {}
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_collect_file(self) -> Generator[None, Any, None]:
+        outcome = yield
+        kept = []
+        for collector in outcome.get_result():
+            # packages are directories, not files (they are created by
+            # pytest_collect_file in pytest<8)
+            if not isinstance(collector, pytest.File) or isinstance(
+                collector, pytest.Package
+            ):
+                kept.append(collector)
+            else:
+                self.files.setdefault(collector.nodeid, collector)
+        outcome.force_result(kept)
+
+    @pytest.hookimpl(hookwrapper=True, tryfirst=True)
+    def pytest_collection_modifyitems(
+        self, session: pytest.Session, items: list[pytest.Item]
+    ) -> Generator[None, None, None]:
+        assigned = set(self.assign(list(self.files)))
+        for nodeid, collector in self.files.items():
+            if nodeid in assigned:
+                items.extend(session.genitems(collector))
+        yield
+
+
 def serialize_warning_message(
     warning_message: warnings.WarningMessage,
 ) -> dict[str, Any]:
@@ -375,6 +588,11 @@ def serialize_warning_message(
     return result
 
 
+def collection_digest(ids: Sequence[str]) -> str:
+    """Return a digest identifying the given collected test ids."""
+    return hashlib.sha256("\n".join(ids).encode("utf-8", "surrogatepass")).hexdigest()
+
+
 class WorkerInfo(TypedDict):
     version: str
     version_info: tuple[int, int, int, str, int]
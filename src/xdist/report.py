@@ -4,6 +4,13 @@ from collections.abc import Sequence
 from difflib import unified_diff
 
 
+# Collections larger than this (in total) are not compared with difflib,
+# which can take minutes on huge collections, but with a set-based diff
+# limited to the first MAX_DIFF_LINES differences.
+MAX_DIFFLIB_LINES = 1000
+MAX_DIFF_LINES = 50
+
+
 def report_collection_diff(
     from_collection: Sequence[str],
     to_collection: Sequence[str],
@@ -15,16 +22,55 @@ def report_collection_diff(
     :returns: detailed message describing the difference between the given
     collections, or None if they are equal.
     """
-    if from_collection == to_collection:
+    # Nodes whose collection digests match share the same id strings, so
+    # comparing equal collections only compares references.
+    if from_collection is to_collection or from_collection == to_collection:
         return None
 
-    diff = unified_diff(from_collection, to_collection, fromfile=from_id, tofile=to_id)
+    if len(from_collection) + len(to_collection) <= MAX_DIFFLIB_LINES:
+        diff = "\n".join(
+            unified_diff(from_collection, to_collection, fromfile=from_id, tofile=to_id)
+        )
+    else:
+        diff = _bounded_collection_diff(from_collection, to_collection, from_id, to_id)
     error_message = (
-        "Different tests were collected between {from_id} and {to_id}. "
+        f"Different tests were collected between {from_id} and {to_id}. "
         "The difference is:\n"
-        "{diff}\n"
+        f"{diff}\n"
         "To see why this happens see 'Known limitations' in documentation "
         "for pytest-xdist"
-    ).format(from_id=from_id, to_id=to_id, diff="\n".join(diff))
+    )
     msg = "\n".join(x.rstrip() for x in error_message.split("\n"))
     return msg
+
+
+def _bounded_collection_diff(
+    from_collection: Sequence[str],
+    to_collection: Sequence[str],
+    from_id: str,
+    to_id: str,
+) -> str:
+    """Return the tests only collected by one of the nodes, or the first
+    position where the order differs if both collected the same tests."""
+    lines = [f"--- {from_id}", f"+++ {to_id}"]
+    from_set = set(from_collection)
+    to_set = set(to_collection)
+    differences = [f"-{x}" for x in from_collection if x not in to_set]
+    differences += [f"+{x}" for x in to_collection if x not in from_set]
+    if differences:
+        lines += differences[:MAX_DIFF_LINES]
+        if len(differences) > MAX_DIFF_LINES:
+            lines.append(f"... and {len(differences) - MAX_DIFF_LINES} more")
+        return "\n".join(lines)
+
+    # same tests, in a different order or with duplicates
+    index = next(
+        (i for i, (a, b) in enumerate(zip(from_collection, to_collection)) if a != b),
+        min(len(from_collection), len(to_collection)),
+    )
+    lines.append(f"@@ first difference at position {index + 1} @@")
+    if index < len(from_collection):
+        lines.append(f"-{from_collection[index]}")
+    if index < len(to_collection):
+        lines.append(f"+{to_collection[index]}")
+    return "\n".join(lines)
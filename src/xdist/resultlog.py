@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from abc import ABC
+from abc import abstractmethod
+import json
+import os
+from pathlib import Path
+import re
+import socket
+from typing import TextIO
+from xml.sax.saxutils import escape
+from xml.sax.saxutils import quoteattr
+
+import pytest
+
+
+# characters which cannot be part of an XML 1.0 document
+_ILLEGAL_XML_CHARS = re.compile(
+    "[^\u0009\u000a\u000d\u0020-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]"
+)
+
+
+def _xml_text(s: str) -> str:
+    """Return s escaped for XML, with illegal characters as #xNN."""
+    return escape(_ILLEGAL_XML_CHARS.sub(lambda m: f"#x{ord(m.group()):02X}", s))
+
+
+def _xml_attr(s: str) -> str:
+    return quoteattr(_ILLEGAL_XML_CHARS.sub(lambda m: f"#x{ord(m.group()):02X}", s))
+
+
+def make_result_log(config: pytest.Config, path: str) -> ResultLog:
+    """Return the result log writing to path, JUnit XML for a .xml file."""
+    full_path = Path(config.invocation_params.dir, os.path.expanduser(path))
+    full_path.parent.mkdir(parents=True, exist_ok=True)
+    if full_path.suffix == ".xml":
+        return JUnitResultLog(config, full_path)
+    return JsonLinesResultLog(config, full_path)
+
+
+class ResultLog(ABC):
+    """Results of the tests written to a file as they arrive from the workers.
+
+    Reports are written as soon as the controller receives them and are not
+    kept afterwards, so the memory used does not grow with the number of
+    tests, unlike with plugins which write their file at the end of the run.
+    """
+
+    def __init__(self, config: pytest.Config, path: Path) -> None:
+        self.config = config
+        self.path = path
+        self.file: TextIO = path.open("w", encoding="utf-8")
+
+    @abstractmethod
+    def add_report(
+        self, rep: pytest.TestReport | pytest.CollectReport, worker: str | None
+    ) -> None:
+        """Add the report of a test phase, or of a failed collection."""
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class JsonLinesResultLog(ResultLog):
+    """Each report serialized as a JSON line, in the format of
+    ``pytest_report_to_serializable``, with the id of the worker which sent
+    it as ``worker_id``."""
+
+    def add_report(
+        self, rep: pytest.TestReport | pytest.CollectReport, worker: str | None
+    ) -> None:
+        data = self.config.hook.pytest_report_to_serializable(
+            config=self.config, report=rep
+        )
+        data["worker_id"] = worker
+        self.file.write(json.dumps(data, default=str) + "\n")
+
+
+class JUnitResultLog(ResultLog):
+    """A JUnit XML test suite, with a test case written when a test completes.
+
+    Only the reports of the tests being run are kept, to merge their phases
+    into a test case.  As the totals are not known before the end, the
+    ``testsuite`` element has no ``tests``, ``failures``... attributes.
+    """
+
+    def __init__(self, config: pytest.Config, path: Path) -> None:
+        super().__init__(config, path)
+        # reports of the tests being run, by worker and node id
+        self._running: dict[tuple[str | None, str], list[pytest.TestReport]] = {}
+        suite_name = config.getini("junit_suite_name") or "pytest"
+        self.file.write(
+            '<?xml version="1.0" encoding="utf-8"?>\n<testsuites>\n'
+            f"<testsuite name={_xml_attr(suite_name)} "
+            f"hostname={_xml_attr(socket.gethostname())}>\n"
+        )
+
+    def add_report(
+        self, rep: pytest.TestReport | pytest.CollectReport, worker: str | None
+    ) -> None:
+        if isinstance(rep, pytest.CollectReport):
+            self._write_testcase(rep.nodeid, 0.0, [rep])
+            return
+        key = (worker, rep.nodeid)
+        reports = self._running.setdefault(key, [])
+        reports.append(rep)
+        # "???" is the report of a test which crashed its worker
+        if rep.when in ("teardown", "???"):
+            del self._running[key]
+            duration = sum(report.duration for report in reports)
+            self._write_testcase(rep.nodeid, duration, reports)
+
+    def _write_testcase(
+        self,
+        nodeid: str,
+        duration: float,
+        reports: list[pytest.TestReport] | list[pytest.CollectReport],
+    ) -> None:
+        names = nodeid.split("::")
+        names[0] = re.sub(r"\.py$", "", names[0].replace("/", "."))
+        classname = ".".join(names[:-1])
+        lines = [
+            f"<testcase classname={_xml_attr(classname)} "
+            f"name={_xml_attr(names[-1])} time={_xml_attr(f'{duration:.3f}')}>"
+        ]
+        for rep in reports:
+            if rep.failed:
+                when = getattr(rep, "when", "collect")
+                tag = "failure" if when == "call" else "error"
+                message = f"failed on {when}" if tag == "error" else "failed"
+                text = str(rep.longrepr)
+            elif rep.skipped:
+                tag = "skipped"
+                if hasattr(rep, "wasxfail"):
+                    message = f"xfail: {rep.wasxfail}"
+                    text = ""
+                else:
+                    # (path, lineno, reason) for skip() and skip marks
+                    longrepr = rep.longrepr
+                    message = str(
+                        longrepr[2] if isinstance(longrepr, tuple) else longrepr
+                    ).removeprefix("Skipped: ")
+                    text = message
+            else:
+                continue
+            lines.append(
+                f"<{tag} message={_xml_attr(message)}>{_xml_text(text)}</{tag}>"
+            )
+        lines.append("</testcase>\n")
+        self.file.write("\n".join(lines))
+
+    def close(self) -> None:
+        """Write the tests which did not complete, and the end of the suite."""
+        for (_, nodeid), reports in self._running.items():
+            duration = sum(report.duration for report in reports)
+            self._write_testcase(nodeid, duration, reports)
+        self._running.clear()
+        self.file.write("</testsuite>\n</testsuites>\n")
+        super().close()
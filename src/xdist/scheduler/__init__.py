@@ -1,4 +1,5 @@
 from xdist.scheduler.each import EachScheduling as EachScheduling
+from xdist.scheduler.eachload import EachLoadScheduling as EachLoadScheduling
 from xdist.scheduler.load import LoadScheduling as LoadScheduling
 from xdist.scheduler.loadfile import LoadFileScheduling as LoadFileScheduling
 from xdist.scheduler.loadgroup import LoadGroupScheduling as LoadGroupScheduling
@@ -66,6 +66,13 @@ class EachScheduling:
                 return True
         return False
 
+    @property
+    def pending_count(self) -> int:
+        """The number of tests not completed yet, by all nodes."""
+        return sum(len(pending) for pending in self.node2pending.values()) + sum(
+            len(pending) for pending in self._removed2pending.values()
+        )
+
     def add_node(self, node: WorkerController) -> None:
         assert node not in self.node2pending
         self.node2pending[node] = []
@@ -111,6 +118,13 @@ class EachScheduling:
     ) -> None:
         self.node2pending[node].remove(item_index)
 
+    def mark_tests_complete(
+        self, node: WorkerController, item_indices: Sequence[int], duration: float = 0
+    ) -> None:
+        pending = self.node2pending[node]
+        for item_index in item_indices:
+            pending.remove(item_index)
+
     def mark_test_pending(self, item: str) -> None:
         raise NotImplementedError()
 
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Sequence
+from typing import NoReturn
+
+import execnet
+import pytest
+
+from xdist.remote import Producer
+from xdist.scheduler.load import LoadScheduling
+from xdist.workermanage import parse_tx_spec_config
+from xdist.workermanage import WorkerController
+
+
+def spec_environment(spec: execnet.XSpec) -> str:
+    """Return the environment of a spec: the spec without the worker id.
+
+    The execution model and directory, which ``NodeManager`` sets on the specs
+    of the workers it creates, are left out too.
+    """
+    parts = []
+    for key, value in sorted(vars(spec).items()):
+        if key in ("_spec", "id", "execmodel", "chdir"):
+            continue
+        if key == "env":
+            parts += [f"env:{name}={val}" for name, val in sorted(value.items())]
+        elif value is True:
+            parts.append(key)
+        else:
+            parts.append(f"{key}={value}")
+    return "//".join(parts)
+
+
+class EachLoadScheduling:
+    """Run each test once in each environment, load balanced within it.
+
+    The nodes are grouped by environment: nodes whose ``--tx`` specifications
+    are the same, e.g. the four nodes of ``--tx 4*popen//python=python3.12``.
+    The tests are load balanced between the nodes of each group by a
+    separate ``LoadScheduling``, so the whole test suite runs once per
+    environment.
+
+    Attributes::
+
+    :groups: Map of environments and the scheduler of their nodes.
+
+    :log: A py.log.Producer instance.
+
+    :config: Config object, used for handling hooks.
+    """
+
+    def __init__(self, config: pytest.Config, log: Producer | None = None) -> None:
+        self.config = config
+        if log is None:
+            self.log = Producer("eachloadsched")
+        else:
+            self.log = log.eachloadsched
+        numnodes = Counter(
+            spec_environment(execnet.XSpec(spec))
+            for spec in parse_tx_spec_config(config)
+        )
+        self.groups: dict[str, LoadScheduling] = {}
+        for env, count in numnodes.items():
+            sched = self.groups[env] = LoadScheduling(config, self.log)
+            sched.numnodes = count
+
+    def _group_of(self, node: WorkerController) -> LoadScheduling:
+        return self.groups[spec_environment(node.gateway.spec)]
+
+    @property
+    def nodes(self) -> list[WorkerController]:
+        """A list of all nodes in the scheduler."""
+        return [node for sched in self.groups.values() for node in sched.nodes]
+
+    @property
+    def collection_is_completed(self) -> bool:
+        """All environments completed their initial collection."""
+        return all(sched.collection_is_completed for sched in self.groups.values())
+
+    @property
+    def tests_finished(self) -> bool:
+        """All environments executed all tests."""
+        return all(sched.tests_finished for sched in self.groups.values())
+
+    @property
+    def has_pending(self) -> bool:
+        """Any environment has pending test items."""
+        return any(sched.has_pending for sched in self.groups.values())
+
+    @property
+    def pending_count(self) -> int:
+        """The number of tests not completed yet, in all environments."""
+        return sum(sched.pending_count for sched in self.groups.values())
+
+    def add_node(self, node: WorkerController) -> None:
+        self._group_of(node).add_node(node)
+
+    def add_node_collection(
+        self, node: WorkerController, collection: Sequence[str]
+    ) -> None:
+        """Add the collected test items from a node.
+
+        Collections are only compared with the ones of the nodes of the same
+        environment.
+        """
+        self._group_of(node).add_node_collection(node, collection)
+
+    def mark_test_complete(
+        self, node: WorkerController, item_index: int, duration: float = 0
+    ) -> None:
+        self._group_of(node).mark_test_complete(node, item_index, duration)
+
+    def mark_tests_complete(
+        self, node: WorkerController, item_indices: Sequence[int], duration: float = 0
+    ) -> None:
+        self._group_of(node).mark_tests_complete(node, item_indices, duration)
+
+    def mark_test_pending(self, item: str) -> NoReturn:
+        raise NotImplementedError()
+
+    def remove_pending_tests_from_node(
+        self,
+        node: WorkerController,
+        indices: Sequence[int],
+    ) -> NoReturn:
+        raise NotImplementedError()
+
+    def remove_node(self, node: WorkerController) -> str | None:
+        """Remove a node, its pending tests are run by the nodes of its group."""
+        return self._group_of(node).remove_node(node)
+
+    def schedule(self) -> None:
+        """Initiate the distribution of the tests in each environment."""
+        assert self.collection_is_completed
+        for env, sched in self.groups.items():
+            self.log(f"scheduling {env} on {len(sched.nodes)} nodes")
+            sched.schedule()
@@ -112,6 +112,13 @@ class LoadScheduling:
                 return True
         return False
 
+    @property
+    def pending_count(self) -> int:
+        """The number of tests not completed yet, sent to a node or not."""
+        return len(self.pending) + sum(
+            len(pending) for pending in self.node2pending.values()
+        )
+
     def add_node(self, node: WorkerController) -> None:
         """Add a new node to the scheduler.
 
@@ -160,6 +167,23 @@ class LoadScheduling:
         self.node2pending[node].remove(item_index)
         self.check_schedule(node, duration=duration)
 
+    def mark_tests_complete(
+        self, node: WorkerController, item_indices: Sequence[int], duration: float = 0
+    ) -> None:
+        """Mark several test items as completed by node at once.
+
+        Like :meth:`mark_test_complete`, but the node's schedule is only
+        checked once, so at most one new chunk of tests is sent to it.
+        ``duration`` is the one of the last completed item.
+
+        This is called by ``DSession.loop_once`` when several completions
+        from the same node are processed together.
+        """
+        pending = self.node2pending[node]
+        for item_index in item_indices:
+            pending.remove(item_index)
+        self.check_schedule(node, duration=duration)
+
     def mark_test_pending(self, item: str) -> None:
         assert self.collection is not None
         self.pending.insert(
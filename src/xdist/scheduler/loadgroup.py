@@ -57,3 +57,13 @@ class LoadGroupScheduling(LoadScopeScheduling):
             return nodeid.split("@")[-1]
         else:
             return nodeid
+
+    def _split_large_scopes(
+        self, workqueue: dict[str, dict[str, bool]], costs: dict[str, float]
+    ) -> dict[str, dict[str, bool]]:
+        """Do not split scopes, even with ``--loadscope-split``.
+
+        The scopes are either single tests or ``xdist_group`` groups, whose
+        tests are guaranteed to run in the same process.
+        """
+        return workqueue
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from collections import deque
 from collections import OrderedDict
+from collections.abc import Iterable
 from collections.abc import Sequence
+import math
 from typing import NoReturn
 
 import pytest
@@ -22,7 +25,9 @@ class LoadScopeScheduling:
     and those work units get submitted to nodes.  Whenever a node finishes an
     item, it calls ``.mark_test_complete()`` which will trigger the scheduler
     to assign more work units if the number of pending tests for the node falls
-    below a low-watermark.
+    below a low-watermark.  Once all work units are assigned, a node running
+    out of work "steals" the work units queued but not started on the node
+    with most of them.
 
     When created, ``numnodes`` defines how many nodes are expected to submit a
     collection. This is used to know when all nodes have finished collection.
@@ -85,6 +90,33 @@ class LoadScopeScheduling:
                 (...)
             }
 
+    :lazy_collection: True with ``--lazy-collection``. Nodes then first
+       only list their test files, and ``.assign_files()`` splits them into
+       one group of files per node.  Each node collects only its own files
+       and is only given work units from its own collection.  Instead of
+       requiring identical collections, it is verified that no scope was
+       collected differently by two nodes.
+
+    :split_scopes: True with ``--loadscope-split``. Scopes expected to take
+       longer than an even share of all nodes are then split into several
+       work units, except scopes with tests marked ``xdist_no_split``.
+
+    :file_groups: The groups of files assigned to the nodes with
+       ``lazy_collection``, None until the first node listed its files.
+
+    :steal_requested_from_node: The node to which the current "steal" request
+       was sent, None if there is no such request.  Only one request is
+       active at a time.
+
+    :steal_refused_by: The node which refused the last "steal" request, as
+       it started the requested tests already, until it completes a test.
+       No request is sent to it meanwhile, so that the same request is not
+       sent again and again while its running test lasts.
+
+    :stolen_units: The work units which were moved from one node to another
+       already.  They are not stolen again, so that two nodes running out of
+       work cannot keep stealing the same work units back and forth.
+
     :log: A py.log.Producer instance.
 
     :config: Config object, used for handling hooks.
@@ -98,6 +130,31 @@ class LoadScopeScheduling:
         self.assigned_work: dict[WorkerController, dict[str, dict[str, bool]]] = {}
         self.registered_collections: dict[WorkerController, list[str]] = {}
 
+        self.lazy_collection = bool(config.getvalue("lazycollection"))
+        self.files: list[str] = []
+        self.file_groups: list[list[str]] | None = None
+        # group index of each node (also of crashed nodes), and groups whose
+        # node crashed
+        self.node_groups: dict[WorkerController, int] = {}
+        self.free_groups: list[int] = []
+        # --loadscope-split: tests of scopes which must not be split, and
+        # the work unit of the tests of split scopes
+        self.split_scopes = bool(config.getvalue("loadscopesplit"))
+        self.unsplittable: set[str] = set()
+        self.split_units: dict[str, str] = {}
+        # node ids -> index for each node's collection, and the scopes of
+        # the workqueue in it (lazy_collection)
+        self.collected_indices: dict[WorkerController, dict[str, int]] = {}
+        self.collected_scopes: dict[WorkerController, deque[str]] = {}
+        # --loadscope-prefetch: work units or expected seconds queued on each
+        # node besides the running unit, and the expected cost of each unit
+        prefetch: tuple[int, float] = config.getvalue("loadscopeprefetch") or (0, 0.0)
+        self.prefetch_units, self.prefetch_seconds = prefetch
+        self.unit_costs: dict[str, float] = {}
+        self.steal_requested_from_node: WorkerController | None = None
+        self.steal_refused_by: WorkerController | None = None
+        self.stolen_units: set[str] = set()
+
         if log is None:
             self.log = Producer("loadscopesched")
         else:
@@ -129,6 +186,9 @@ class LoadScopeScheduling:
         if self.workqueue:
             return False
 
+        if self.steal_requested_from_node is not None:
+            return False
+
         for assigned_unit in self.assigned_work.values():
             if self._pending_of(assigned_unit) >= 2:
                 return False
@@ -152,6 +212,14 @@ class LoadScopeScheduling:
 
         return False
 
+    @property
+    def pending_count(self) -> int:
+        """The number of tests not completed yet, assigned to a node or not."""
+        return self._pending_of(self.workqueue) + sum(
+            self._pending_of(assigned_unit)
+            for assigned_unit in self.assigned_work.values()
+        )
+
     def add_node(self, node: WorkerController) -> None:
         """Add a new node to the scheduler.
 
@@ -179,12 +247,23 @@ class LoadScopeScheduling:
         node has no more pending items.
         """
         workload = self.assigned_work.pop(node)
-        if not self._pending_of(workload):
+        pending = self._pending_of(workload)
+        # A dead node won't respond to a "steal" request
+        if self.steal_requested_from_node is node:
+            self.steal_requested_from_node = None
+        if self.steal_refused_by is node:
+            self.steal_refused_by = None
+        if node in self.node_groups and (
+            pending or node not in self.registered_collections
+        ):
+            # A replacement node collects the files of the crashed one
+            self.free_groups.append(self.node_groups[node])
+        if not pending:
             return None
 
         # The node crashed, identify test that crashed
-        for work_unit in workload.values():
-            for nodeid, completed in work_unit.items():
+        for crashed_unit in workload.values():
+            for nodeid, completed in crashed_unit.items():
                 if not completed:
                     crashitem = nodeid
                     break
@@ -196,8 +275,12 @@ class LoadScopeScheduling:
                 "Unable to identify crashitem on a workload with pending items"
             )
 
-        # Made uncompleted work unit available again
-        self.workqueue.update(workload)
+        # The crashed test is reported as failed and not run again, make
+        # uncompleted work units available again
+        crashed_unit[crashitem] = True
+        for scope, work_unit in workload.items():
+            if not all(work_unit.values()):
+                self.workqueue[scope] = work_unit
 
         for node in self.assigned_work:
             self._reschedule(node)
@@ -218,6 +301,10 @@ class LoadScopeScheduling:
         # Check that add_node() was called on the node before
         assert node in self.assigned_work
 
+        if self.lazy_collection:
+            self._add_lazy_node_collection(node, collection)
+            return
+
         # A new node has been added later, perhaps an original one died.
         if self.collection_is_completed:
             # Assert that .schedule() should have been called by now
@@ -235,6 +322,106 @@ class LoadScopeScheduling:
 
         self.registered_collections[node] = list(collection)
 
+    def _add_lazy_node_collection(
+        self, node: WorkerController, collection: Sequence[str]
+    ) -> None:
+        """Add the collection of a node which only collected its own files.
+
+        A node replacing a crashed one must have collected the same tests.
+        """
+        group = self.node_groups.get(node)
+        for other, other_group in self.node_groups.items():
+            if (
+                other is not node
+                and other_group == group
+                and other in self.registered_collections
+            ):
+                msg = report_collection_diff(
+                    self.registered_collections[other],
+                    collection,
+                    other.gateway.id,
+                    node.gateway.id,
+                )
+                if msg:
+                    self.log(msg)
+                    return
+        self.registered_collections[node] = list(collection)
+        self.collected_indices[node] = {
+            nodeid: index for index, nodeid in enumerate(collection)
+        }
+        if self.collection is not None:
+            self._queue_collected_scopes(node)
+
+    def add_unsplittable(self, nodeids: Iterable[str]) -> None:
+        """Add tests whose scope must not be split (``xdist_no_split``).
+
+        Called by ``DSession`` before adding the collection of a node.
+        """
+        self.unsplittable.update(nodeids)
+
+    def assign_files(self, node: WorkerController, files: Sequence[str]) -> list[str]:
+        """Return the files a node should collect out of the files it listed.
+
+        The files listed by the first node are split into ``.numnodes``
+        groups, each node collecting the files of one group.  A node
+        replacing a crashed node collects the files of the crashed node.
+
+        Called by the hook:
+
+        - ``DSession.worker_collectionfiles``.
+        """
+        if self.file_groups is None:
+            self.files = list(files)
+            self.file_groups = self._split_files(self.files)
+        elif list(files) != self.files:
+            first_node = next(iter(self.node_groups))
+            msg = report_collection_diff(
+                self.files, files, first_node.gateway.id, node.gateway.id
+            )
+            assert msg is not None
+            self.log(msg)
+            rep = pytest.CollectReport(
+                nodeid=node.gateway.id,
+                outcome="failed",
+                longrepr=msg,
+                result=[],
+            )
+            self.config.hook.pytest_collectreport(report=rep)
+            return []
+
+        if self.free_groups:
+            group = self.free_groups.pop(0)
+        else:
+            group = len(set(self.node_groups.values()))
+            if group >= len(self.file_groups):
+                return []
+        self.node_groups[node] = group
+        return self.file_groups[group]
+
+    def _split_files(self, files: Sequence[str]) -> list[list[str]]:
+        """Split files into ``.numnodes`` groups of about the same size.
+
+        The size of the files stands in for the cost of their tests, which
+        is unknown as long as they are not collected.  Each group keeps the
+        files in their original order.
+        """
+        sizes = {}
+        for file in files:
+            try:
+                sizes[file] = (self.config.rootpath / file).stat().st_size
+            except OSError:
+                sizes[file] = 0
+        loads = [0] * self.numnodes
+        file_group: dict[str, int] = {}
+        for file in sorted(files, key=lambda f: -sizes[f]):
+            group = loads.index(min(loads))
+            file_group[file] = group
+            loads[group] += sizes[file] + 1
+        groups: list[list[str]] = [[] for _ in range(self.numnodes)]
+        for file in files:
+            groups[file_group[file]].append(file)
+        return groups
+
     def mark_test_complete(
         self, node: WorkerController, item_index: int, duration: float = 0
     ) -> None:
@@ -245,10 +432,26 @@ class LoadScopeScheduling:
         - ``DSession.worker_testreport``.
         """
         nodeid = self.registered_collections[node][item_index]
-        scope = self._split_scope(nodeid)
+        scope = self._unit_of(nodeid)
 
         self.assigned_work[node][scope][nodeid] = True
         self._reschedule(node)
+        self._retry_steal(node)
+
+    def mark_tests_complete(
+        self, node: WorkerController, item_indices: Sequence[int], duration: float = 0
+    ) -> None:
+        """Mark several test items as completed by node at once.
+
+        Called by ``DSession.loop_once`` when several completions from the
+        same node are processed together; the node is only rescheduled once.
+        """
+        collection = self.registered_collections[node]
+        for item_index in item_indices:
+            nodeid = collection[item_index]
+            self.assigned_work[node][self._unit_of(nodeid)][nodeid] = True
+        self._reschedule(node)
+        self._retry_steal(node)
 
     def mark_test_pending(self, item: str) -> NoReturn:
         raise NotImplementedError()
@@ -258,12 +461,117 @@ class LoadScopeScheduling:
         node: WorkerController,
         indices: Sequence[int],
     ) -> None:
-        raise NotImplementedError()
+        """Node returned the tests of work units in response to 'steal' command.
+
+        The work units are put back at the front of the workqueue, to be
+        assigned to the nodes running out of work.  ``indices`` is empty if
+        the node already started some of the requested tests.
+
+        Called by the hook:
+
+        - ``DSession.worker_unscheduled``.
+        """
+        assert node is self.steal_requested_from_node
+        self.steal_requested_from_node = None
+        if not indices:
+            self.steal_refused_by = node
+
+        workload = self.assigned_work[node]
+        collection = self.registered_collections[node]
+        units = dict.fromkeys(self._unit_of(collection[i]) for i in indices)
+        for unit in reversed(units):
+            self.workqueue[unit] = workload.pop(unit)
+            self.workqueue.move_to_end(unit, last=False)
+        self.stolen_units.update(units)
+
+        for other in self.nodes:
+            if other is not node:
+                self._reschedule(other)
+        self._reschedule(node)
+
+    def _pending_units(self, node: WorkerController) -> list[str]:
+        """Return the work units of a node with tests not completed."""
+        return [
+            unit
+            for unit, work_unit in self.assigned_work[node].items()
+            if not all(work_unit.values())
+        ]
+
+    def _stealable_units(self, node: WorkerController) -> list[str]:
+        """Return the work units queued on a node whose tests did not start.
+
+        The first pending work unit is being run, or is about to be.
+        """
+        workload = self.assigned_work[node]
+        return [
+            unit
+            for unit in self._pending_units(node)[1:]
+            if not any(workload[unit].values()) and unit not in self.stolen_units
+        ]
+
+    def _steal_work_for(self, node: WorkerController) -> bool:
+        """Ask the node with most queued work units to give some of them back.
+
+        Half of the queued work units, taken from the tail of its queue, are
+        requested.  Returns False if there is nothing to steal.
+        """
+        if self.lazy_collection:
+            # nodes can only run tests of their own collection
+            return False
+        if self.steal_requested_from_node is not None:
+            # wait for the answer to the active request
+            return True
+
+        candidates = [
+            (other, self._stealable_units(other))
+            for other in self.nodes
+            if other is not node and not other.shutting_down
+        ]
+        candidates = [(other, units) for other, units in candidates if units]
+        if not candidates:
+            return False
+        if len(self._pending_units(node)) > 1:
+            # steal once the node runs its last work unit, so that it does
+            # not take work which it cannot start before the victim
+            return True
+        candidates = [
+            (other, units)
+            for other, units in candidates
+            if other is not self.steal_refused_by
+        ]
+        if not candidates:
+            # ask the node which refused again once it completed a test
+            return True
+
+        steal_from, units = max(candidates, key=lambda candidate: len(candidate[1]))
+        units = units[len(units) // 2 :]
+        workload = self.assigned_work[steal_from]
+        collection = self.registered_collections[steal_from]
+        self.log(f"Stealing {len(units)} work units from {steal_from}")
+        steal_from.send_steal(
+            [collection.index(nodeid) for unit in units for nodeid in workload[unit]]
+        )
+        self.steal_requested_from_node = steal_from
+        return True
+
+    def _retry_steal(self, node: WorkerController) -> None:
+        """Let the other nodes steal from a node which refused, once it
+        completed a test."""
+        if node is not self.steal_refused_by:
+            return
+        self.steal_refused_by = None
+        for other in self.nodes:
+            if other is not node:
+                self._reschedule(other)
 
     def _assign_work_unit(self, node: WorkerController) -> None:
         """Assign a work unit to a node."""
         assert self.workqueue
 
+        if self.lazy_collection:
+            self._assign_collected_work_unit(node)
+            return
+
         # Grab a unit of work
         scope, work_unit = self.workqueue.popitem(last=False)
 
@@ -281,6 +589,41 @@ class LoadScopeScheduling:
 
         node.send_runtest_some(nodeids_indexes)
 
+    def _queue_collected_scopes(self, node: WorkerController) -> None:
+        """Find the scopes of the workqueue collected by the node."""
+        collected = self.collected_indices.get(node, {})
+        self.collected_scopes[node] = deque(
+            scope
+            for scope, work_unit in self.workqueue.items()
+            if next(iter(work_unit)) in collected
+        )
+
+    def _next_collected_scope(self, node: WorkerController) -> str | None:
+        """Return the first scope of the workqueue collected by the node."""
+        scopes = self.collected_scopes.get(node)
+        if scopes is None:
+            return None
+        # drop the scopes which were assigned in the meantime
+        while scopes and scopes[0] not in self.workqueue:
+            scopes.popleft()
+        return scopes[0] if scopes else None
+
+    def _assign_collected_work_unit(self, node: WorkerController) -> None:
+        """Assign a work unit from its own collection to a node."""
+        scope = self._next_collected_scope(node)
+        if scope is None:
+            return
+        work_unit = self.workqueue.pop(scope)
+        self.assigned_work[node][scope] = work_unit
+        collected = self.collected_indices[node]
+        node.send_runtest_some(
+            [
+                collected[nodeid]
+                for nodeid, completed in work_unit.items()
+                if not completed
+            ]
+        )
+
     def _split_scope(self, nodeid: str) -> str:
         """Determine the scope (grouping) of a nodeid.
 
@@ -305,11 +648,99 @@ class LoadScopeScheduling:
         """
         return nodeid.rsplit("::", 1)[0]
 
+    def _split_large_scopes(
+        self, workqueue: dict[str, dict[str, bool]], costs: dict[str, float]
+    ) -> dict[str, dict[str, bool]]:
+        """Split the scopes expected to cost more than the share of one node.
+
+        A scope whose cost exceeds the total cost divided by the number of
+        nodes is split into consecutive parts of about the same number of
+        tests, each one a separate work unit, unless one of its tests is
+        marked with ``xdist_no_split``.  ``costs`` is updated accordingly.
+        """
+        limit = sum(costs.values()) / max(len(self.nodes), 1)
+        result: dict[str, dict[str, bool]] = {}
+        for scope, work_unit in workqueue.items():
+            cost = costs[scope]
+            if (
+                cost <= limit
+                or len(work_unit) < 2
+                or not self.unsplittable.isdisjoint(work_unit)
+            ):
+                result[scope] = work_unit
+                continue
+            nodeids = list(work_unit)
+            count = min(math.ceil(cost / limit), len(nodeids))
+            del costs[scope]
+            for i in range(count):
+                part = nodeids[
+                    i * len(nodeids) // count : (i + 1) * len(nodeids) // count
+                ]
+                unit = f"{scope}[{i + 1}/{count}]"
+                result[unit] = dict.fromkeys(part, False)
+                costs[unit] = cost * len(part) / len(nodeids)
+                for nodeid in part:
+                    self.split_units[nodeid] = unit
+            self.log(f"Split {scope} into {count} work units")
+        return result
+
+    def _unit_of(self, nodeid: str) -> str:
+        """Return the work unit of a nodeid: its scope, or part of it."""
+        return self.split_units.get(nodeid) or self._split_scope(nodeid)
+
+    def _scope_cost(self, scope: str, nodeids: Sequence[str]) -> float:
+        """Return the expected cost of running the tests of a scope.
+
+        The cost is given by the ``pytest_xdist_scope_cost`` hook, and is the
+        number of tests by default.
+        """
+        cost: float | None = self.config.hook.pytest_xdist_scope_cost(
+            config=self.config, scope=scope, nodeids=nodeids
+        )
+        return len(nodeids) if cost is None else cost
+
     def _pending_of(self, workload: dict[str, dict[str, bool]]) -> int:
         """Return the number of pending tests in a workload."""
         pending = sum(list(scope.values()).count(False) for scope in workload.values())
         return pending
 
+    @property
+    def prefetch(self) -> bool:
+        """Return True if a prefetch depth was given (``--loadscope-prefetch``)."""
+        return bool(self.prefetch_units or self.prefetch_seconds)
+
+    def _has_work_for(self, node: WorkerController) -> bool:
+        """Return True if the workqueue has a work unit the node can run."""
+        if not self.workqueue:
+            return False
+        return not self.lazy_collection or self._next_collected_scope(node) is not None
+
+    def _wants_work(self, node: WorkerController) -> bool:
+        """Return True if the node should be assigned another work unit."""
+        workload = self.assigned_work[node]
+        if not self.prefetch:
+            # 2: Heuristic of minimum tests to enqueue more work
+            return self._pending_of(workload) <= 2
+
+        pending_units = {
+            unit: work_unit
+            for unit, work_unit in workload.items()
+            if not all(work_unit.values())
+        }
+        if self.prefetch_units:
+            # the running unit and the queued ones
+            return len(pending_units) <= self.prefetch_units
+
+        if not pending_units:
+            return True
+        pending_seconds = sum(
+            self.unit_costs.get(unit, len(work_unit))
+            * list(work_unit.values()).count(False)
+            / len(work_unit)
+            for unit, work_unit in pending_units.items()
+        )
+        return pending_seconds < self.prefetch_seconds
+
     def _reschedule(self, node: WorkerController) -> None:
         """Maybe schedule new items on the node.
 
@@ -320,20 +751,23 @@ class LoadScopeScheduling:
         if node.shutting_down:
             return
 
-        # Check that more work is available
-        if not self.workqueue:
-            node.shutdown()
+        # Check that more work is available, or can be stolen from another
+        # node when this one is almost depleted of work
+        if not self._has_work_for(node):
+            if self._pending_of(self.assigned_work[node]) <= 2 and not (
+                self._steal_work_for(node)
+            ):
+                node.shutdown()
             return
 
         self.log("Number of units waiting for node:", len(self.workqueue))
 
-        # Check that the node is almost depleted of work
-        # 2: Heuristic of minimum tests to enqueue more work
-        if self._pending_of(self.assigned_work[node]) > 2:
-            return
-
-        # Pop one unit of work and assign it
-        self._assign_work_unit(node)
+        # Fill the node's queue of work units up to the prefetch depth, or
+        # assign one unit when the node is almost depleted of work
+        while self._has_work_for(node) and self._wants_work(node):
+            self._assign_work_unit(node)
+            if not self.prefetch:
+                break
 
     def schedule(self) -> None:
         """Initiate distribution of the test collection.
@@ -354,13 +788,27 @@ class LoadScopeScheduling:
                 self._reschedule(node)
             return
 
-        # Check that all nodes collected the same tests
-        if not self._check_nodes_have_same_collection():
-            self.log("**Different tests collected, aborting run**")
-            return
+        if self.lazy_collection:
+            # Nodes collected different files, check that they agree on the
+            # scopes collected by several of them
+            if not self._check_nodes_have_consistent_scopes():
+                self.log("**Different tests collected, aborting run**")
+                return
+            self.collection = list(
+                dict.fromkeys(
+                    nodeid
+                    for collection in self.registered_collections.values()
+                    for nodeid in collection
+                )
+            )
+        else:
+            # Check that all nodes collected the same tests
+            if not self._check_nodes_have_same_collection():
+                self.log("**Different tests collected, aborting run**")
+                return
 
-        # Collections are identical, create the final list of items
-        self.collection = list(next(iter(self.registered_collections.values())))
+            # Collections are identical, create the final list of items
+            self.collection = list(next(iter(self.registered_collections.values())))
         if not self.collection:
             return
 
@@ -371,10 +819,26 @@ class LoadScopeScheduling:
             work_unit = unsorted_workqueue.setdefault(scope, {})
             work_unit[nodeid] = False
 
+        costs: dict[str, float] = {}
+        if (
+            self.config.option.loadscopereorder
+            or self.split_scopes
+            or self.prefetch_seconds
+        ):
+            costs = {
+                scope: self._scope_cost(scope, list(nodeids))
+                for scope, nodeids in unsorted_workqueue.items()
+            }
+        if self.split_scopes:
+            unsorted_workqueue = self._split_large_scopes(unsorted_workqueue, costs)
+        self.unit_costs = costs
+
         if self.config.option.loadscopereorder:
-            # Insert tests scopes into work queue ordered by number of tests.
+            # Insert tests scopes into work queue ordered by expected cost:
+            # as idle nodes take the next scope, the scopes expected to take
+            # longest start first and the shortest ones fill the tail.
             for scope, nodeids in sorted(
-                unsorted_workqueue.items(), key=lambda item: -len(item[1])
+                unsorted_workqueue.items(), key=lambda item: -costs[item[0]]
             ):
                 self.workqueue[scope] = nodeids
         else:
@@ -384,7 +848,14 @@ class LoadScopeScheduling:
         # Avoid having more workers than work
         extra_nodes = len(self.nodes) - len(self.workqueue)
 
-        if extra_nodes > 0:
+        if self.lazy_collection:
+            for node in self.nodes:
+                self._queue_collected_scopes(node)
+                if self._next_collected_scope(node) is None:
+                    self.log(f"Shutting down unused node {node}")
+                    del self.assigned_work[node]
+                    node.shutdown()
+        elif extra_nodes > 0:
             self.log(f"Shutting down {extra_nodes} nodes")
 
             for _ in range(extra_nodes):
@@ -397,14 +868,60 @@ class LoadScopeScheduling:
         for node in self.nodes:
             self._assign_work_unit(node)
 
-        # Ensure nodes start with at least two work units if possible (#277)
-        for node in self.nodes:
-            self._reschedule(node)
+        if self.prefetch:
+            # Fill the queues of the nodes one unit at a time, so the first
+            # nodes do not take all the work
+            nodes = self.nodes
+            while nodes:
+                nodes = [node for node in nodes if self._wants_work(node)]
+                for node in nodes:
+                    if self._has_work_for(node):
+                        self._assign_work_unit(node)
+                nodes = [node for node in nodes if self._has_work_for(node)]
+        else:
+            # Ensure nodes start with at least two work units if possible (#277)
+            for node in self.nodes:
+                self._reschedule(node)
 
-        # Initial distribution sent all tests, start node shutdown
+        # Initial distribution sent all tests, balance the queued work units
+        # or start node shutdown
         if not self.workqueue:
             for node in self.nodes:
-                node.shutdown()
+                self._reschedule(node)
+
+    def _check_nodes_have_consistent_scopes(self) -> bool:
+        """Return True if scopes collected by several nodes are identical.
+
+        Used with ``lazy_collection`` instead of
+        ``._check_nodes_have_same_collection()``.  Differences are logged and
+        posted to the pytest_collectreport hook.
+        """
+        scopes: dict[str, tuple[WorkerController, list[str]]] = {}
+        consistent = True
+        for node, collection in self.registered_collections.items():
+            node_scopes: dict[str, list[str]] = {}
+            for nodeid in collection:
+                node_scopes.setdefault(self._split_scope(nodeid), []).append(nodeid)
+            for scope, nodeids in node_scopes.items():
+                first_node, first_nodeids = scopes.setdefault(scope, (node, nodeids))
+                msg = report_collection_diff(
+                    first_nodeids, nodeids, first_node.gateway.id, node.gateway.id
+                )
+                if not msg:
+                    continue
+
+                consistent = False
+                self.log(msg)
+
+                rep = pytest.CollectReport(
+                    nodeid=node.gateway.id,
+                    outcome="failed",
+                    longrepr=msg,
+                    result=[],
+                )
+                self.config.hook.pytest_collectreport(report=rep)
+
+        return consistent
 
     def _check_nodes_have_same_collection(self) -> bool:
         """Return True if all nodes have collected the same items.
@@ -34,6 +34,13 @@ class Scheduling(Protocol):
         duration: float = 0,
     ) -> None: ...
 
+    def mark_tests_complete(
+        self,
+        node: WorkerController,
+        item_indices: Sequence[int],
+        duration: float = 0,
+    ) -> None: ...
+
     def mark_test_pending(self, item: str) -> None: ...
 
     def remove_pending_tests_from_node(
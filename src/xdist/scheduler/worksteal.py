@@ -121,6 +121,13 @@ class WorkStealingScheduling:
                 return True
         return False
 
+    @property
+    def pending_count(self) -> int:
+        """The number of tests not completed yet, sent to a node or not."""
+        return len(self.pending) + sum(
+            len(pending) for pending in self.node2pending.values()
+        )
+
     def add_node(self, node: WorkerController) -> None:
         """Add a new node to the scheduler.
 
@@ -166,6 +173,22 @@ class WorkStealingScheduling:
         self.node2pending[node].remove(item_index)
         self.check_schedule()
 
+    def mark_tests_complete(
+        self,
+        node: WorkerController,
+        item_indices: Sequence[int],
+        duration: float | None = None,
+    ) -> None:
+        """Mark several test items as completed by node at once.
+
+        This is called by ``DSession.loop_once`` when several completions
+        from the same node are processed together.
+        """
+        pending = self.node2pending[node]
+        for item_index in item_indices:
+            pending.remove(item_index)
+        self.check_schedule()
+
     def mark_test_pending(self, item: str) -> None:
         assert self.collection is not None
         self.pending.insert(
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import threading
+from typing import Any
+from typing import TextIO
+
+
+class BufferedTerminalFile:
+    """File of the terminal writer, written to the real file by a thread.
+
+    Writes are only appended to a buffer, which a thread writes to the real
+    file every ``interval`` seconds, so the event loop of the controller
+    never blocks on a slow terminal or log pipe, and the output of many
+    tests is written at once.  Once the buffer holds ``max_size``
+    characters, it is written by the writer instead, so it does not grow
+    without limit when the file is slower than the output.  Other
+    attributes (``isatty``, ``encoding``, ...) are those of the real file.
+    """
+
+    def __init__(
+        self, file: TextIO, interval: float, max_size: int = 1024 * 1024
+    ) -> None:
+        self.file = file
+        self.interval = interval
+        self.max_size = max_size
+        self._chunks: list[str] = []
+        self._size = 0
+        self._lock = threading.Lock()
+        # held while writing to the file, so that the buffers are written in
+        # order by the thread and the writer
+        self._write_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="xdist-terminal", daemon=True
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.file, name)
+
+    def write(self, s: str) -> int:
+        with self._lock:
+            self._chunks.append(s)
+            self._size += len(s)
+            full = self._size >= self.max_size
+        if full:
+            self._write_buffer()
+        return len(s)
+
+    def flush(self) -> None:
+        """Does nothing: the buffer is flushed by the thread."""
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop the thread, and write what remains in the buffer."""
+        self._stopped.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self._write_buffer()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self._write_buffer()
+
+    def _write_buffer(self) -> None:
+        with self._write_lock:
+            with self._lock:
+                chunks, self._chunks = self._chunks, []
+                self._size = 0
+            if chunks:
+                try:
+                    self.file.write("".join(chunks))
+                    self.file.flush()
+                except OSError:
+                    # e.g. a closed pipe: the output is dropped
+                    pass
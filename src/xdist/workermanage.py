@@ -20,6 +20,7 @@ import pytest
 from xdist.plugin import _sys_path
 import xdist.remote
 from xdist.remote import Producer
+from xdist.remote import ShmRing
 from xdist.remote import WorkerInfo
 
 
@@ -322,6 +323,7 @@ class WorkerController:
         }
         self._down = False
         self._shutdown_sent = False
+        self.shmring: ShmRing | None = None
         self.log = Producer(f"workerctl-{gateway.id}", enabled=config.option.debug)
 
     def __repr__(self) -> str:
@@ -348,6 +350,10 @@ class WorkerController:
             if hasattr(self.config, "_tmp_path_factory"):
                 basetemp = self.config._tmp_path_factory.getbasetemp()
                 option_dict["basetemp"] = str(basetemp / name)
+            shmsize = getattr(self.config.option, "shmreports", None)
+            if shmsize and not spec.via:
+                self.shmring = ShmRing.create(shmsize)
+                self.workerinput["shmreports"] = self.shmring.name
         self.config.hook.pytest_configure_node(node=self)
 
         remote_module = self.config.hook.pytest_xdist_getremotemodule()
@@ -371,6 +377,9 @@ class WorkerController:
             self.log("exiting", self.gateway)
             self.gateway.exit()
             # del self.gateway
+        if self.shmring is not None:
+            self.shmring.close(unlink=True)
+            self.shmring = None
 
     def send_runtest_some(self, indices: Sequence[int]) -> None:
         self.sendcommand("runtests", indices=indices)
@@ -381,6 +390,12 @@ class WorkerController:
     def send_steal(self, indices: Sequence[int]) -> None:
         self.sendcommand("steal", indices=indices)
 
+    def send_collection_request(self) -> None:
+        self.sendcommand("sendcollection")
+
+    def send_collect_files(self, files: Sequence[str]) -> None:
+        self.sendcommand("collectfiles", files=files)
+
     def shutdown(self) -> None:
         if not self._down:
             try:
@@ -391,11 +406,12 @@ class WorkerController:
 
     def sendcommand(self, name: str, **kwargs: object) -> None:
         """Send a named parametrized command to the other side."""
-        self.log(f"sending command {name}(**{kwargs})")
+        # arguments are only formatted if logging is enabled (--debug)
+        self.log("sending command", name, kwargs)
         self.channel.send((name, kwargs))
 
     def notify_inproc(self, eventname: str, **kwargs: object) -> None:
-        self.log(f"queuing {eventname}(**{kwargs})")
+        self.log("queuing", eventname, kwargs)
         self.putevent((eventname, kwargs))
 
     def process_from_remote(
@@ -416,10 +432,14 @@ class WorkerController:
                         err = "Not properly terminated"  # lost connection?
                     self.notify_inproc("errordown", node=self, error=err)
                     self._down = True
+                if self.shmring is not None:
+                    # no more reports can arrive
+                    self.shmring.close(unlink=True)
+                    self.shmring = None
                 return
             eventname, kwargs = eventcall
             if eventname in ("collectionstart",):
-                self.log(f"ignoring {eventname}({kwargs})")
+                self.log("ignoring", eventname, kwargs)
             elif eventname == "workerready":
                 self.notify_inproc(eventname, node=self, **kwargs)
             elif eventname == "internal_error":
@@ -432,14 +452,28 @@ class WorkerController:
                 self.notify_inproc(eventname, node=self, **kwargs)
             elif eventname in ("testreport", "collectreport", "teardownreport"):
                 item_index = kwargs.pop("item_index", None)
+                if "shm" in kwargs:
+                    assert self.shmring is not None
+                    data = self.shmring.read(*kwargs["shm"])
+                else:
+                    data = kwargs["data"]
                 rep = self.config.hook.pytest_report_from_serializable(
-                    config=self.config, data=kwargs["data"]
+                    config=self.config, data=data
                 )
                 if item_index is not None:
                     rep.item_index = item_index
                 self.notify_inproc(eventname, node=self, rep=rep)
             elif eventname == "collectionfinish":
-                self.notify_inproc(eventname, node=self, ids=kwargs["ids"])
+                self.notify_inproc(
+                    eventname,
+                    node=self,
+                    ids=kwargs.get("ids"),
+                    digest=kwargs.get("digest"),
+                    nosplit=kwargs.get("nosplit"),
+                    resumed=kwargs.get("resumed"),
+                )
+            elif eventname == "collectionfiles":
+                self.notify_inproc(eventname, node=self, **kwargs)
             elif eventname == "runtest_protocol_complete":
                 self.notify_inproc(eventname, node=self, **kwargs)
             elif eventname == "unscheduled":
@@ -3,6 +3,7 @@ from __future__ import annotations
 import os
 import re
 import shutil
+import sys
 from typing import cast
 
 import pytest
@@ -49,6 +50,22 @@ class TestDistribution:
         assert result.ret == 1
         result.stdout.fnmatch_lines(["*1 failed*"])
 
+    def test_shm_reports(self, pytester: pytest.Pytester) -> None:
+        pytester.makepyfile(
+            """
+            import pytest
+
+            @pytest.mark.parametrize("i", range(20))
+            def test_fail(i):
+                # the last report does not fit into the ring buffer
+                print("x" * (2_000_000 if i == 19 else 1000))
+                assert i % 2
+        """
+        )
+        result = pytester.runpytest("-n2", "--shm-reports=1")
+        assert result.ret == 1
+        result.stdout.fnmatch_lines(["*10 failed, 10 passed*"])
+
     def test_n1_import_error(self, pytester: pytest.Pytester) -> None:
         p1 = pytester.makepyfile(
             """
@@ -429,6 +446,28 @@ class TestDistEach:
         assert "2...5" in s
         assert "2...6" in s
 
+    def test_eachload(self, pytester: pytest.Pytester) -> None:
+        pytester.makepyfile(
+            """
+            import pytest
+
+            @pytest.mark.parametrize("i", range(10))
+            def test_ok(i):
+                pass
+        """
+        )
+        python = sys.executable
+        result = pytester.runpytest(
+            "--dist=eachload", "--tx=2*popen", f"--tx=2*popen//python={python}", "-v"
+        )
+        assert result.ret == 0
+        result.stdout.fnmatch_lines(["*= 20 passed in *"])
+        # each environment ran each test once, on both of its workers
+        workers = get_workers_and_test_count_by_prefix("test_", result.outlines)
+        assert sum(workers[gw] for gw in ("gw0", "gw1")) == 10
+        assert sum(workers[gw] for gw in ("gw2", "gw3")) == 10
+        assert all(workers[gw] for gw in ("gw0", "gw1", "gw2", "gw3"))
+
 
 class TestTerminalReporting:
     @pytest.mark.parametrize("verbosity", ["", "-q", "-v"])
@@ -990,6 +1029,156 @@ class TestNodeFailure:
             ]
         )
 
+    def test_crash_retries(self, pytester: pytest.Pytester) -> None:
+        f = pytester.makepyfile(
+            """
+            import os
+            from pathlib import Path
+            def test_a(): pass
+            def test_b():
+                if not Path("crashed").exists():
+                    Path("crashed").touch()
+                    os._exit(1)
+            def test_c(): pass
+        """
+        )
+        res = pytester.runpytest(f, "-n2", "--xdist-crash-retries=1")
+        res.stdout.fnmatch_lines(
+            [
+                "worker gw* crashed while running *test_b*, running it again alone "
+                "on a new worker (1/1)",
+                "*3 passed*",
+            ]
+        )
+
+    def test_crash_retries_exhausted(self, pytester: pytest.Pytester) -> None:
+        f = pytester.makepyfile(
+            """
+            import os
+            def test_a(): os._exit(1)
+            def test_b(): pass
+        """
+        )
+        res = pytester.runpytest(f, "-n1", "--xdist-crash-retries=2")
+        res.stdout.fnmatch_lines(
+            [
+                "*running it again alone on a new worker (1/2)",
+                "*running it again alone on a new worker (2/2)",
+                "worker*crashed while running*(3 times*",
+                "*1 failed*1 passed*",
+            ]
+        )
+
+    def test_bisect_crashes(self, pytester: pytest.Pytester) -> None:
+        f = pytester.makepyfile(
+            """
+            import os
+            def test_a(): pass
+            def test_poison(): os.environ["POISONED"] = "1"
+            def test_c(): pass
+            def test_d(): pass
+            def test_crash():
+                if os.environ.get("POISONED"):
+                    os._exit(1)
+            def test_alone(): os._exit(1)
+        """
+        )
+        res = pytester.runpytest(f, "-n1", "--xdist-bisect-crashes")
+        res.stdout.fnmatch_lines(
+            [
+                "bisecting the crash of '*::test_crash' over the 4 tests which "
+                "ran before it (at most 4 runs)",
+                "*= xdist crash bisection =*",
+                "*::test_crash: crashes after the first 2 of the 4 tests which ran "
+                "before it, the last one being *::test_poison",
+                "*::test_alone: crashes when run alone",
+                "*2 failed, 4 passed*",
+            ]
+        )
+
+    def test_standby_worker(self, pytester: pytest.Pytester) -> None:
+        f = pytester.makepyfile(
+            """
+            import os, time
+            def test_a():
+                time.sleep(1)  # let the standby worker collect
+                os._exit(1)
+            def test_b(): pass
+            def test_c(): pass
+        """
+        )
+        res = pytester.runpytest(f, "-n1", "--xdist-standby=1", "-v")
+        res.stdout.fnmatch_lines(
+            [
+                "1 worker [3 items]",
+                "replacing crashed worker gw0",
+                "*1 failed*2 passed*",
+            ]
+        )
+        # gw1 was the standby worker, gw2 the standby worker started then
+        passed = get_workers_and_test_count_by_prefix(
+            "test_standby_worker.py", res.outlines
+        )
+        assert passed == {"gw1": 2}
+
+    def test_standby_worker_other_environment(self, pytester: pytest.Pytester) -> None:
+        pytester.makeconftest(
+            """
+            import os
+            def pytest_collection_finish(session):
+                open(f"collected-{os.environ['PYTEST_XDIST_WORKER']}", "w").close()
+        """
+        )
+        f = pytester.makepyfile(
+            """
+            import os, time, pytest
+            @pytest.mark.parametrize("i", range(6))
+            def test(i):
+                # let the standby worker of the environment collect
+                deadline = time.monotonic() + 30
+                while not os.path.exists("collected-gw3"):
+                    assert time.monotonic() < deadline
+                    time.sleep(0.1)
+                time.sleep(1)
+                if os.environ["XENV"] == "b":
+                    os._exit(1)
+        """
+        )
+        res = pytester.runpytest(
+            f,
+            "--tx=popen//env:XENV=a",
+            "--tx=popen//env:XENV=b",
+            "--dist=load",
+            "--xdist-standby=1",
+            "-v",
+        )
+        res.stdout.fnmatch_lines(["replacing crashed worker gw1", "*passed*"])
+        # gw2 and gw3 are the standby workers of the environments of gw0,
+        # which did not crash, and of gw1, which it replaced
+        assert not any(line.startswith("[gw2]") for line in res.outlines)
+        assert any(line.startswith("[gw3]") for line in res.outlines)
+
+    @pytest.mark.parametrize("option", ["--xdist-standby", "--xdist-crash-retries"])
+    def test_negative_count(self, pytester: pytest.Pytester, option: str) -> None:
+        res = pytester.runpytest("-n1", f"{option}=-1")
+        assert res.ret == pytest.ExitCode.USAGE_ERROR
+        res.stderr.fnmatch_lines([f"*{option} must be a non-negative number.*"])
+
+    @pytest.mark.parametrize("dist", ["each", "eachload"])
+    def test_standby_worker_each(self, pytester: pytest.Pytester, dist: str) -> None:
+        f = pytester.makepyfile("def test(): pass")
+        res = pytester.runpytest(
+            f,
+            "--tx=popen//env:XENV=a",
+            "--tx=popen//env:XENV=b",
+            f"--dist={dist}",
+            "--xdist-standby=1",
+        )
+        assert res.ret == pytest.ExitCode.USAGE_ERROR
+        res.stderr.fnmatch_lines(
+            ["*--xdist-standby cannot be used with --dist=each or --dist=eachload.*"]
+        )
+
     def test_max_worker_restart(self, pytester: pytest.Pytester) -> None:
         f = pytester.makepyfile(
             """
@@ -1288,6 +1477,138 @@ class TestLoadScope:
             "test_b.py::test", result.outlines
         ) == {"gw1": 20}
 
+    def test_loadscope_split(self, pytester: pytest.Pytester) -> None:
+        test_file = """
+            import pytest
+            {}
+            @pytest.mark.parametrize('i', range(20))
+            def test(i):
+                pass
+        """
+        pytester.makepyfile(
+            test_a=test_file.format(""),
+            test_b=test_file.format("pytestmark = pytest.mark.xdist_no_split"),
+        )
+        result = pytester.runpytest(
+            "-n4", "--dist=loadscope", "--loadscope-split", "-v"
+        )
+        assert result.ret == 0
+        a = get_workers_and_test_count_by_prefix("test_a.py::test", result.outlines)
+        b = get_workers_and_test_count_by_prefix("test_b.py::test", result.outlines)
+        # both files are expected to take twice as long as the share of a worker
+        assert sorted(a.values()) == [10, 10]
+        assert list(b.values()) == [20]
+
+    def test_loadscope_prefetch(self, pytester: pytest.Pytester) -> None:
+        for i in range(6):
+            pytester.makepyfile(
+                **{f"test_{i}": "def test_1(): pass\ndef test_2(): pass"}
+            )
+        result = pytester.runpytest("-n2", "--dist=loadfile", "--loadscope-prefetch=2")
+        assert result.ret == 0
+        result.stdout.fnmatch_lines(["*12 passed*"])
+
+    def test_steal_queued_files(self, pytester: pytest.Pytester) -> None:
+        pytester.makepyfile(
+            test_a="""
+            import time
+            from pathlib import Path
+            def test_slow():
+                # test_b5.py is queued behind this test, wait for it to be
+                # taken and run by the other worker
+                deadline = time.monotonic() + 30
+                while not Path("b5.done").exists() and time.monotonic() < deadline:
+                    time.sleep(0.1)
+                assert Path("b5.done").exists()
+            """
+        )
+        for i in range(5):
+            pytester.makepyfile(**{f"test_b{i}": "def test_1(): pass"})
+        pytester.makepyfile(
+            test_b5="""
+            from pathlib import Path
+            def test_1():
+                Path("b5.done").touch()
+            """
+        )
+        result = pytester.runpytest(
+            "-n2",
+            "--dist=loadfile",
+            "--loadscope-prefetch=3",
+            "--no-loadscope-reorder",
+            "-v",
+        )
+        assert result.ret == 0
+        slow = get_workers_and_test_count_by_prefix("test_a.py", result.outlines)
+        last = get_workers_and_test_count_by_prefix("test_b5.py", result.outlines)
+        assert slow.keys() != last.keys()
+
+    def test_lazy_collection(self, pytester: pytest.Pytester) -> None:
+        test_file = """
+            import os
+            with open("imported.txt", "a") as f:
+                f.write(os.environ["PYTEST_XDIST_WORKER"] + " " + __name__ + "\\n")
+
+            def test_1():
+                pass
+            def test_2():
+                pass
+        """
+        pytester.makepyfile(test_a=test_file, test_b=test_file, test_c=test_file)
+        result = pytester.runpytest("-n2", "--dist=loadfile", "--lazy-collection", "-v")
+        assert result.ret == 0
+        result.stdout.fnmatch_lines(["2 workers [[]6 items[]]", "*6 passed*"])
+        # each module was imported once, by the worker running its tests
+        imported = pytester.path.joinpath("imported.txt").read_text().splitlines()
+        assert sorted(line.split()[1] for line in imported) == [
+            "test_a",
+            "test_b",
+            "test_c",
+        ]
+        for line in imported:
+            worker, module = line.split()
+            tests = get_workers_and_test_count_by_prefix(
+                f"{module}.py::test", result.outlines
+            )
+            assert tests == {worker: 2}
+
+    def test_lazy_collection_hooks_called_once(self, pytester: pytest.Pytester) -> None:
+        pytester.makeconftest(
+            """
+            def record(name):
+                with open("hooks.txt", "a") as f:
+                    f.write(name + "\\n")
+
+            def pytest_collection_modifyitems(items):
+                record(f"modifyitems {len(items)}")
+                # deselect the first test
+                items[:] = items[1:]
+
+            def pytest_collection_finish(session):
+                record("finish")
+        """
+        )
+        pytester.makepyfile(
+            test_a="""
+            def test_1(): pass
+            def test_2(): pass
+            def test_3(): pass
+        """
+        )
+        result = pytester.runpytest("-n1", "--dist=loadfile", "--lazy-collection")
+        result.stdout.fnmatch_lines(["*2 passed*"])
+        hooks = pytester.path.joinpath("hooks.txt").read_text().splitlines()
+        assert hooks == ["modifyitems 3", "finish"]
+
+    def test_lazy_collection_requires_file_or_scope(
+        self, pytester: pytest.Pytester
+    ) -> None:
+        result = pytester.runpytest("-n2", "--dist=load", "--lazy-collection")
+        result.stderr.fnmatch_lines(
+            ["*--lazy-collection requires --dist=loadscope or --dist=loadfile*"]
+        )
+        assert result.ret == pytest.ExitCode.USAGE_ERROR
+
     def test_module_single_start(self, pytester: pytest.Pytester) -> None:
         """Fix test suite never finishing in case all workers start with a single test (#277)."""
         test_file1 = """
@@ -1310,7 +1631,8 @@ class TestLoadScope:
         c2 = get_workers_and_test_count_by_prefix("test_c.py::test_2", result.outlines)
         assert a in ({"gw0": 1}, {"gw1": 1})
         assert b in ({"gw0": 1}, {"gw1": 1})
-        assert a.items() != b.items()
+        # test_b.py is queued behind test_c.py, and may be taken over by the
+        # worker which ran test_a.py
         assert c1 == c2
 
 
@@ -1400,7 +1722,8 @@ class TestFileScope:
         c2 = get_workers_and_test_count_by_prefix("test_c.py::test_2", result.outlines)
         assert a in ({"gw0": 1}, {"gw1": 1})
         assert b in ({"gw0": 1}, {"gw1": 1})
-        assert a.items() != b.items()
+        # test_b.py is queued behind test_c.py, and may be taken over by the
+        # worker which ran test_a.py
         assert c1 == c2
 
 
@@ -0,0 +1,81 @@
+"""Peak memory of the controller with and without --xdist-low-memory.
+
+Runs a test suite of passing tests, 1,000,000 by default, with and without
+the option, and prints the peak resident memory of the controller process
+of each run::
+
+    python testing/benchmark_low_memory.py [--items N] [--workers N]
+
+The resident memory is measured with ``resource``, so on Unix only.  A run
+of one million tests takes a while: use ``--items`` for a quicker estimate.
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import subprocess
+import sys
+import tempfile
+
+
+TEST_FILE = """
+import pytest
+
+@pytest.mark.parametrize("i", range({items}))
+def test_pass(i):
+    pass
+"""
+
+CONFTEST = """
+import resource
+import sys
+
+def pytest_unconfigure(config):
+    if not hasattr(config, "workerinput"):
+        # kilobytes on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform != "darwin":
+            peak *= 1024
+        with open("peak_memory", "w") as f:
+            f.write(str(peak))
+"""
+
+
+def run(path: Path, workers: int, options: list[str]) -> int:
+    """Run the tests in path, and return the peak memory of the controller."""
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "pytest",
+            "-q",
+            "-p",
+            "no:cacheprovider",
+            f"-n{workers}",
+            *options,
+        ],
+        cwd=path,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    return int((path / "peak_memory").read_text())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir)
+        (path / "test_benchmark.py").write_text(TEST_FILE.format(items=args.items))
+        (path / "conftest.py").write_text(CONFTEST)
+        for options in ([], ["--xdist-low-memory"]):
+            peak = run(path, args.workers, options)
+            label = " ".join(options) or "default"
+            print(f"{args.items} tests, {label}: {peak / 2**20:.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
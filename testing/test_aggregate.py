@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import copy
+from typing import Any
+from typing import cast
+
+import execnet
+import pytest
+
+from xdist.aggregate import EnvironmentAggregator
+from xdist.workermanage import WorkerController
+
+
+class MockGateway:
+    def __init__(self, spec: execnet.XSpec) -> None:
+        self.id = spec.id
+        self.spec = spec
+
+
+class MockNode:
+    def __init__(self, spec: execnet.XSpec) -> None:
+        self.gateway = MockGateway(spec)
+        self.workerinfo = {"version_info": (3, 12, 1)}
+
+
+class MockHook:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, str]] = []
+
+    def pytest_runtest_logstart(self, nodeid: str, location: Any) -> None:
+        self.calls.append(("logstart", nodeid))
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        self.calls.append((f"{report.when} {report.outcome}", report.nodeid))
+
+    def pytest_runtest_logfinish(self, nodeid: str, location: Any) -> None:
+        self.calls.append(("logfinish", nodeid))
+
+
+class MockConfig:
+    def __init__(self, dist: str = "each") -> None:
+        self.hook = MockHook()
+        self.dist = dist
+
+    def getvalue(self, name: str) -> str:
+        assert name == "dist"
+        return self.dist
+
+
+def run(
+    aggregator: EnvironmentAggregator, node: MockNode, nodeid: str, outcome: str
+) -> None:
+    for when in ("setup", "call", "teardown"):
+        rep = pytest.TestReport(
+            nodeid=nodeid,
+            location=("a.py", 1, nodeid),
+            keywords={},
+            outcome=outcome if when == "call" else "passed",  # type: ignore[arg-type]
+            longrepr=None,
+            when=when,
+        )
+        aggregator.add(cast(WorkerController, node), rep)
+
+
+@pytest.fixture
+def specs() -> list[execnet.XSpec]:
+    specs = [execnet.XSpec("popen") for _ in range(3)]
+    for i, spec in enumerate(specs):
+        spec.id = f"gw{i}"
+    return specs
+
+
+class TestEnvironmentAggregator:
+    def test_reported_once(self, specs: list[execnet.XSpec]) -> None:
+        config = MockConfig()
+        aggregator = EnvironmentAggregator(cast(pytest.Config, config), specs)
+        nodes = [MockNode(spec) for spec in specs]
+        run(aggregator, nodes[0], "a.py::test_1", "passed")
+        run(aggregator, nodes[1], "a.py::test_1", "failed")
+        assert config.hook.calls == []
+        run(aggregator, nodes[2], "a.py::test_1", "passed")
+        assert config.hook.calls == [
+            ("logstart", "a.py::test_1"),
+            ("setup passed", "a.py::test_1"),
+            ("call failed", "a.py::test_1"),
+            ("teardown passed", "a.py::test_1"),
+            ("logfinish", "a.py::test_1"),
+        ]
+        assert aggregator.differing == {"a.py::test_1": bytes([1, 3, 1])}
+
+        config.hook.calls.clear()
+        for node in nodes:
+            run(aggregator, node, "a.py::test_2", "passed")
+        assert [call for call, _ in config.hook.calls][2] == "call passed"
+        assert "a.py::test_2" not in aggregator.differing
+        assert list(aggregator.summary()) == [
+            "gw0 (Python 3.12.1): 2 passed",
+            "gw1 (Python 3.12.1): 1 passed, 1 failed",
+            "gw2 (Python 3.12.1): 2 passed",
+            "",
+            "tests with different outcomes (. passed, s skipped, F failed, - not run):",
+            "gw0 gw1 gw2",
+            ".   F   .   a.py::test_1",
+        ]
+
+    def test_flush(self, specs: list[execnet.XSpec]) -> None:
+        config = MockConfig()
+        aggregator = EnvironmentAggregator(cast(pytest.Config, config), specs)
+        run(aggregator, MockNode(specs[0]), "a.py::test_1", "skipped")
+        assert config.hook.calls == []
+        aggregator.flush()
+        assert ("call skipped", "a.py::test_1") in config.hook.calls
+        assert aggregator.differing == {"a.py::test_1": bytes([2, 0, 0])}
+
+    def test_replacement(self, specs: list[execnet.XSpec]) -> None:
+        config = MockConfig()
+        aggregator = EnvironmentAggregator(cast(pytest.Config, config), specs)
+        nodes = [MockNode(spec) for spec in specs]
+        spec = copy.copy(specs[1])
+        spec.id = "gw3"
+        replacement = MockNode(spec)
+        aggregator.add_replacement(
+            cast(WorkerController, replacement), cast(WorkerController, nodes[1])
+        )
+        run(aggregator, nodes[0], "a.py::test_1", "passed")
+        run(aggregator, replacement, "a.py::test_1", "failed")
+        run(aggregator, nodes[2], "a.py::test_1", "passed")
+        assert aggregator.differing == {"a.py::test_1": bytes([1, 3, 1])}
+
+    def test_grouped_environments(self, specs: list[execnet.XSpec]) -> None:
+        specs[2] = execnet.XSpec("popen//python=python3//id=gw2")
+        config = MockConfig(dist="eachload")
+        aggregator = EnvironmentAggregator(cast(pytest.Config, config), specs)
+        assert aggregator.labels == ["popen", "popen//python=python3"]
+        nodes = [MockNode(spec) for spec in specs]
+        run(aggregator, nodes[0], "a.py::test_1", "passed")
+        run(aggregator, nodes[1], "a.py::test_2", "passed")
+        assert config.hook.calls == []
+        run(aggregator, nodes[2], "a.py::test_2", "passed")
+        assert ("call passed", "a.py::test_2") in config.hook.calls
+        run(aggregator, nodes[2], "a.py::test_1", "passed")
+        assert ("call passed", "a.py::test_1") in config.hook.calls
+        assert aggregator.counts[0][1] == 2
+
+
+def test_each_aggregate(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import os
+
+        def test_ok():
+            pass
+
+        def test_fail_on_gw1():
+            assert os.environ["PYTEST_XDIST_WORKER"] != "gw1"
+        """
+    )
+    result = pytester.runpytest("-n3", "--dist=each", "--each-aggregate", "-v")
+    result.stdout.fnmatch_lines(
+        [
+            "*xdist environments*",
+            "failed: gw1 *",
+            "passed: gw0 *, gw2 *",
+            "*= xdist environments =*",
+            "gw0 *: 2 passed",
+            "gw1 *: 1 passed, 1 failed",
+            "gw2 *: 2 passed",
+            "*= 1 failed, 1 passed in *",
+        ]
+    )
+    assert len([line for line in result.outlines if "PASSED" in line]) == 1
+
+
+def test_each_aggregate_requires_each(pytester: pytest.Pytester) -> None:
+    result = pytester.runpytest("-n2", "--each-aggregate")
+    result.stderr.fnmatch_lines(["*--each-aggregate requires --dist=each*"])
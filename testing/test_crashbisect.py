@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import pytest
+
+from xdist.crashbisect import CrashBisection
+
+
+TESTS = [f"a.py::test_{i}" for i in range(10)]
+
+
+def bisect(bisection: CrashBisection, culprit: int | None) -> list[int]:
+    """Run a bisection where the crash happens after the tests up to
+    ``culprit``, never if None; return the lengths of the prefixes run."""
+    runs = []
+    while (tests := bisection.next_tests()) is not None:
+        assert tests[-1] == bisection.crashitem
+        runs.append(len(tests) - 1)
+        prefix = tests[:-1]
+        bisection.record(culprit is not None and len(prefix) > culprit)
+    return runs
+
+
+class TestCrashBisection:
+    @pytest.mark.parametrize("culprit", range(10))
+    def test_finds_culprit(self, culprit: int) -> None:
+        bisection = CrashBisection("a.py::test_crash", TESTS)
+        runs = bisect(bisection, culprit)
+        assert len(runs) <= bisection.runs
+        assert bisection.hi == culprit + 1
+        assert bisection.result().endswith(f"the last one being {TESTS[culprit]}")
+
+    def test_crashes_alone(self) -> None:
+        bisection = CrashBisection("a.py::test_crash", TESTS)
+        assert bisect(bisection, -1) == [5, 2, 1, 0]
+        assert bisection.result() == "a.py::test_crash: crashes when run alone"
+
+    def test_not_reproduced(self) -> None:
+        bisection = CrashBisection("a.py::test_crash", TESTS)
+        # the full prefix is only run to confirm the crash at the end
+        assert bisect(bisection, None) == [5, 8, 9, 10]
+        assert not bisection.reproduced
+        assert "not reproduced" in bisection.result()
+
+    def test_no_tests_before(self) -> None:
+        bisection = CrashBisection("a.py::test_crash", [])
+        assert bisect(bisection, -1) == [0]
+        assert bisection.result() == "a.py::test_crash: crashes when run alone"
@@ -8,12 +8,16 @@ from typing import TYPE_CHECKING
 import execnet
 import pytest
 
+from xdist.crashbisect import CrashBisection
 from xdist.dsession import DSession
 from xdist.dsession import get_default_max_worker_restart
 from xdist.dsession import get_workers_status_line
 from xdist.dsession import WorkerStatus
 from xdist.report import report_collection_diff
+from xdist.scheduler import EachLoadScheduling
 from xdist.scheduler import EachScheduling
+from xdist.scheduler import LoadFileScheduling
+from xdist.scheduler import LoadGroupScheduling
 from xdist.scheduler import LoadScheduling
 from xdist.scheduler import WorkStealingScheduling
 from xdist.workermanage import WorkerController
@@ -32,12 +36,14 @@ class MockGateway(BaseOfMockGateway):
         self._count = 0
         self.id = str(self._count)
         self._count += 1
+        self.spec = execnet.XSpec("popen")
 
 
 class MockNode(BaseOfMockNode):
     def __init__(self) -> None:
         self.sent: list[int | str] = []
         self.stolen: list[int] = []
+        self.collection_requested = False
         self.gateway = MockGateway()
         self._shutdown = False
 
@@ -50,6 +56,9 @@ class MockNode(BaseOfMockNode):
     def send_steal(self, indices: Sequence[int]) -> None:
         self.stolen.extend(indices)
 
+    def send_collection_request(self) -> None:
+        self.collection_requested = True
+
     def shutdown(self) -> None:
         self._shutdown = True
 
@@ -100,6 +109,66 @@ class TestEachScheduling:
         assert not sched.nodes
 
 
+class TestEachLoadScheduling:
+    def test_schedule_per_environment(self, pytester: pytest.Pytester) -> None:
+        config = pytester.parseconfig(
+            "--tx=2*popen//python=python3.11", "--tx=popen//python=python3.12"
+        )
+        sched = EachLoadScheduling(config)
+        nodes = [MockNode() for _ in range(3)]
+        for node, python in zip(nodes, ["python3.11", "python3.11", "python3.12"]):
+            # the specs of the nodes have an id, and an execution model
+            node.gateway.spec = execnet.XSpec(
+                f"execmodel=main_thread_only//popen//python={python}//id=gw0"
+            )
+            sched.add_node(node)
+        collection = ["a.py::test_1", "a.py::test_2"]
+        sched.add_node_collection(nodes[0], collection)
+        sched.add_node_collection(nodes[2], collection)
+        assert not sched.collection_is_completed
+        sched.add_node_collection(nodes[1], collection)
+        assert bool(sched.collection_is_completed)
+        sched.schedule()
+        # the tests are split between the nodes of the first environment
+        assert nodes[0].sent == [0]
+        assert nodes[1].sent == [1]
+        assert nodes[2].sent == [0, 1]
+        assert not sched.tests_finished
+
+        sched.mark_tests_complete(nodes[2], [0, 1])
+        assert sched.tests_finished
+
+    def test_remove_node(self, pytester: pytest.Pytester) -> None:
+        config = pytester.parseconfig("--tx=2*popen", "--tx=popen//python=python3")
+        sched = EachLoadScheduling(config)
+        nodes = [MockNode() for _ in range(3)]
+        nodes[2].gateway.spec = execnet.XSpec("popen//python=python3")
+        for node in nodes:
+            sched.add_node(node)
+            sched.add_node_collection(node, [f"a.py::test_{i}" for i in range(8)])
+        sched.schedule()
+        assert nodes[0].sent == [0, 1]
+        assert nodes[1].sent == [2, 3]
+        assert nodes[2].sent == [0, 1]
+        # the tests of a crashed node are run by the nodes of its environment
+        assert sched.remove_node(nodes[0]) == "a.py::test_0"
+        assert 1 in sched.groups["popen"].pending
+        assert nodes[2].sent == [0, 1]
+
+    def test_pending_count(self, pytester: pytest.Pytester) -> None:
+        config = pytester.parseconfig("--tx=popen", "--tx=popen//python=python3")
+        sched = EachLoadScheduling(config)
+        nodes = [MockNode() for _ in range(2)]
+        nodes[1].gateway.spec = execnet.XSpec("popen//python=python3")
+        for node in nodes:
+            sched.add_node(node)
+            sched.add_node_collection(node, ["a.py::test_1", "a.py::test_2"])
+        sched.schedule()
+        assert sched.pending_count == 4
+        sched.mark_tests_complete(nodes[1], [0, 1])
+        assert sched.pending_count == 2
+
+
 class TestLoadScheduling:
     def test_schedule_load_simple(self, pytester: pytest.Pytester) -> None:
         config = pytester.parseconfig("--tx=2*popen")
@@ -127,6 +196,19 @@ class TestLoadScheduling:
         sched.mark_test_complete(node1, sent10)
         assert sched.tests_finished
 
+    def test_pending_count(self, pytester: pytest.Pytester) -> None:
+        config = pytester.parseconfig("--tx=popen")
+        sched = LoadScheduling(config)
+        node = MockNode()
+        sched.add_node(node)
+        sched.add_node_collection(node, [f"a.py::test_{i}" for i in range(10)])
+        sched.schedule()
+        # sent to the node or not
+        assert 0 < len(node.sent) < 10
+        assert sched.pending_count == 10
+        sched.mark_tests_complete(node, [0, 1])
+        assert sched.pending_count == 8
+
     def test_schedule_batch_size(self, pytester: pytest.Pytester) -> None:
         config = pytester.parseconfig("--tx=2*popen")
         sched = LoadScheduling(config)
@@ -154,6 +236,25 @@ class TestLoadScheduling:
         assert node1.sent == [0, 1, 4, 5]
         assert not sched.pending
 
+    def test_mark_tests_complete(
+        self, pytester: pytest.Pytester, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        config = pytester.parseconfig("--tx=2*popen")
+        sched = LoadScheduling(config)
+        node1, node2 = MockNode(), MockNode()
+        sched.add_node(node1)
+        sched.add_node(node2)
+        col = ["xyz"] * 40
+        sched.add_node_collection(node1, col)
+        sched.add_node_collection(node2, col)
+        sched.schedule()
+        assert sched.node2pending[node1] == list(range(5))
+        chunks: list[Sequence[int]] = []
+        monkeypatch.setattr(node1, "send_runtest_some", chunks.append)
+        sched.mark_tests_complete(node1, list(range(4)))
+        assert sched.node2pending[node1] == [4, *chunks[0]]
+        assert len(chunks) == 1
+
     def test_schedule_maxchunk_none(self, pytester: pytest.Pytester) -> None:
         config = pytester.parseconfig("--tx=2*popen")
         sched = LoadScheduling(config)
@@ -467,6 +568,506 @@ class TestWorkStealingScheduling:
         assert "Different tests were collected between" in rep.longrepr
 
 
+class TestLoadScopeScheduling:
+    def test_reorder_by_cost(self, pytester: pytest.Pytester) -> None:
+        config = pytester.parseconfig("--tx=1*popen")
+
+        class CostPlugin:
+            @pytest.hookimpl
+            def pytest_xdist_scope_cost(self, scope: str) -> float | None:
+                return 10.0 if scope == "b.py" else None
+
+        config.pluginmanager.register(CostPlugin())
+        sched = LoadFileScheduling(config)
+        node = MockNode()
+        sched.add_node(node)
+        collection = ["a.py::test_1", "b.py::test_1", "c.py::test_1", "c.py::test_2"]
+        sched.add_node_collection(node, collection)
+        sched.schedule()
+        assert node.sent == [1, 2, 3]
+        assert list(sched.workqueue) == ["a.py"]
+
+    def test_pending_count(self, pytester: pytest.Pytester) -> None:
+        config = pytester.parseconfig("--tx=popen", "--no-loadscope-reorder")
+        sched = LoadFileScheduling(config)
+        node = MockNode()
+        sched.add_node(node)
+        collection = ["a.py::test_1", "a.py::test_2", "b.py::test", "c.py::test"]
+        sched.add_node_collection(node, collection)
+        sched.schedule()
+        assert list(sched.workqueue) == ["c.py"]
+        assert sched.pending_count == 4
+        sched.mark_tests_complete(node, [0])
+        assert sched.pending_count == 3
+
+    def test_crashed_test_not_rescheduled(self, pytester: pytest.Pytester) -> None:
+        config = pytester.parseconfig(
+            "--tx=2*popen", "--loadscope-prefetch=2", "--no-loadscope-reorder"
+        )
+        sched = LoadFileScheduling(config)
+        node1, node2 = MockNode(), MockNode()
+        sched.add_node(node1)
+        sched.add_node(node2)
+        collection = ["a.py::test_1", "a.py::test_2", "b.py::test", "c.py::test"]
+        collection += ["d.py::test"]
+        sched.add_node_collection(node1, collection)
+        sched.add_node_collection(node2, collection)
+        sched.schedule()
+        assert node1.sent == [0, 1, 3]
+        sched.mark_tests_complete(node1, [0])
+        assert sched.remove_node(node1) == "a.py::test_2"
+        # the crashed test is not queued again, the other unit of node1 is
+        # sent to node2
+        assert not sched.workqueue
+        assert node2.sent == [2, 4, 3]
+
+    def test_split_large_scopes(self, pytester: pytest.Pytester) -> None:
+        config = pytester.parseconfig("--tx=2*popen", "--loadscope-split")
+        sched = LoadFileScheduling(config)
+        node1, node2 = MockNode(), MockNode()
+        sched.add_node(node1)
+        sched.add_node(node2)
+        collection = [f"a.py::test_{i}" for i in range(6)] + [
+            "b.py::test",
+            "c.py::test",
+        ]
+        sched.add_node_collection(node1, collection)
+        sched.add_node_collection(node2, collection)
+        sched.schedule()
+        assert node1.sent == [0, 1, 2]
+        assert node2.sent == [3, 4, 5]
+        assert list(sched.workqueue) == ["b.py", "c.py"]
+
+        sched.mark_tests_complete(node1, [0, 1, 2])
+        assert node1.sent == [0, 1, 2, 6]
+        assert sched.assigned_work[node1]["a.py[1/2]"] == dict.fromkeys(
+            collection[:3], True
+        )
+
+    def test_split_large_scopes_no_split(self, pytester: pytest.Pytester) -> None:
+        config = pytester.parseconfig("--tx=2*popen", "--loadscope-split")
+        sched = LoadFileScheduling(config)
+        node1, node2 = MockNode(), MockNode()
+        sched.add_node(node1)
+        sched.add_node(node2)
+        collection = [f"a.py::test_{i}" for i in range(6)] + [
+            "b.py::test",
+            "c.py::test",
+        ]
+        sched.add_unsplittable(["a.py::test_5"])
+        sched.add_node_collection(node1, collection)
+        sched.add_node_collection(node2, collection)
+        sched.schedule()
+        assert node1.sent == [0, 1, 2, 3, 4, 5]
+        assert node2.sent == [6, 7]
+
+    def test_split_large_scopes_loadgroup(self, pytester: pytest.Pytester) -> None:
+        config = pytester.parseconfig(
+            "--tx=2*popen", "--dist=loadgroup", "--loadscope-split"
+        )
+        sched = LoadGroupScheduling(config)
+        node1, node2 = MockNode(), MockNode()
+        sched.add_node(node1)
+        sched.add_node(node2)
+        collection = [f"a.py::test_{i}@g" for i in range(4)] + ["b.py::test"]
+        sched.add_node_collection(node1, collection)
+        sched.add_node_collection(node2, collection)
+        sched.schedule()
+        # the tests of a group run in the same process
+        assert node1.sent == [0, 1, 2, 3]
+        assert node2.sent == [4]
+
+    def test_prefetch_units(self, pytester: pytest.Pytester) -> None:
+        config = pytester.parseconfig(
+            "--tx=2*popen", "--loadscope-prefetch=2", "--no-loadscope-reorder"
+        )
+        sched = LoadFileScheduling(config)
+        node1, node2 = MockNode(), MockNode()
+        sched.add_node(node1)
+        sched.add_node(node2)
+        collection = [f"{name}.py::test" for name in "abcdefgh"]
+        sched.add_node_collection(node1, collection)
+        sched.add_node_collection(node2, collection)
+        sched.schedule()
+        # the running unit and two queued ones
+        assert node1.sent == [0, 2, 4]
+        assert node2.sent == [1, 3, 5]
+        assert list(sched.workqueue) == ["g.py", "h.py"]
+
+        sched.mark_test_complete(node1, 0)
+        assert node1.sent == [0, 2, 4, 6]
+        assert node2.sent == [1, 3, 5]
+
+    def test_prefetch_seconds(self, pytester: pytest.Pytester) -> None:
+        config = pytester.parseconfig(
+            "--tx=1*popen", "--loadscope-prefetch=3s", "--no-loadscope-reorder"
+        )
+
+        class CostPlugin:
+            @pytest.hookimpl
+            def pytest_xdist_scope_cost(self, scope: str) -> float | None:
+                return 10.0 if scope == "a.py" else 1.0
+
+        config.pluginmanager.register(CostPlugin())
+        sched = LoadFileScheduling(config)
+        node = MockNode()
+        sched.add_node(node)
+        collection = ["a.py::test_1", "a.py::test_2"] + [
+            f"{name}.py::test" for name in "bcde"
+        ]
+        sched.add_node_collection(node, collection)
+        sched.schedule()
+        assert node.sent == [0, 1]
+
+        sched.mark_test_complete(node, 0)
+        assert node.sent == [0, 1]
+        sched.mark_test_complete(node, 1)
+        assert node.sent == [0, 1, 2, 3, 4]
+        assert list(sched.workqueue) == ["e.py"]
+
+    def test_steal_queued_units(self, pytester: pytest.Pytester) -> None:
+        config = pytester.parseconfig(
+            "--tx=2*popen", "--loadscope-prefetch=2", "--no-loadscope-reorder"
+        )
+        sched = LoadFileScheduling(config)
+        node1, node2 = MockNode(), MockNode()
+        sched.add_node(node1)
+        sched.add_node(node2)
+        collection = ["a.py::test_1", "a.py::test_2", "a.py::test_3"] + [
+            f"{name}.py::test" for name in "bcde"
+        ]
+        sched.add_node_collection(node1, collection)
+        sched.add_node_collection(node2, collection)
+        sched.schedule()
+        assert node1.sent == [0, 1, 2, 4, 6]
+        assert node2.sent == [3, 5]
+        # node2 still has a unit queued
+        assert node1.stolen == []
+
+        # node2 runs its last unit, the last unit queued on node1 is requested
+        sched.mark_tests_complete(node2, [3])
+        assert node1.stolen == [6]
+        assert sched.steal_requested_from_node is node1
+        assert not sched.tests_finished
+
+        sched.remove_pending_tests_from_node(node1, [6])
+        assert node2.sent == [3, 5, 6]
+        assert "e.py" not in sched.assigned_work[node1]
+        assert not sched.workqueue
+
+        sched.mark_tests_complete(node2, [5])
+        assert node1.stolen == [6, 4]
+        sched.remove_pending_tests_from_node(node1, [4])
+        assert node2.sent == [3, 5, 6, 4]
+
+        # the stolen units are not stolen back by node1
+        sched.mark_tests_complete(node1, [0, 1, 2])
+        assert node1.stolen == [6, 4]
+        assert node1.shutting_down
+
+        # nothing left to steal
+        sched.mark_tests_complete(node2, [6, 4])
+        assert node2.shutting_down
+
+    def test_steal_refused(self, pytester: pytest.Pytester) -> None:
+        config = pytester.parseconfig("--tx=2*popen", "--loadscope-prefetch=2")
+        sched = LoadFileScheduling(config)
+        node1, node2 = MockNode(), MockNode()
+        sched.add_node(node1)
+        sched.add_node(node2)
+        collection = ["a.py::test_1", "a.py::test_2", "a.py::test_3", "b.py::test"]
+        collection += ["c.py::test"]
+        sched.add_node_collection(node1, collection)
+        sched.add_node_collection(node2, collection)
+        sched.schedule()
+        assert node1.sent == [0, 1, 2, 4]
+        assert node1.stolen == [4]
+
+        # node1 started the requested tests already
+        sched.mark_tests_complete(node1, [0, 1, 2])
+        sched.remove_pending_tests_from_node(node1, [])
+        assert node1.sent == [0, 1, 2, 4]
+        assert node2.sent == [3]
+        assert node1.stolen == [4]
+        assert node1.shutting_down
+        assert node2.shutting_down
+
+    def test_steal_refused_retried_after_completion(
+        self, pytester: pytest.Pytester
+    ) -> None:
+        config = pytester.parseconfig(
+            "--tx=2*popen", "--loadscope-prefetch=2", "--no-loadscope-reorder"
+        )
+        sched = LoadFileScheduling(config)
+        node1, node2 = MockNode(), MockNode()
+        sched.add_node(node1)
+        sched.add_node(node2)
+        collection = ["a.py::test_1", "a.py::test_2", "a.py::test_3"] + [
+            f"{name}.py::test" for name in "bcde"
+        ]
+        sched.add_node_collection(node1, collection)
+        sched.add_node_collection(node2, collection)
+        sched.schedule()
+        sched.mark_tests_complete(node2, [3])
+        assert node1.stolen == [6]
+
+        # node1 took the first test of the requested unit as its next item
+        sched.remove_pending_tests_from_node(node1, [])
+        assert bool(sched.steal_refused_by is node1)
+        # the same request is not sent again right away
+        assert node1.stolen == [6]
+        assert bool(sched.steal_requested_from_node is None)
+        assert not node2.shutting_down
+
+        # only once node1 completed a test
+        sched.mark_tests_complete(node1, [0])
+        assert sched.steal_refused_by is None
+        assert node1.stolen == [6, 6]
+        assert sched.steal_requested_from_node is node1
+
+
+class TestLazyCollection:
+    FILES = ["test_a.py", "test_b.py", "test_c.py"]
+    IDS = {
+        "test_a.py": ["test_a.py::test_1", "test_a.py::test_2"],
+        "test_b.py": ["test_b.py::test_1", "test_b.py::test_2"],
+        "test_c.py": ["test_c.py::test_1", "test_c.py::test_2"],
+    }
+
+    @pytest.fixture
+    def sched(self, pytester: pytest.Pytester) -> LoadFileScheduling:
+        pytester.makepyfile(test_a="#" * 100, test_b="#" * 10, test_c="#" * 80)
+        config = pytester.parseconfig(
+            "--tx=2*popen", "--dist=loadfile", "--lazy-collection"
+        )
+        return LoadFileScheduling(config)
+
+    def collect(self, sched: LoadFileScheduling, node: MockNode) -> list[str]:
+        files = sched.assign_files(node, self.FILES)
+        collection = [nodeid for file in files for nodeid in self.IDS[file]]
+        sched.add_node_collection(node, collection)
+        return collection
+
+    def test_assign_files(self, sched: LoadFileScheduling) -> None:
+        node1, node2, node3 = MockNode(), MockNode(), MockNode()
+        # balanced by size, keeping the order of the files
+        assert sched.assign_files(node1, self.FILES) == ["test_a.py"]
+        assert sched.assign_files(node2, self.FILES) == ["test_b.py", "test_c.py"]
+        assert sched.assign_files(node3, self.FILES) == []
+
+    def test_schedule_own_collection(self, sched: LoadFileScheduling) -> None:
+        node1, node2 = MockNode(), MockNode()
+        sched.add_node(node1)
+        sched.add_node(node2)
+        collection1 = self.collect(sched, node1)
+        collection2 = self.collect(sched, node2)
+        assert sched.collection_is_completed
+        sched.schedule()
+        assert sched.collection == collection1 + collection2
+        assert collection1 == self.IDS["test_a.py"]
+        assert node1.sent == [0, 1]
+        assert collection2 == self.IDS["test_b.py"] + self.IDS["test_c.py"]
+        assert node2.sent == [0, 1, 2, 3]
+        assert not sched.workqueue
+
+        # no other work for node1 once it is done
+        sched.mark_tests_complete(node1, [0, 1])
+        assert node1.shutting_down
+
+    def test_crashed_node_replaced(self, sched: LoadFileScheduling) -> None:
+        node1, node2 = MockNode(), MockNode()
+        sched.add_node(node1)
+        sched.add_node(node2)
+        self.collect(sched, node1)
+        collection2 = self.collect(sched, node2)
+        sched.schedule()
+        sched.mark_test_complete(node2, 0)
+        assert sched.remove_node(node2) == "test_b.py::test_2"
+        assert list(sched.workqueue) == ["test_c.py"]
+        # node1 did not collect the remaining tests
+        sched.mark_tests_complete(node1, [0, 1])
+        assert node1.shutting_down
+
+        node3 = MockNode()
+        sched.add_node(node3)
+        assert self.collect(sched, node3) == collection2
+        sched.schedule()
+        assert node3.sent == [2, 3]
+
+    def test_inconsistent_scopes(self, sched: LoadFileScheduling) -> None:
+        node1, node2 = MockNode(), MockNode()
+        sched.add_node(node1)
+        sched.add_node(node2)
+        sched.assign_files(node1, self.FILES)
+        sched.assign_files(node2, self.FILES)
+        sched.add_node_collection(node1, self.IDS["test_a.py"])
+        sched.add_node_collection(node2, ["test_a.py::test_1"])
+        sched.schedule()
+        assert sched.collection is None
+        assert not node1.sent
+        assert not node2.sent
+
+
+class TestLoopOnce:
+    def test_processes_queued_events_as_a_batch(
+        self, pytester: pytest.Pytester
+    ) -> None:
+        config = pytester.parseconfig("--tx=popen")
+        dsession = DSession(config)
+        node = MockNode()
+        sched = LoadScheduling(config)
+        sched.add_node(node)
+        sched.add_node_collection(node, ["a.py::test_1", "a.py::test_2"])
+        sched.schedule()
+        assert node.sent == [0, 1]
+        dsession.sched = sched
+        dsession._active_nodes.add(node)
+        for item_index in (0, 1):
+            dsession.queue.put(
+                (
+                    "runtest_protocol_complete",
+                    {"node": node, "item_index": item_index, "duration": 0},
+                )
+            )
+        dsession.loop_once()
+        assert dsession.queue.empty()
+        assert sched.tests_finished
+        assert node.shutting_down
+
+    def test_batches_completions_per_node(
+        self, pytester: pytest.Pytester, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        config = pytester.parseconfig("--tx=popen")
+        dsession = DSession(config)
+        node1, node2 = MockNode(), MockNode()
+        sched = LoadScheduling(config)
+        calls: list[tuple[WorkerController, Sequence[int] | int]] = []
+        monkeypatch.setattr(
+            sched,
+            "mark_tests_complete",
+            lambda node, item_indices, duration: calls.append((node, item_indices)),
+        )
+        monkeypatch.setattr(
+            sched,
+            "mark_test_complete",
+            lambda node, item_index, duration: calls.append((node, item_index)),
+        )
+        dsession.sched = sched
+        dsession._active_nodes.update((node1, node2))
+        for node, item_index in [(node1, 0), (node2, 5), (node1, 1), (node1, 2)]:
+            dsession.queue.put(
+                (
+                    "runtest_protocol_complete",
+                    {"node": node, "item_index": item_index, "duration": 0},
+                )
+            )
+            dsession.queue.put(
+                ("logfinish", {"node": node, "nodeid": "a.py::test", "location": None})
+            )
+        dsession.loop_once()
+        assert calls == [(node1, [0, 1, 2]), (node2, 5)]
+
+    def test_stop_before_completions_schedule(self, pytester: pytest.Pytester) -> None:
+        config = pytester.parseconfig("--tx=2*popen", "-x")
+        dsession = DSession(config)
+        node1, node2 = MockNode(), MockNode()
+        sched = LoadScheduling(config)
+        for node in (node1, node2):
+            sched.add_node(node)
+            sched.add_node_collection(node, [f"a.py::test_{i}" for i in range(40)])
+        sched.schedule()
+        sent = list(node2.sent)
+        dsession.sched = sched
+        dsession._active_nodes.update((node1, node2))
+        rep = pytest.TestReport(
+            nodeid="a.py::test_0",
+            location=("a.py", 1, "test_0"),
+            keywords={},
+            outcome="failed",
+            longrepr="assert 0",
+            when="call",
+        )
+        dsession.queue.put(("testreport", {"node": node1, "rep": rep}))
+        for item_index in sent:
+            dsession.queue.put(
+                (
+                    "runtest_protocol_complete",
+                    {"node": node2, "item_index": item_index, "duration": 0},
+                )
+            )
+        dsession.loop_once()
+        assert dsession.shouldstop
+        assert node2.shutting_down
+        # no more tests were sent after the failure
+        assert node2.sent == sent
+
+    def test_no_active_nodes(self, pytester: pytest.Pytester) -> None:
+        config = pytester.parseconfig("--tx=popen")
+        dsession = DSession(config)
+        dsession.sched = LoadScheduling(config)
+        with pytest.raises(RuntimeError, match="no active workers"):
+            dsession.loop_once()
+        assert dsession.shuttingdown
+
+
+class TestCollectionDigest:
+    @pytest.fixture
+    def dsession(self, pytester: pytest.Pytester) -> DSession:
+        config = pytester.parseconfig("--tx=3*popen")
+        dsession = DSession(config)
+        dsession.sched = LoadScheduling(config)
+        dsession._session = pytest.Session.from_config(config)
+        return dsession
+
+    def test_ids_requested_once_per_digest(self, dsession: DSession) -> None:
+        sched = dsession.sched
+        assert isinstance(sched, LoadScheduling)
+        nodes = [MockNode() for _ in range(3)]
+        for node in nodes:
+            sched.add_node(node)
+        ids = ["a.py::test_1", "a.py::test_2"]
+
+        dsession.worker_collectionfinish(nodes[0], digest="abc")
+        dsession.worker_collectionfinish(nodes[1], digest="abc")
+        assert [node.collection_requested for node in nodes] == [True, False, False]
+        assert sched.node2collection == {}
+
+        dsession.worker_collectionfinish(nodes[0], ids=ids, digest="abc")
+        dsession.worker_collectionfinish(nodes[2], digest="abc")
+        assert not nodes[2].collection_requested
+        assert sched.collection_is_completed
+        assert sched.node2collection == dict.fromkeys(nodes, ids)
+
+    def test_requested_node_dies(
+        self, dsession: DSession, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        sched = dsession.sched
+        assert isinstance(sched, LoadScheduling)
+        monkeypatch.setattr(dsession, "_clone_node", lambda node: None)
+        nodes = [MockNode() for _ in range(2)]
+        for node in nodes:
+            sched.add_node(node)
+            dsession._active_nodes.add(node)
+            dsession.worker_collectionfinish(node, digest="abc")
+        assert [node.collection_requested for node in nodes] == [True, False]
+
+        dsession.worker_errordown(nodes[0], "crashed")
+        assert nodes[1].collection_requested
+        dsession.worker_collectionfinish(nodes[1], ids=["a.py::test_1"], digest="abc")
+        assert sched.node2collection == {nodes[1]: ["a.py::test_1"]}
+
+    def test_bisection_empty_collection(self, dsession: DSession) -> None:
+        node = MockNode()
+        bisection = CrashBisection("a.py::test_1", [])
+        bisection.next_tests()
+        dsession._bisect_nodes[node] = bisection
+        # an empty collection is sent, not requested again
+        dsession._bisection_event("collectionfinish", node, ids=[], digest="abc")
+        assert not node.collection_requested
+        assert node.sent == []
+        assert node.shutting_down
+
+
 class TestDistReporter:
     @pytest.mark.xfail
     def test_rsync_printing(self, pytester: pytest.Pytester, linecomp: Any) -> None:
@@ -551,6 +1152,50 @@ def test_report_collection_diff_different() -> None:
     assert msg == error_message
 
 
+def test_report_collection_diff_large() -> None:
+    """Large collections are compared without difflib."""
+    from_collection = [f"test.py::test[{i}]" for i in range(200_000)]
+    to_collection = list(from_collection)
+    to_collection[1000] = "test.py::test[flaky]"
+    msg = report_collection_diff(from_collection, to_collection, "1", "2")
+    assert msg is not None
+    assert msg.splitlines()[1:5] == [
+        "--- 1",
+        "+++ 2",
+        "-test.py::test[1000]",
+        "+test.py::test[flaky]",
+    ]
+
+    to_collection = [f"other.py::test[{i}]" for i in range(200_000)]
+    msg = report_collection_diff(from_collection, to_collection, "1", "2")
+    assert msg is not None
+    assert "-test.py::test[0]" in msg
+    assert "... and 399950 more" in msg
+    assert "other.py" not in msg
+
+
+def test_report_collection_diff_order() -> None:
+    from_collection = [f"test.py::test[{i}]" for i in range(2000)]
+    to_collection = list(from_collection)
+    to_collection[5], to_collection[6] = to_collection[6], to_collection[5]
+    msg = report_collection_diff(from_collection, to_collection, "1", "2")
+    assert msg is not None
+    assert msg.splitlines()[1:6] == [
+        "--- 1",
+        "+++ 2",
+        "@@ first difference at position 6 @@",
+        "-test.py::test[5]",
+        "+test.py::test[6]",
+    ]
+
+    msg = report_collection_diff(from_collection, from_collection * 2, "1", "2")
+    assert msg is not None
+    assert msg.splitlines()[3:5] == [
+        "@@ first difference at position 2001 @@",
+        "+test.py::test[0]",
+    ]
+
+
 @pytest.mark.xfail(reason="duplicate test ids not supported yet")
 def test_pytest_issue419(pytester: pytest.Pytester) -> None:
     pytester.makepyfile(
@@ -632,3 +1277,9 @@ def test_get_workers_status_line(
     status_and_items: Sequence[tuple[WorkerStatus, int]], expected: str
 ) -> None:
     assert get_workers_status_line(status_and_items) == expected
+
+
+def test_get_workers_status_line_partitioned() -> None:
+    status_and_items = [(WorkerStatus.CollectionDone, 2)] * 3
+    line = get_workers_status_line(status_and_items, partitioned=True)
+    assert line == "3 workers [6 items]"
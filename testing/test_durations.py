@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import pytest
+
+from xdist.durations import DurationCache
+
+
+class TestDurationCache:
+    def test_estimate(self, pytester: pytest.Pytester) -> None:
+        config = pytester.parseconfigure()
+        cache = DurationCache(config)
+        assert cache.estimate(["a.py::test_1"]) is None
+
+        cache.add("a.py::test_1", 1.0)
+        cache.add("a.py::test_1", 2.0)
+        cache.add("a.py::test_2", 1.0)
+        cache.save()
+
+        cache = DurationCache(config)
+        assert cache.estimate(["a.py::test_1"]) == 3.0
+        # unknown tests take the mean duration
+        assert cache.estimate(["a.py::test_1", "a.py::test_3"]) == 5.0
+
+    def test_save_keeps_durations_of_tests_not_run(
+        self, pytester: pytest.Pytester
+    ) -> None:
+        config = pytester.parseconfigure()
+        cache = DurationCache(config)
+        cache.add("a.py::test_1", 1.0)
+        cache.add("a.py::test_2", 1.0)
+        cache.save()
+
+        cache = DurationCache(config)
+        cache.add("a.py::test_1", 3.0)
+        cache.save()
+        assert DurationCache(config).durations == {
+            "a.py::test_1": 3.0,
+            "a.py::test_2": 1.0,
+        }
+
+
+def test_duration_cache(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        test_fast="""
+        import pytest
+
+        @pytest.mark.parametrize("i", range(5))
+        def test_fast(i):
+            pass
+        """,
+        test_slow="""
+        import time
+
+        def test_slow():
+            time.sleep(0.2)
+        """,
+    )
+    result = pytester.runpytest("-n1", "--dist=loadfile", "--duration-cache", "-v")
+    assert result.ret == 0
+    # ordered by number of tests when no durations are known
+    result.stdout.fnmatch_lines(
+        ["*test_fast.py::test_fast*", "*test_slow.py::test_slow*"]
+    )
+
+    result = pytester.runpytest("-n1", "--dist=loadfile", "--duration-cache", "-v")
+    assert result.ret == 0
+    result.stdout.fnmatch_lines(
+        ["*test_slow.py::test_slow*", "*test_fast.py::test_fast*"]
+    )
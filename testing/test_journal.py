@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import sys
+
+import pytest
+
+from xdist.journal import RunJournal
+
+
+INTERRUPTING_CONFTEST = """
+    import os
+
+    controller = False
+
+    def pytest_configure(config):
+        global controller
+        controller = not hasattr(config, "workerinput")
+
+    def pytest_runtest_logreport(report):
+        # interrupt the first run once test_ok[5] finished
+        if (
+            os.path.exists("interrupt")
+            and controller
+            and report.when == "teardown"
+            and report.nodeid.endswith("[5]")
+        ):
+            raise KeyboardInterrupt
+"""
+
+
+class TestRunJournal:
+    def test_completed(self, pytester: pytest.Pytester) -> None:
+        config = pytester.parseconfigure()
+        journal = RunJournal(config)
+        assert journal.completed == {}
+        journal.add("a.py::test_1", [{"nodeid": "a.py::test_1", "when": "call"}])
+        journal.add("a.py::test_2", [])
+        journal.close(finished=False)
+
+        journal = RunJournal(config)
+        assert journal.completed == {
+            "a.py::test_1": [{"nodeid": "a.py::test_1", "when": "call"}],
+            "a.py::test_2": [],
+        }
+        # the tests of the interrupted run are kept
+        journal.add("a.py::test_3", [])
+        journal.close(finished=False)
+        assert list(RunJournal(config).completed) == [
+            "a.py::test_1",
+            "a.py::test_2",
+            "a.py::test_3",
+        ]
+
+    def test_removed_when_finished(self, pytester: pytest.Pytester) -> None:
+        config = pytester.parseconfigure()
+        journal = RunJournal(config)
+        journal.add("a.py::test_1", [])
+        journal.close(finished=True)
+        assert not journal.path.exists()
+        assert RunJournal(config).completed == {}
+
+    def test_truncated_entry(self, pytester: pytest.Pytester) -> None:
+        config = pytester.parseconfigure()
+        journal = RunJournal(config)
+        journal.add("a.py::test_1", [])
+        journal.close(finished=False)
+        with journal.path.open("a") as f:
+            f.write('{"nodeid": "a.py::test_2", "rep')
+        assert list(RunJournal(config).completed) == ["a.py::test_1"]
+
+    def test_journal_per_arguments(self, pytester: pytest.Pytester) -> None:
+        config = pytester.parseconfigure()
+        journal = RunJournal(config)
+        journal.add("a.py::test_1", [])
+        journal.close(finished=False)
+        config = pytester.parseconfigure("-k", "test_2")
+        assert RunJournal(config).completed == {}
+        # the journal of the other arguments is kept
+        config = pytester.parseconfigure()
+        assert list(RunJournal(config).completed) == ["a.py::test_1"]
+
+
+def run_resume(pytester: pytest.Pytester, *args: str) -> pytest.RunResult:
+    """Run pytest with --xdist-resume in a subprocess, as the runs are
+    interrupted, without the varying --basetemp of runpytest_subprocess (the
+    journal is kept per arguments)."""
+    return pytester.run(sys.executable, "-m", "pytest", "-n1", "--xdist-resume", *args)
+
+
+def test_resume(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import pytest
+
+        @pytest.mark.parametrize("i", range(10))
+        def test_ok(i):
+            assert i != 2
+        """
+    )
+    pytester.makeconftest(INTERRUPTING_CONFTEST)
+    pytester.path.joinpath("interrupt").touch()
+    result = run_resume(pytester, "-v")
+    assert result.ret == pytest.ExitCode.INTERRUPTED
+
+    pytester.path.joinpath("interrupt").unlink()
+    result = run_resume(pytester, "-v")
+    result.stdout.fnmatch_lines(
+        [
+            "resuming an interrupted run, which completed 5 tests",
+            "1 worker [[]5 items[]]",
+            "*= 1 failed, 9 passed in *",
+        ]
+    )
+    # the tests completed by the first run were not run again
+    ran = [line for line in result.outlines if line.startswith("[gw0]")]
+    assert len(ran) == 5
+
+    # the journal was removed, the next run starts over
+    result = run_resume(pytester, "-v")
+    result.stdout.no_fnmatch_line("resuming*")
+    result.stdout.fnmatch_lines(["*= 1 failed, 9 passed in *"])
+
+
+def test_resume_other_selection(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import pytest
+
+        @pytest.mark.parametrize("i", range(10))
+        def test_ok(i):
+            pass
+        """
+    )
+    pytester.makeconftest(INTERRUPTING_CONFTEST)
+    pytester.path.joinpath("interrupt").touch()
+    result = run_resume(pytester, "-rA")
+    assert result.ret == pytest.ExitCode.INTERRUPTED
+    pytester.path.joinpath("interrupt").unlink()
+
+    # other arguments do not resume the interrupted run
+    result = run_resume(pytester, "-rA", "-k", "not 7")
+    result.stdout.no_fnmatch_line("resuming*")
+    result.stdout.fnmatch_lines(["*= 9 passed in *"])
+
+    # the tests of the interrupted run which are not collected any more are
+    # neither reported nor counted
+    pytester.makepyfile(
+        """
+        import pytest
+
+        @pytest.mark.parametrize("i", range(2, 8))
+        def test_ok(i):
+            pass
+        """
+    )
+    result = run_resume(pytester, "-rA")
+    result.stdout.fnmatch_lines(
+        [
+            "resuming an interrupted run, which completed 5 tests",
+            "1 worker [[]3 items[]]",
+            "*= 6 passed in *",
+        ]
+    )
+    result.stdout.no_fnmatch_line("*test_ok[[]0[]]*")
+
+
+def test_maxfail_removes_journal(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import pytest
+
+        @pytest.mark.parametrize("i", range(10))
+        def test_ok(i):
+            assert i != 2
+        """
+    )
+    result = run_resume(pytester, "-x")
+    result.stdout.fnmatch_lines(["*stopping after 1 failures*"])
+    # the run stopped by -x ended normally, and is not resumed
+    result = run_resume(pytester, "-x")
+    result.stdout.no_fnmatch_line("resuming*")
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from typing import cast
+
+import pytest
+
+from xdist.durations import DurationCache
+from xdist.livestatus import format_duration
+from xdist.livestatus import LiveStatus
+
+
+class MockDurationCache:
+    def __init__(self, durations: dict[str, float]) -> None:
+        self.durations = durations
+
+    def estimate(self, nodeids: list[str]) -> float:
+        return sum(self.durations.get(nodeid, 1.0) for nodeid in nodeids)
+
+
+def test_format_duration() -> None:
+    assert format_duration(4.4) == "4s"
+    assert format_duration(185) == "3m05s"
+    assert format_duration(3720) == "1h02m"
+
+
+class TestLiveStatus:
+    def test_line(self) -> None:
+        status = LiveStatus(1.0, None)
+        status.start(["a", "b", "c", "d"])
+        start = status.started = status.last
+        status.test_started("gw0")
+        status.test_finished("gw0", "a")
+        status.test_started("gw0")
+        status.test_finished("gw0", "b")
+        status.test_started("gw1")
+        assert not status.due(start + 0.5)
+        assert status.due(start + 2)
+        assert status.eta(2, start + 4) == 4.0
+        assert status.line(["gw0", "gw1"], start + 2) == (
+            "[xdist] 2 workers, 1 idle, 2 tests pending, ETA 2s: gw0 1.0/s, gw1 0.0/s"
+        )
+        # a new interval starts
+        assert status.line(["gw0", "gw1"], start + 4).endswith("gw0 0.0/s, gw1 0.0/s")
+
+    def test_eta_from_durations(self) -> None:
+        durations = MockDurationCache({"a": 10.0, "b": 30.0})
+        status = LiveStatus(1.0, cast(DurationCache, durations))
+        status.start(["a", "b", "c"], runs=2)
+        assert status.total == 6
+        assert status.remaining_cost == 82.0
+        status.test_finished("gw0", "b")
+        assert status.eta(2, status.last) == 26.0
+        assert "ETA 26s" in status.line(["gw0", "gw1"], status.last + 1)
+
+    def test_pending_given(self) -> None:
+        status = LiveStatus(1.0, None)
+        status.start(["a", "b", "c", "d"])
+        start = status.started = status.last
+        status.test_finished("gw0", "a")
+        # e.g. a crashed test run again
+        assert status.line(["gw0"], start + 2, pending=4) == (
+            "[xdist] 1 worker, 1 idle, 4 tests pending, ETA 8s: gw0 0.5/s"
+        )
+
+    def test_no_eta(self) -> None:
+        status = LiveStatus(1.0, None)
+        status.start(["a"])
+        assert status.eta(1, status.last + 1) is None
+        assert status.line(["gw0"], status.last + 1) == (
+            "[xdist] 1 worker, 1 idle, 1 tests pending: gw0 0.0/s"
+        )
+
+
+def test_live_status(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import time
+
+        import pytest
+
+        @pytest.mark.parametrize("i", range(6))
+        def test_slow(i):
+            time.sleep(0.2)
+        """
+    )
+    result = pytester.runpytest("-n2", "--xdist-live-status=0.1")
+    result.stdout.fnmatch_lines(
+        [
+            "[[]xdist[]] 2 workers, * tests pending*: gw0 *.*/s, gw1 *.*/s",
+            "*= 6 passed in *",
+        ]
+    )
+    assert result.ret == 0
+
+
+def test_live_status_negative(pytester: pytest.Pytester) -> None:
+    result = pytester.runpytest("-n2", "--xdist-live-status=-1")
+    result.stderr.fnmatch_lines(["*--xdist-live-status must be a non-negative*"])
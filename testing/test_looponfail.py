@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 import pathlib
 from pathlib import Path
 import shutil
@@ -9,6 +10,7 @@ import unittest.mock
 
 import pytest
 
+from xdist.looponfail import FileTracer
 from xdist.looponfail import RemoteControl
 from xdist.looponfail import StatRecorder
 
@@ -54,6 +56,27 @@ class TestStatRecorder:
         changed = sd.check()
         assert changed
 
+    def test_changedfiles(self, tmp_path: Path) -> None:
+        tmp = tmp_path
+        hello = tmp / "hello.py"
+        hello.touch()
+        sd = StatRecorder([tmp])
+        assert not sd.check()
+        assert sd.changedfiles == []
+
+        hello.write_text("world")
+        new = tmp / "new.py"
+        new.touch()
+        assert sd.check()
+        assert sorted(sd.changedfiles) == [hello, new]
+
+        new.unlink()
+        assert sd.check()
+        assert sd.changedfiles == [new]
+
+        assert not sd.check()
+        assert sd.changedfiles == []
+
     def test_dirchange(self, tmp_path: Path) -> None:
         tmp = tmp_path
         tmp.joinpath("dir").mkdir()
@@ -73,17 +96,89 @@ class TestStatRecorder:
         assert changed
 
         p.unlink()
-        # make check()'s visit() call return our just removed
+        # make check()'s listdir() call return our just removed
         # path as if we were in a race condition
-        dirname = str(tmp)
-        dirnames: list[str] = []
-        filenames = [str(p)]
-        with unittest.mock.patch(
-            "os.walk", return_value=[(dirname, dirnames, filenames)], autospec=True
+        with unittest.mock.patch.object(
+            sd, "listdir", return_value=([p.name], []), autospec=True
         ):
             changed = sd.check()
         assert changed
 
+    def test_dircache(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        tmp = tmp_path
+        hello = tmp.joinpath("sub", "hello.py")
+        hello.parent.mkdir()
+        hello.touch()
+        for dirpath in (tmp, hello.parent):
+            os.utime(dirpath, (0, 0))
+        sd = StatRecorder([tmp])
+        assert set(sd.dircache) == {tmp, hello.parent}
+
+        scandir = unittest.mock.Mock(wraps=os.scandir)
+        monkeypatch.setattr(os, "scandir", scandir)
+        assert not sd.check()
+        assert scandir.call_count == 0
+
+        # modified in place: found without listing the directory again
+        hello.write_text("world")
+        assert sd.check()
+        assert sd.changedfiles == [hello]
+        assert scandir.call_count == 0
+
+        # new file: the directory mtime changes, so it is listed again
+        new = hello.with_name("new.py")
+        new.touch()
+        assert sd.check()
+        assert sd.changedfiles == [new]
+        assert scandir.call_count == 1
+        # ...but not cached, its mtime being too recent to be trusted
+        assert hello.parent not in sd.dircache
+
+    def test_ignore(self, tmp_path: Path) -> None:
+        tmp = tmp_path
+        for name in (
+            "build/hello.py",
+            "docs/index.txt",
+            "docs/keep.txt",
+            "src/docs/index.txt",
+            "src/out.log",
+            "src/build",
+        ):
+            tmp.joinpath(name).parent.mkdir(parents=True, exist_ok=True)
+            tmp.joinpath(name).touch()
+        sd = StatRecorder(
+            [tmp],
+            ignore=["# comment", "", "build/", "*.log", "/docs/*.txt", "!keep.txt"],
+        )
+        assert sorted(p.relative_to(tmp).as_posix() for p in sd.statcache) == [
+            "docs/keep.txt",
+            "src/build",
+            "src/docs/index.txt",
+        ]
+
+        tmp.joinpath("build", "hello.py").write_text("world")
+        tmp.joinpath("src", "out.log").write_text("world")
+        assert not sd.check()
+
+    def test_snapshot(self, tmp_path: Path) -> None:
+        tmp = tmp_path / "root"
+        tmp.mkdir()
+        hello = tmp / "hello.py"
+        hello.touch()
+        snapshotpath = tmp_path / "snapshot.json"
+        StatRecorder([tmp], snapshotpath=snapshotpath)
+        assert snapshotpath.is_file()
+
+        hello.write_text("world")
+        sd = StatRecorder([tmp], snapshotpath=snapshotpath)
+        assert sd.changedfiles == [hello]
+
+        # a snapshot taken with other settings is not used
+        sd = StatRecorder([tmp], ignore=["*.txt"], snapshotpath=snapshotpath)
+        assert sd.changedfiles == [hello]
+        sd = StatRecorder([tmp], snapshotpath=snapshotpath)
+        assert sd.changedfiles == [hello]
+
     def test_pycremoval(self, tmp_path: Path) -> None:
         tmp = tmp_path
         hello = tmp / "hello.py"
@@ -222,6 +317,59 @@ class TestRemoteControl:
         assert not failures
 
 
+class TestImpact:
+    def test_file_tracer(self, pytester: pytest.Pytester) -> None:
+        mod = pytester.makepyfile(traced="def f():\n    return 1\n")
+        pytester.syspathinsert()
+        import traced  # type: ignore[import-not-found]
+
+        tracer = FileTracer()
+        try:
+            tracer.start()
+            traced.f()
+            files = tracer.stop()
+            assert str(mod) in files
+
+            tracer.start()
+            files = tracer.stop()
+            assert str(mod) not in files
+        finally:
+            tracer.close()
+
+    def test_only_impacted_tests_rerun(self, pytester: pytest.Pytester) -> None:
+        pytester.makepyfile(
+            mod_a="def f():\n    return 1\n",
+            mod_b="def f():\n    return 1\n",
+            test_impact=textwrap.dedent(
+                """
+                import mod_a, mod_b
+
+                def test_a():
+                    assert mod_a.f() == 1
+
+                def test_b():
+                    assert mod_b.f() == 1
+                """
+            ),
+        )
+        config = pytester.parseconfigure("--looponfail-impact=only")
+        control = RemoteControl(config)
+        control.loop_once()
+        assert not control.failures
+        assert not control.wasimpacted
+
+        # break both modules, but only report mod_b as changed
+        mod_a = pytester.makepyfile(mod_a="def f():\n    return 2\n")
+        mod_b = pytester.makepyfile(mod_b="def f():\n    return 2\n")
+        removepyc(mod_a)
+        control.changed.add(str(mod_b))
+        control.loop_once()
+        assert control.wasimpacted
+        assert len(control.failures) == 1  # type: ignore[unreachable]
+        assert "test_b" in control.failures[0]
+        assert control.changed == {str(mod_b)}
+
+
 class TestLooponFailing:
     def test_looponfail_from_fail_to_ok(self, pytester: pytest.Pytester) -> None:
         modcol = pytester.getmodulecol(
@@ -285,6 +433,40 @@ class TestLooponFailing:
         assert "test_one" not in remotecontrol.failures[0]
         assert "test_two" in remotecontrol.failures[0]
 
+    def test_looponfail_distributed(self, pytester: pytest.Pytester) -> None:
+        modcol = pytester.getmodulecol(
+            textwrap.dedent(
+                """
+                def test_one():
+                    assert 0
+                def test_two():
+                    assert 1
+                """
+            ),
+            configargs=("-n2",),
+        )
+        remotecontrol = RemoteControl(modcol.config)
+        remotecontrol.loop_once()
+        assert len(remotecontrol.failures) == 1
+        assert "test_one" in remotecontrol.failures[0]
+
+        modcol.path.write_text(
+            textwrap.dedent(
+                """
+                def test_one():
+                    assert 1 # passes now
+                def test_two():
+                    assert 0 # fails, but is not part of the failure trails
+                """
+            )
+        )
+        removepyc(modcol.path)
+        remotecontrol.loop_once()
+        assert len(remotecontrol.failures) == 0
+        remotecontrol.loop_once()
+        assert len(remotecontrol.failures) == 1
+        assert "test_two" in remotecontrol.failures[0]
+
     @pytest.mark.xfail(reason="broken by pytest 3.1+", strict=True)
     def test_looponfail_removed_test(self, pytester: pytest.Pytester) -> None:
         modcol = pytester.getmodulecol(
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from xdist.lowmemory import PASSED_REPORT
+from xdist.lowmemory import PassedTests
+from xdist.lowmemory import slim_stats
+
+
+class TestPassedTests:
+    def test_add(self) -> None:
+        passed = PassedTests()
+        passed.set_collection(["a", "b", "c", "d"])
+        assert len(passed) == 0
+        passed.add(3)
+        passed.add(1)
+        passed.add(3)
+        assert len(passed) == 2
+        assert list(passed) == ["b", "d"]
+
+
+def test_slim_stats() -> None:
+    report = pytest.TestReport(
+        nodeid="a.py::test",
+        location=("a.py", 1, "test"),
+        keywords={},
+        outcome="passed",
+        longrepr=None,
+        when="setup",
+    )
+    failed = object()
+    stats: dict[str, list[Any]] = {"failed": [failed], "": [report]}
+    slim_stats(stats, report)
+    assert stats == {"failed": [failed], "": [PASSED_REPORT]}
+    # xpassed reports are shown by -rX
+    stats = {"xpassed": [report]}
+    slim_stats(stats, report)
+    assert stats == {"xpassed": [report]}
+
+
+def test_low_memory(pytester: pytest.Pytester) -> None:
+    pytester.makeconftest(
+        """
+        def pytest_sessionfinish(session):
+            dsession = session.config.pluginmanager.getplugin("dsession")
+            if dsession is not None:
+                passed = list(dsession.passed_tests)
+                print("passed tests:", len(passed), passed[0])
+        """
+    )
+    pytester.makepyfile(
+        """
+        import pytest
+
+        @pytest.mark.parametrize("i", range(20))
+        def test_pass(i):
+            pass
+
+        def test_fail():
+            assert 0
+
+        def test_skip():
+            pytest.skip("not now")
+        """
+    )
+    result = pytester.runpytest("-n2", "-rfs", "-s", "--xdist-low-memory")
+    result.stdout.fnmatch_lines(
+        [
+            "*passed tests: 20 test_low_memory.py::test_pass[[]0[]]",
+            "*= FAILURES =*",
+            "*def test_fail():*",
+            "*= 1 failed, 20 passed, 1 skipped in *",
+        ]
+    )
+    result.stdout.fnmatch_lines(["SKIPPED [[]1[]] test_low_memory.py:*: not now"])
+    result.stdout.fnmatch_lines(["FAILED test_low_memory.py::test_fail - assert 0"])
+
+
+@pytest.mark.parametrize("chars", ["X", "a"])
+def test_low_memory_xpassed(pytester: pytest.Pytester, chars: str) -> None:
+    pytester.makepyfile(
+        """
+        import pytest
+
+        @pytest.mark.xfail(reason="not fixed")
+        def test_xpass():
+            pass
+
+        def test_pass():
+            pass
+        """
+    )
+    result = pytester.runpytest("-n2", f"-r{chars}", "--xdist-low-memory")
+    result.stdout.fnmatch_lines(
+        [
+            "XPASS test_low_memory_xpassed.py::test_xpass*not fixed",
+            "*= 1 passed, 1 xpassed in *",
+        ]
+    )
+    assert result.ret == pytest.ExitCode.OK
+
+
+def test_low_memory_lazy_collection(pytester: pytest.Pytester) -> None:
+    result = pytester.runpytest(
+        "-n2", "--dist=loadfile", "--lazy-collection", "--xdist-low-memory"
+    )
+    result.stderr.fnmatch_lines(
+        ["*--xdist-low-memory cannot be used with --lazy-collection*"]
+    )
+
+
+@pytest.mark.parametrize("chars", ["p", "P", "A", "fEp"])
+def test_low_memory_passed_summary(pytester: pytest.Pytester, chars: str) -> None:
+    result = pytester.runpytest("-n2", f"-r{chars}", "--xdist-low-memory")
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
+    result.stderr.fnmatch_lines(
+        ["*--xdist-low-memory cannot be used with -rp, -rP or -rA.*"]
+    )
@@ -33,6 +33,24 @@ def test_parse_ramp_duration_rejects_invalid_values(value: str) -> None:
         parse_ramp_duration(value)
 
 
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("0", (0, 0.0)), ("3", (3, 0.0)), ("2.5s", (0, 2.5)), ("1m", (0, 60.0))],
+)
+def test_parse_prefetch(value: str, expected: tuple[int, float]) -> None:
+    from xdist.plugin import parse_prefetch
+
+    assert parse_prefetch(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "-1", "1.5", "-1s", "soon"])
+def test_parse_prefetch_rejects_invalid_values(value: str) -> None:
+    from xdist.plugin import parse_prefetch
+
+    with pytest.raises(pytest.UsageError):
+        parse_prefetch(value)
+
+
 @pytest.fixture
 def monkeypatch_3_cpus(monkeypatch: pytest.MonkeyPatch) -> None:
     """Make pytest-xdist believe the system has 3 CPUs."""
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Generator
 import marshal
 import pprint
 from queue import Queue
@@ -14,6 +15,8 @@ import uuid
 import execnet
 import pytest
 
+from xdist.remote import collection_digest
+from xdist.remote import ShmRing
 from xdist.remote import WorkerInteractor
 from xdist.workermanage import NodeManager
 from xdist.workermanage import WorkerController
@@ -45,6 +48,7 @@ class WorkerSetup:
         self.request = request
         self.pytester = pytester
         self.use_callback = False
+        self.workerinput: dict[str, Any] = {}
         self.events = Queue()  # type: ignore[var-annotated]
 
     def setup(self) -> None:
@@ -66,6 +70,7 @@ class WorkerSetup:
             config=config,
             putevent=putevent,  # type: ignore[arg-type]
         )
+        self.slp.workerinput.update(self.workerinput)
         self.request.addfinalizer(self.slp.ensure_teardown)
         self.slp.setup()
 
@@ -168,6 +173,49 @@ class TestWorkerInteractor:
         ev = worker.popevent("workerfinished")
         assert "workeroutput" in ev.kwargs
 
+    def test_collection_digest(self, worker: WorkerSetup) -> None:
+        worker.pytester.makepyfile(
+            """
+            def test_func():
+                pass
+            def test_func2():
+                pass
+        """
+        )
+        worker.workerinput["collectiondigest"] = True
+        worker.setup()
+        ev = worker.popevent("collectionfinish")
+        assert "ids" not in ev.kwargs
+        digest = ev.kwargs["digest"]
+        worker.sendcommand("sendcollection")
+        ev = worker.popevent("collectionfinish")
+        ids = ev.kwargs["ids"]
+        assert [x.split("::")[-1] for x in ids] == ["test_func", "test_func2"]
+        assert ev.kwargs["digest"] == digest == collection_digest(ids)
+        worker.sendcommand("shutdown")
+        ev = worker.popevent("workerfinished")
+
+    def test_lazy_collection(self, worker: WorkerSetup) -> None:
+        worker.pytester.makepyfile(
+            test_a="""
+            def test_func():
+                pass
+        """,
+            test_b="""
+            raise ImportError("not assigned, not imported")
+        """,
+        )
+        worker.workerinput["lazycollection"] = True
+        worker.setup()
+        ev = worker.popevent("collectionfiles")
+        assert ev.kwargs["files"] == ["test_a.py", "test_b.py"]
+        worker.sendcommand("collectfiles", files=["test_a.py"])
+        ev = worker.popevent()
+        assert ev.name == "collectionfinish"
+        assert ev.kwargs["ids"] == ["test_a.py::test_func"]
+        worker.sendcommand("shutdown")
+        ev = worker.popevent("workerfinished")
+
     def test_remote_collect_skip(
         self, worker: WorkerSetup, unserialize_report: UnserializerReport
     ) -> None:
@@ -271,6 +319,22 @@ class TestWorkerInteractor:
         ev = worker.popevent()
         assert ev.name == "errordown"
 
+    def test_process_from_remote_does_not_format_events(
+        self, worker: WorkerSetup
+    ) -> None:
+        # events are only formatted when logging is enabled with --debug
+        class Unformattable(list[str]):
+            def __repr__(self) -> str:
+                raise AssertionError("formatted")
+
+        worker.use_callback = True
+        worker.setup()
+        ids = Unformattable(["test_a"])
+        worker.slp.process_from_remote(("collectionfinish", {"ids": ids}))
+        ev = worker.popevent()
+        assert ev.name == "collectionfinish"
+        assert ev.kwargs["ids"] is ids
+
     def test_steal_work(
         self, worker: WorkerSetup, unserialize_report: UnserializerReport
     ) -> None:
@@ -367,6 +431,39 @@ class TestWorkerInteractor:
         assert "workeroutput" in ev.kwargs
 
 
+class TestShmRing:
+    @pytest.fixture
+    def ring(self) -> Generator[ShmRing]:
+        ring = ShmRing.create(100)
+        yield ring
+        ring.close(unlink=True)
+
+    def test_write_read(self, ring: ShmRing) -> None:
+        reader = ShmRing.attach(ring.name)
+        try:
+            for i in range(20):
+                data = {"i": i, "longrepr": "x" * i}
+                shm = ring.write(data)
+                assert shm is not None
+                assert reader.read(*shm) == data
+        finally:
+            reader.close()
+
+    def test_full(self, ring: ShmRing) -> None:
+        assert ring.write("x" * 200) is None
+        first = ring.write("x" * 30)
+        assert first is not None
+        second = ring.write("y" * 30)
+        assert second is not None
+        assert ring.write("z" * 30) is None
+        assert ring.read(*first) == "x" * 30
+        # wraps around the end of the buffer
+        third = ring.write("z" * 30)
+        assert third is not None
+        assert ring.read(*second) == "y" * 30
+        assert ring.read(*third) == "z" * 30
+
+
 def test_remote_env_vars(pytester: pytest.Pytester) -> None:
     pytester.makepyfile(
         """
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import cast
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from xdist.resultlog import JUnitResultLog
+
+
+class MockConfig:
+    def getini(self, name: str) -> str:
+        assert name == "junit_suite_name"
+        return "suite"
+
+
+def make_report(
+    nodeid: str, when: str, outcome: str, longrepr: object = None
+) -> pytest.TestReport:
+    return pytest.TestReport(
+        nodeid=nodeid,
+        location=("a.py", 1, nodeid),
+        keywords={},
+        outcome=outcome,  # type: ignore[arg-type]
+        longrepr=longrepr,  # type: ignore[arg-type]
+        when=when,  # type: ignore[arg-type]
+        duration=0.5,
+    )
+
+
+class TestJUnitResultLog:
+    def test_testcases(self, tmp_path: Path) -> None:
+        path = tmp_path / "results.xml"
+        log = JUnitResultLog(cast(pytest.Config, MockConfig()), path)
+        log.add_report(make_report("a.py::test_1", "setup", "passed"), "gw0")
+        log.add_report(make_report("a/b.py::C::test_2", "setup", "passed"), "gw1")
+        log.add_report(
+            make_report("a.py::test_1", "call", "failed", "assert 0 <\x1b>"), "gw0"
+        )
+        log.add_report(make_report("a.py::test_1", "teardown", "passed"), "gw0")
+        log.file.flush()
+        # only the completed test is written
+        assert "test_1" in path.read_text()
+        assert "test_2" not in path.read_text()
+        log.add_report(
+            make_report("a/b.py::C::test_2", "???", "failed", "worker crashed"), "gw1"
+        )
+        log.add_report(make_report("a.py::test_3", "setup", "passed"), "gw0")
+        log.close()
+
+        suite = ET.parse(path).getroot().find("testsuite")
+        assert suite is not None
+        assert suite.get("name") == "suite"
+        test_1, test_2, test_3 = suite.findall("testcase")
+        assert test_1.attrib == {"classname": "a", "name": "test_1", "time": "1.500"}
+        failure = test_1.find("failure")
+        assert failure is not None
+        assert failure.text == "assert 0 <#x1B>"
+        assert test_2.get("classname") == "a.b.C"
+        error = test_2.find("error")
+        assert error is not None
+        assert error.get("message") == "failed on ???"
+        # a test which did not complete
+        assert test_3.get("name") == "test_3"
+        assert list(test_3) == []
+
+
+def test_result_log_jsonl(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        def test_ok():
+            pass
+
+        def test_fail():
+            assert 0
+        """
+    )
+    result = pytester.runpytest("-n2", "--xdist-result-log=out/results.jsonl")
+    result.assert_outcomes(passed=1, failed=1)
+    lines = (pytester.path / "out" / "results.jsonl").read_text().splitlines()
+    reports = [json.loads(line) for line in lines]
+    assert len(reports) == 6
+    assert {rep["worker_id"] for rep in reports} <= {"gw0", "gw1"}
+    assert {
+        (rep["nodeid"], rep["outcome"]) for rep in reports if rep["when"] == "call"
+    } == {
+        ("test_result_log_jsonl.py::test_ok", "passed"),
+        ("test_result_log_jsonl.py::test_fail", "failed"),
+    }
+
+
+def test_result_log_junit(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import pytest
+
+        def test_ok():
+            pass
+
+        def test_fail():
+            assert 0
+
+        @pytest.mark.skip(reason="not now")
+        def test_skip():
+            pass
+
+        @pytest.fixture
+        def broken():
+            raise ValueError()
+
+        def test_error(broken):
+            pass
+        """
+    )
+    result = pytester.runpytest("-n2", "--xdist-result-log=results.xml")
+    result.assert_outcomes(passed=1, failed=1, skipped=1, errors=1)
+    suite = ET.parse(pytester.path / "results.xml").getroot().find("testsuite")
+    assert suite is not None
+    testcases = {case.attrib["name"]: case for case in suite.findall("testcase")}
+    assert sorted(testcases) == ["test_error", "test_fail", "test_ok", "test_skip"]
+    assert [child.tag for child in testcases["test_ok"]] == []
+    assert [child.tag for child in testcases["test_fail"]] == ["failure"]
+    assert [child.tag for child in testcases["test_error"]] == ["error"]
+    skipped = testcases["test_skip"].find("skipped")
+    assert skipped is not None
+    assert skipped.get("message") == "not now"
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import io
+import time
+
+import pytest
+
+from xdist.dsession import DSession
+from xdist.termbuffer import BufferedTerminalFile
+
+
+class TestBufferedTerminalFile:
+    def test_written_by_thread(self) -> None:
+        file = io.StringIO()
+        buffered = BufferedTerminalFile(file, interval=0.01)
+        buffered.start()
+        buffered.write("a")
+        buffered.write("b\n")
+        buffered.flush()
+        deadline = time.monotonic() + 5
+        while not file.getvalue() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert file.getvalue() == "ab\n"
+        buffered.write("c")
+        buffered.close()
+        assert file.getvalue() == "ab\nc"
+
+    def test_close_writes_buffer(self) -> None:
+        file = io.StringIO()
+        buffered = BufferedTerminalFile(file, interval=60)
+        buffered.start()
+        buffered.write("a")
+        assert file.getvalue() == ""
+        buffered.close()
+        assert file.getvalue() == "a"
+
+    def test_written_by_writer_when_full(self) -> None:
+        file = io.StringIO()
+        buffered = BufferedTerminalFile(file, interval=60, max_size=4)
+        buffered.start()
+        buffered.write("ab")
+        assert file.getvalue() == ""
+        buffered.write("cd")
+        assert file.getvalue() == "abcd"
+        buffered.write("e")
+        buffered.close()
+        assert file.getvalue() == "abcde"
+
+    def test_attributes_of_file(self) -> None:
+        file = io.StringIO()
+        buffered = BufferedTerminalFile(file, interval=60)
+        assert buffered.isatty() is False
+        assert buffered.getvalue() == ""
+
+
+def test_written_at_unconfigure(pytester: pytest.Pytester) -> None:
+    config = pytester.parseconfigure("-n1", "--xdist-buffered-output")
+    dsession = DSession(config)
+    config.pluginmanager.register(dsession)
+    file = io.StringIO()
+    dsession.terminal._tw._file = file
+    dsession._buffer_terminal_output()
+    dsession.terminal.write_line("buffered")
+    # the session did not finish
+    config._ensure_unconfigure()
+    assert file.getvalue() == "buffered\n"
+    assert dsession.terminal._tw._file is file
+
+
+def test_buffered_output(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import pytest
+
+        @pytest.mark.parametrize("i", range(50))
+        def test_ok(i):
+            pass
+
+        def test_fail():
+            assert 0
+        """
+    )
+    result = pytester.runpytest("-n2", "-v", "--xdist-buffered-output")
+    result.stdout.fnmatch_lines(
+        [
+            "created: 2/2 workers",
+            "2 workers [[]51 items[]]",
+            "*FAILED test_buffered_output.py::test_fail*",
+            "*= FAILURES =*",
+            "*= 1 failed, 50 passed in *",
+        ]
+    )
+    assert len([line for line in result.outlines if "PASSED" in line]) == 50